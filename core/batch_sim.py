@@ -0,0 +1,472 @@
+"""
+core/batch_sim.py — RandomPac v1.4
+Simulador por lotes vectorizado (NumPy).
+Corre N partidas en paralelo y paso a paso: posiciones, direcciones, estados,
+grillas y generadores de las N partidas viven en arreglos, y cada tick aplica
+las reglas de core/simulation (GridMover, IA de fantasmas, puntos, modo poder,
+vidas, victoria/derrota y el bot GreedyDotInput) sobre todo el eje de lotes a
+la vez. Con la misma semilla reproduce el resultado de run_headless.
+Las posiciones son enteras como en core/grid_mover (celda, dirección y avance
+en unidades) y las colisiones son continuas como en core/collision (misma
+fórmula, en arreglos).
+Los fantasmas comidos vuelven como ojos a la casa (g_eaten), reviven ahí y
+esperan hasta g_wait antes de volver a decidir, como core/ghost.
+Cada tick solo se evalúan las entidades que llegan a un centro, y los
+valores del RNG de todos los fantasmas que sortean salen de una sola
+llamada (random_rows, en orden de slot dentro de cada partida). Las partidas
+terminadas se descartan por tandas (_compact), no una a una.
+
+Devuelve por partida: puntaje, vidas, tiempo de supervivencia y resultado.
+"""
+
+import math, time
+import numpy as np
+from settings import (DOT_SCORE, POWER_DOT_SCORE, GHOST_SCORE_BASE, FRENZY_TIME_MS, PLAYER_LIVES,
+                      EXTRA_LIFE_AT, MAX_LIVES, EATEN_SPEED_FACTOR)
+from core.simulation import TICK_MS, DIFFICULTY_SPEEDS, GHOST_SPAWNS
+from core.ghost import RESPAWN_WAIT_MS
+from core.grid_mover import TILE_UNITS, HALF_UNITS, step_units
+from core.collision import COLLIDE_UNITS
+from logic.map_compiler import DEFAULT_SPAWNS
+from logic.map import load_compiled
+from logic.navigation import NavTable, OPEN_MASK
+from logic.batch_random import BatchLCG, batch_generator
+
+# Direcciones en el mismo orden que core/ghost.DIRS4: derecha, izquierda, abajo, arriba
+DX = np.array([1, -1, 0, 0], dtype=np.int64)
+DY = np.array([0, 0, 1, -1], dtype=np.int64)
+REV = np.array([1, 0, 3, 2], dtype=np.int64)
+RIGHT, UP = 0, 3
+
+PLAYER_STEP = step_units(3.2, TICK_MS)
+PLAYER_POWER_STEP = step_units(4.2, TICK_MS)
+# distancia por eje (unidades) al empezar el tick por debajo de la cual una
+# pareja puede chocar: radio + una celda (en un tick se acercan menos de 10 px)
+CONTACT_REACH = COLLIDE_UNITS + TILE_UNITS
+# las distancias BFS hacia las celdas del jugador se guardan como filas de una
+# matriz celdas x celdas si cabe en esto (mapa clásico: ~3 MB)
+DIST_CACHE_BYTES = 64 * 1024 * 1024
+
+# Resultados
+OUTCOME_TIMEOUT, OUTCOME_WIN, OUTCOME_LOSE = 0, 1, 2
+OUTCOME_NAMES = {OUTCOME_TIMEOUT: "timeout", OUTCOME_WIN: "win", OUTCOME_LOSE: "lose"}
+
+# Tablas de máscaras de 4 bits (bit i = DIRS4[i] libre)
+_CNT = np.array([bin(m).count("1") for m in range(16)], dtype=np.int64)
+_NTH = np.array([[([d for d in range(4) if m >> d & 1] + [0, 0, 0, 0])[i] for i in range(4)]
+                 for m in range(16)], dtype=np.int64)
+# quitar la reversa solo si hay más de una salida
+_STRIP = np.array([[m & ~(1 << rv) if (m >> rv & 1 and _CNT[m] > 1) else m for rv in range(4)]
+                   for m in range(16)], dtype=np.int64)
+
+
+def _masks(table):
+    """Máscara de salidas libres por celda (índice plano r * cols + c) desde la NavTable."""
+    return np.frombuffer(table, dtype=np.uint8).astype(np.int64) & OPEN_MASK
+
+
+class BatchSimulation:
+    def __init__(self, generator_class, seeds, config=None, level=None, spawns=None):
+        self.config = config or {}
+        if level is None:
+            compiled = load_compiled(self.config.get("map"))
+            level, nav = compiled.grid, compiled.nav
+            spawns = spawns or compiled.spawns
+        else:
+            nav = NavTable(level)
+        spawns = spawns or DEFAULT_SPAWNS
+        self.rows, self.cols = level.height, level.width
+        seeds = list(seeds)
+        n = self.n_total = len(seeds)
+        self.seeds = np.array(seeds, dtype=np.int64)
+
+        difficulty = self.config.get("difficulty", "Clásico")
+        self.speed_player, self.speed_ghost = DIFFICULTY_SPEEDS.get(difficulty, DIFFICULTY_SPEEDS["Clásico"])
+        # pasos enteros por tick (misma cuenta que GridMover.move_step)
+        self.step_ghost = step_units(self.speed_ghost, TICK_MS)
+        self.step_eyes = step_units(self.speed_ghost, TICK_MS * EATEN_SPEED_FACTOR)
+
+        # tablas estáticas del mapa (el jugador no cruza la puerta 4)
+        self.nav = nav
+        self.open_player = _masks(nav.player)
+        self.open_ghost = _masks(nav.ghost)
+        self.col_of = np.tile(np.arange(self.cols, dtype=np.int64), self.rows)
+        self.row_of = np.repeat(np.arange(self.rows, dtype=np.int64), self.cols)
+        self.ux_of = self.col_of * TILE_UNITS + HALF_UNITS      # centro de cada celda en unidades
+        self.uy_of = self.row_of * TILE_UNITS + HALF_UNITS
+        self.doff = DX + DY * self.cols
+        self.player_spawn = spawns.player[1] * self.cols + spawns.player[0]
+        self.ghost_spawn = np.array([r * self.cols + c for c, r in spawns.ghosts], dtype=np.int64)
+        self.chaser = np.array([b == "chaser" for _, _, b in GHOST_SPAWNS])
+        hc, hr = spawns.house
+        self.house = hr * self.cols + hc
+        self.house_field = np.frombuffer(nav.distances.pin(hc, hr), dtype=np.uint32).astype(np.int64)
+        cells = self.rows * self.cols
+        self._dist = np.zeros((cells, cells), dtype=np.int32) if cells * cells * 4 <= DIST_CACHE_BYTES else None
+        self._have = np.zeros(cells, dtype=bool)      # filas de _dist ya calculadas
+        g = len(GHOST_SPAWNS)
+
+        # === estado por partida (filas = partidas activas) ===
+        base = level.array().ravel()
+        self.grid = np.tile(base, (n, 1))
+        self.dots_left = np.full(n, int(np.isin(base, (2, 3)).sum()), dtype=np.int64)
+        self.gid = np.arange(n)
+        self.rng = batch_generator(generator_class, seeds)
+        self.bot_rng = BatchLCG(seeds)
+
+        self.p_tile = np.full(n, self.player_spawn, dtype=np.int64)
+        self.p_off = np.zeros(n, dtype=np.int64)              # avance desde el centro (unidades)
+        self.p_moving = np.zeros(n, dtype=bool)               # False: quieto, decide en el tick
+        self.p_cur = np.full(n, RIGHT, dtype=np.int64)
+        self.p_nxt = np.full(n, RIGHT, dtype=np.int64)
+        self.p_step = np.full(n, step_units(self.speed_player, TICK_MS), dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lives = np.full(n, PLAYER_LIVES, dtype=np.int64)
+        self.extra = np.zeros(n, dtype=bool)
+        self.chain = np.zeros(n, dtype=np.int64)
+        self.power_until = np.zeros(n, dtype=np.int64)
+        self.pending_reset = np.zeros(n, dtype=bool)
+        self.live = np.ones(n, dtype=bool)                    # False: ya terminó (espera a _compact)
+
+        self.g_tile = np.tile(self.ghost_spawn, (n, 1))
+        self.g_off = np.zeros((n, g), dtype=np.int64)
+        self.g_moving = np.zeros((n, g), dtype=bool)
+        self.g_cur = np.full((n, g), UP, dtype=np.int64)
+        self.g_nxt = np.full((n, g), RIGHT, dtype=np.int64)
+        self.g_eaten = np.zeros((n, g), dtype=bool)
+        self.g_wait = np.zeros((n, g), dtype=np.int64)    # respawn_timer (0: sin espera)
+        self.g_fright = np.zeros((n, g), dtype=bool)
+        self.g_fr_until = np.zeros((n, g), dtype=np.int64)
+
+        # === resultados (indexados por partida original) ===
+        self.out_score = np.zeros(n, dtype=np.int64)
+        self.out_lives = np.zeros(n, dtype=np.int64)
+        self.out_ticks = np.zeros(n, dtype=np.int64)
+        self.out_outcome = np.full(n, OUTCOME_TIMEOUT, dtype=np.int8)
+        self.tick = 0
+
+    # ---------- utilidades ----------
+    _ARRAYS = ("grid", "dots_left", "gid", "p_tile", "p_off", "p_moving", "p_cur", "p_nxt", "p_step",
+               "score", "lives", "extra", "chain", "power_until", "pending_reset", "live",
+               "g_tile", "g_off", "g_moving", "g_cur", "g_nxt", "g_eaten", "g_wait", "g_fright", "g_fr_until")
+
+    def _compact(self, keep):
+        """Descarta las partidas terminadas para que los ticks siguientes sean más baratos."""
+        idx = np.flatnonzero(keep)
+        for name in self._ARRAYS:
+            setattr(self, name, getattr(self, name)[idx])
+        self.rng.take(idx)
+        self.bot_rng.take(idx)
+
+    def _finish(self, mask, outcome):
+        ids = self.gid[mask]
+        self.out_score[ids] = self.score[mask]
+        self.out_lives[ids] = self.lives[mask]
+        self.out_ticks[ids] = self.tick
+        self.out_outcome[ids] = outcome
+
+    def _add_score(self, gain, mask):
+        self.score += np.where(mask, gain, 0)
+        bonus = mask & ~self.extra & (self.score >= EXTRA_LIFE_AT) & (self.lives < MAX_LIVES)
+        self.lives += bonus
+        self.extra |= bonus
+
+    def _xy(self, tile, cur, off):
+        """Posición en unidades (GridMover.xy) de cada entidad."""
+        return self.ux_of[tile] + DX[cur] * off, self.uy_of[tile] + DY[cur] * off
+
+    def _advance(self, tile, cur, off, moving, step, idle=False):
+        """
+        Primera mitad de GridMover.move_step: quiénes deciden en el tick (quietos
+        o que llegan a un centro), en qué celda y con cuánto les sobra.
+        """
+        reach = moving & (off + step >= TILE_UNITS)
+        dec = (~moving & ~idle) | reach
+        center = np.where(reach, tile + self.doff[cur], tile)
+        rest = np.where(reach, off + step - TILE_UNITS, step)
+        return dec, center, rest
+
+    @staticmethod
+    def _settle(dec, go, rest, off, moving, step):
+        """Segunda mitad: los que decidieron salen con lo que sobra o quedan en el centro; el resto avanza."""
+        new_off = np.where(dec, np.where(go, rest, 0), np.where(moving, off + step, off))
+        return new_off, np.where(dec, go, moving)
+
+    # ---------- tick ----------
+    def _reset(self):
+        idx = np.flatnonzero(self.pending_reset)
+        self.p_tile[idx] = self.player_spawn
+        self.p_off[idx] = 0
+        self.p_moving[idx] = False
+        self.g_tile[idx] = self.ghost_spawn
+        self.g_off[idx] = 0
+        self.g_moving[idx] = False
+        self.g_cur[idx] = UP
+        self.g_nxt[idx] = RIGHT
+        self.g_eaten[idx] = False
+        self.g_wait[idx] = 0
+        self.g_fright[idx] = False
+        self.pending_reset[idx] = False
+
+    def _player_step(self, now):
+        n = len(self.gid)
+        cur, off, moving, step = self.p_cur, self.p_off, self.p_moving, self.p_step
+        dec, tile, rest = self._advance(self.p_tile, cur, off, moving, step)
+
+        # solo deciden los que están en un centro (uno de cada ~8 por tick)
+        idx = np.flatnonzero(dec)
+        t, c = tile[idx], cur[idx]
+        om = self.open_player[t]
+
+        # --- bot GreedyDotInput en el centro: prefiere vecina con punto, si no, azar con su LCG ---
+        m = _STRIP[om, REV[c]]
+        cnt = _CNT[m]
+        choice = np.full(len(idx), -1, dtype=np.int64)
+        for d in range(4):
+            free = ((m >> d) & 1).astype(bool)
+            nb = self.grid[idx, np.where(free, t + self.doff[d], t)]
+            dot = free & (choice < 0) & ((nb == 2) | (nb == 3))
+            choice = np.where(dot, d, choice)
+        need = (cnt > 0) & (choice < 0)
+        if need.any():
+            mask = np.zeros(n, dtype=bool)
+            mask[idx[need]] = True
+            r = self.bot_rng.random(mask)[idx]
+            k = (r * cnt).astype(np.int64) % np.maximum(cnt, 1)
+            choice = np.where(need, _NTH[m, k], choice)
+        nxt = np.where(choice >= 0, choice, self.p_nxt[idx])
+        self.p_nxt[idx] = nxt
+
+        # --- giro, avance y velocidad (se fija tras moverse, como Player.update) ---
+        c = np.where(((om >> nxt) & 1).astype(bool), nxt, c)
+        cur[idx] = c
+        go = np.zeros(n, dtype=bool)
+        go[idx] = ((om >> c) & 1).astype(bool)
+        self.p_tile, self.p_cur = tile, cur
+        self.p_off, self.p_moving = self._settle(dec, go, rest, off, moving, step)
+        self.p_step = np.where(now < self.power_until, PLAYER_POWER_STEP, PLAYER_STEP)
+
+    def _ghosts_step(self, now):
+        """Decisión de cada fantasma que llega a un centro (el RNG se sortea en orden de slot, random_rows)."""
+        self.g_fright &= ~(now > self.g_fr_until)
+        eaten = self.g_eaten
+        eyes = eaten.any()
+        idle = ~eaten & (now < self.g_wait)       # recién revividos: quietos en la casa
+
+        cur, off, moving = self.g_cur, self.g_off, self.g_moving
+        step = np.where(eaten, self.step_eyes, self.step_ghost) if eyes else self.step_ghost
+        dec, tile, rest = self._advance(self.g_tile, cur, off, moving, step, idle)
+        stop = np.zeros_like(dec)
+        nxt = self.g_nxt
+        if eyes:
+            # ojos: en el centro de la casa reviven; en otro centro eligen la vecina más cercana a ella
+            ed = dec & eaten
+            home = ed & (tile == self.house)
+            if home.any():
+                self.g_eaten = eaten & ~home
+                self.g_wait = np.where(home, now + RESPAWN_WAIT_MS, self.g_wait)
+                stop = home
+            turn = ed & ~home
+            if turn.any():
+                cur = self._homing(tile, turn, cur)
+            nxt = np.where(eaten, cur, nxt)
+
+        # fantasmas (no ojos) en un centro: solo esos se evalúan
+        i, j = np.nonzero(dec & ~eaten)
+        t, c = tile[i, j], cur[i, j]
+        m = _STRIP[self.open_ghost[t], REV[c]]
+        cnt = _CNT[m]
+        choice = REV[c]                           # callejón: media vuelta
+        draw = ~self.chaser[j] & (cnt > 0)
+        if draw.any():
+            # un valor por fantasma: np.nonzero va por partida y, dentro de ella, en orden de slot
+            cd = cnt[draw]
+            rv = self.rng.random_rows(i[draw])
+            choice[draw] = _NTH[m[draw], (rv * cd).astype(np.int64) % cd]
+        chase = self.chaser[j] & (cnt > 0)
+        if chase.any():
+            choice[chase] = self._chase(t[chase], m[chase], self.p_tile[i[chase]])
+        nxt[i, j] = choice
+        cur[i, j] = choice
+        self.g_nxt = nxt
+
+        go = ((self.open_ghost[tile] >> cur) & 1).astype(bool) & ~stop
+        self.g_tile, self.g_cur = tile, cur
+        self.g_off, self.g_moving = self._settle(dec, go, rest, off, moving, step)
+
+    def _homing(self, tile, sel, cur):
+        """Ghost._toward hacia la casa para los ojos en sel (solo esos se evalúan): nueva cur (n, G)."""
+        i, j = np.nonzero(sel)
+        t = tile[i, j]
+        m = self.open_ghost[t]
+        free = ((m[:, None] >> np.arange(4)) & 1).astype(bool)
+        nb = np.where(free, t[:, None] + self.doff, t[:, None])
+        hc, hr = self.col_of[self.house], self.row_of[self.house]
+        manhattan = np.abs(self.col_of[nb] - hc) + np.abs(self.row_of[nb] - hr)
+        key = self.house_field[nb] * (self.rows + self.cols) + manhattan
+        best = np.argmin(np.where(free, key, np.iinfo(np.int64).max), axis=1)
+        cur = cur.copy()
+        cur[i, j] = np.where(m > 0, best, cur[i, j])
+        return cur
+
+    def _chase(self, tile, m, ptile):
+        """Vecina libre con menor distancia BFS a la celda del jugador ptile (empate: Manhattan)."""
+        fields = self.nav.distances
+        free = ((m[:, None] >> np.arange(4)[None, :]) & 1).astype(bool)
+        nb = np.where(free, tile[:, None] + self.doff[None, :], tile[:, None])
+        if self._dist is not None:
+            for t in np.unique(ptile[~self._have[ptile]]):
+                self._dist[t] = np.frombuffer(fields.field(int(t % self.cols), int(t // self.cols)), dtype=np.uint32)
+            self._have[ptile] = True
+            F = self._dist[ptile[:, None], nb].astype(np.int64)
+        else:
+            targets, inv = np.unique(ptile, return_inverse=True)
+            F = np.stack([np.frombuffer(fields.field(int(t % self.cols), int(t // self.cols)), dtype=np.uint32)
+                          for t in targets]).astype(np.int64)[inv[:, None], nb]
+        pc, pr = self.col_of[ptile], self.row_of[ptile]
+        manhattan = np.abs(self.col_of[nb] - pc[:, None]) + np.abs(self.row_of[nb] - pr[:, None])
+        key = F * (self.rows + self.cols) + manhattan
+        return np.argmin(np.where(free, key, np.iinfo(np.int64).max), axis=1)
+
+    def _eat(self, now):
+        rows = np.arange(len(self.gid))
+        v = self.grid[rows, self.p_tile]
+        dot = v == 2
+        power = v == 3
+        eaten = dot | power
+        if not eaten.any():
+            return
+        self._add_score(np.where(power, POWER_DOT_SCORE, DOT_SCORE), eaten)
+        self.chain = np.where(power, 0, self.chain)
+        fr = power[:, None] & ~self.g_eaten
+        self.g_fright |= fr
+        self.g_fr_until = np.where(fr, now + FRENZY_TIME_MS, self.g_fr_until)
+        self.power_until = np.where(power, now + FRENZY_TIME_MS, self.power_until)
+        self.grid[rows[eaten], self.p_tile[eaten]] = 0
+        self.dots_left -= eaten
+
+    def _contact(self, p0x, p0y, g0x, g0y):
+        """core.collision.contact para todos los lotes y fantasmas: (n, G), inf = sin contacto."""
+        s = np.full(self.g_tile.shape, np.inf)
+        ax = p0x[:, None] - g0x
+        ay = p0y[:, None] - g0y
+        # solo las parejas que en un tick pueden llegar a tocarse (el resto queda en inf)
+        near = ~self.g_eaten & (np.abs(ax) < CONTACT_REACH) & (np.abs(ay) < CONTACT_REACH)
+        if not near.any():
+            return s
+        i, j = np.nonzero(near)
+        ax, ay = ax[i, j], ay[i, j]
+        # enteros hasta la raíz: mismos redondeos que contact() con las posiciones de GridMover
+        c = ax * ax + ay * ay - COLLIDE_UNITS * COLLIDE_UNITS
+        px, py = self._xy(self.p_tile[i], self.p_cur[i], self.p_off[i])
+        gx, gy = self._xy(self.g_tile[i, j], self.g_cur[i, j], self.g_off[i, j])
+        vx = (px - gx) - ax
+        vy = (py - gy) - ay
+        b = ax * vx + ay * vy
+        a = vx * vx + vy * vy
+        disc = b * b - a * c
+        swept = (b < 0) & (disc > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = (-b - np.sqrt(np.where(swept, disc, 0.0))) / np.where(swept, a, 1.0)
+        t = np.where(swept & (t < 1.0), t, np.inf)
+        s[i, j] = np.where(c < 0, 0.0, t)
+        return s
+
+    def _collide(self, p0x, p0y, g0x, g0y):
+        """Fantasmas tocados en el tick, en orden de contacto (como Simulation._check_collisions)."""
+        n = len(self.gid)
+        died = np.zeros(n, dtype=bool)
+        s = self._contact(p0x, p0y, g0x, g0y)
+        if not np.isfinite(s).any():
+            return died
+        rows = np.arange(n)
+        order = np.argsort(s, axis=1, kind="stable")
+        for k in range(order.shape[1]):
+            j = order[:, k]
+            hit = np.isfinite(s[rows, j]) & ~died
+            if not hit.any():
+                continue
+            fright = self.g_fright[rows, j]
+            fr = hit & fright
+            if fr.any():
+                self.chain += fr
+                self._add_score(GHOST_SCORE_BASE * (2 ** np.maximum(self.chain - 1, 0)), fr)
+                self.g_eaten[rows[fr], j[fr]] = True
+                self.g_fright[rows[fr], j[fr]] = False
+            lethal = hit & ~fright
+            self.lives -= lethal
+            self.chain = np.where(lethal, 0, self.chain)
+            died |= lethal
+        return died
+
+    def step(self):
+        """Un tick de TICK_MS para todas las partidas activas."""
+        self.tick += 1
+        now = self.tick * TICK_MS
+        if self.pending_reset.any():
+            self._reset()
+        p0x, p0y = self._xy(self.p_tile, self.p_cur, self.p_off)
+        g0x, g0y = self._xy(self.g_tile, self.g_cur, self.g_off)
+        self._player_step(now)
+        self._ghosts_step(now)
+        self._eat(now)
+        died = self._collide(p0x, p0y, g0x, g0y)
+
+        lose = died & (self.lives <= 0) & self.live
+        self.pending_reset = died & ~lose
+        win = ~died & (self.dots_left == 0) & self.live
+        done = lose | win
+        if done.any():
+            self._finish(lose, OUTCOME_LOSE)
+            self._finish(win, OUTCOME_WIN)
+            self.live &= ~done
+            # las terminadas siguen en los arreglos (sin resultado nuevo) hasta que sean 1/16
+            dead = len(self.live) - np.count_nonzero(self.live)
+            if dead * 16 >= len(self.live):
+                self._compact(self.live)
+
+    def run(self, max_ms=10 * 60 * 1000):
+        """Simula hasta que todas las partidas terminen o se agote max_ms de juego."""
+        max_tick = math.ceil(max_ms / TICK_MS)
+        while self.live.any() and self.tick < max_tick:
+            self.step()
+        self._finish(self.live, OUTCOME_TIMEOUT)
+        return self.results()
+
+    def results(self):
+        return {
+            "seed": self.seeds,
+            "score": self.out_score,
+            "lives": self.out_lives,
+            "time_ms": self.out_ticks * TICK_MS,
+            "outcome": self.out_outcome,
+        }
+
+
+def run_batch(generator_class, seeds, config=None, level=None, max_ms=10 * 60 * 1000, spawns=None):
+    """Equivalente vectorizado de core.simulation.run_headless para muchas semillas."""
+    return BatchSimulation(generator_class, seeds, config=config, level=level, spawns=spawns).run(max_ms)
+
+
+if __name__ == "__main__":
+    # Rendimiento en el mapa clásico y verificación contra el motor escalar
+    from core.simulation import run_headless
+    from logic.random_generators import LCG, MiddleSquare, PAM
+    for cls in (LCG, MiddleSquare, PAM):
+        seeds = range(1000, 1000 + 5000)
+        t0 = time.perf_counter()
+        sim = BatchSimulation(cls, seeds)
+        res = sim.run()
+        wall = time.perf_counter() - t0
+        frames = int(res["time_ms"].sum() // TICK_MS)
+        check = [run_headless(cls, s) for s in range(1000, 1010)]
+        same = sum(c["score"] == res["score"][i] and c["time_ms"] == res["time_ms"][i]
+                   and c["result"] == OUTCOME_NAMES[int(res["outcome"][i])] for i, c in enumerate(check))
+        # semillas grandes: el cuadrado / producto de la semilla no cabe en int64
+        big = [3_100_031_676, 3_100_055_433, *range(10 ** 12 + 10, 10 ** 12 + 20)]
+        bres = BatchSimulation(cls, big).run()
+        same_big = sum(c["score"] == bres["score"][i] and c["time_ms"] == bres["time_ms"][i]
+                       and c["result"] == OUTCOME_NAMES[int(bres["outcome"][i])]
+                       for i, c in enumerate(run_headless(cls, s) for s in big))
+        print(f"{cls.__name__:>12}: {frames / wall / 1e6:5.2f} M cuadros-partida/s, "
+              f"{same}/{len(check)} iguales al motor escalar, semillas grandes {same_big}/{len(big)}")
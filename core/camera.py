@@ -0,0 +1,87 @@
+"""
+core/camera.py — RandomPac v1.0
+Cámara que sigue al jugador en mapas más grandes que la ventana.
+Trabaja en píxeles del mundo (los mismos de pos / rect de las entidades, que
+ya incluyen HUD_HEIGHT). La vista ocupa la ventana bajo el HUD; solo se
+dibujan las celdas que caen dentro (visible_tiles), así el costo de un cuadro
+depende del tamaño de la ventana y no del mapa.
+Si el mapa es más chico que la vista, queda centrado.
+
+python -m core.camera → tiempo por cuadro (simulación + dibujo) en 28x31 y 512x511
+"""
+
+from settings import TILE_SIZE, HUD_HEIGHT
+
+
+class Camera:
+    def __init__(self, view_w, view_h, cols, rows):
+        self.view_w, self.view_h = view_w, view_h
+        self.world_w, self.world_h = cols * TILE_SIZE, rows * TILE_SIZE
+        self.cols, self.rows = cols, rows
+        self.x = self.y = 0
+        self.follow(self.world_w / 2, HUD_HEIGHT + self.world_h / 2)
+
+    @staticmethod
+    def _clamp(center, view, world):
+        if world <= view:
+            return -((view - world) // 2)
+        return int(min(max(center - view / 2, 0), world - view))
+
+    def follow(self, px, py):
+        """Centra la vista en el punto (px, py) del mundo sin salirse del mapa."""
+        self.x = self._clamp(px, self.view_w, self.world_w)
+        self.y = self._clamp(py - HUD_HEIGHT, self.view_h, self.world_h)
+
+    def visible_tiles(self):
+        """Rango de celdas visibles: (c0, r0, c1, r1), con c1 / r1 excluidos."""
+        c0 = max(0, self.x // TILE_SIZE)
+        r0 = max(0, self.y // TILE_SIZE)
+        c1 = min(self.cols, (self.x + self.view_w) // TILE_SIZE + 1)
+        r1 = min(self.rows, (self.y + self.view_h) // TILE_SIZE + 1)
+        return c0, r0, c1, r1
+
+    def to_screen(self, x, y):
+        return x - self.x, y - self.y
+
+    def apply(self, rect):
+        """Rect del mundo → rect en pantalla."""
+        return rect.move(-self.x, -self.y)
+
+    def sees(self, rect):
+        """¿El rect (del mundo) cae dentro de la vista?"""
+        return (rect.right > self.x and rect.left < self.x + self.view_w and
+                rect.bottom > self.y + HUD_HEIGHT and rect.top < self.y + HUD_HEIGHT + self.view_h)
+
+
+if __name__ == "__main__":
+    import os, time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from settings import WIDTH, HEIGHT
+    from core.game_loop import GameLoop
+    from core.input import GreedyDotInput
+    from core.simulation import TICK_MS
+    from logic.map_generator import generate, spawns
+    from logic.random_generators import LCG
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    frames = 600
+    for cols, rows in ((28, 31), (512, 511)):
+        level = generate(1, LCG, cols, rows)
+        game = GameLoop(screen, LCG, "LCG", 1, {"difficulty": "Clásico"}, GreedyDotInput(LCG(1)),
+                        level=level, spawns=spawns(cols, rows))
+        times = []
+        for _ in range(frames):
+            t0 = time.perf_counter()
+            game.update(TICK_MS)
+            game.draw()
+            times.append((time.perf_counter() - t0) * 1000)
+            if not game.running:
+                break
+        # la mediana deja afuera las pausas de 300 ms al morir o comer fantasmas
+        times.sort()
+        med, p95 = times[len(times) // 2], times[int(len(times) * 0.95)]
+        print(f"{cols}x{rows}: mediana {med:.2f} ms por cuadro ({1000 / med:.0f} FPS posibles), "
+              f"p95 {p95:.2f} ms, máx {times[-1]:.1f} ms, celdas visibles {game.camera.visible_tiles()}")
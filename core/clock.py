@@ -0,0 +1,19 @@
+"""
+core/clock.py — RandomPac v1.0
+Reloj virtual de simulación.
+Expone la misma interfaz que `pygame.time` (get_ticks) para poder inyectarlo
+en jugador y fantasmas en lugar del reloj real de pygame.
+"""
+
+
+class VirtualClock:
+    def __init__(self, start_ms=0):
+        self.ms = start_ms
+
+    def get_ticks(self):
+        """Milisegundos de juego transcurridos (equivalente a pygame.time.get_ticks)."""
+        return int(self.ms)
+
+    def advance(self, dt):
+        """Avanza el reloj dt milisegundos de juego."""
+        self.ms += dt
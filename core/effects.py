@@ -1,29 +1,46 @@
 """
-core/effects.py — RandomPac (v1.2)
+core/effects.py — RandomPac (v1.3)
 Transiciones simples (fade in/out). Se eliminaron efectos CRT por mareo visual.
+El fundido es un tween de core/scheduler: fade_in/fade_out solo lo inician y
+draw() lo aplica en cada cuadro del bucle principal (no bloquea).
 """
 
 import pygame
 from settings import *
 
+FADE_MS = 300
+
+
 class Transition:
     def __init__(self, screen):
         self.screen = screen
+        self.surf = pygame.Surface((WIDTH, HEIGHT))
+        self.alpha = None           # None = sin fundido en curso
+        self.over_scene = False     # fade_in: se dibuja sobre la escena nueva de cada cuadro
+
+    @property
+    def active(self):
+        return self.alpha is not None
+
+    def _start(self, scheduler, a0, a1, color, duration):
+        self.surf.fill(color)
+        def step(p):
+            self.alpha = a0 + (a1 - a0) * p
+        def done():
+            self.alpha = None
+        scheduler.tween(duration, step, done)
+
+    def fade_in(self, scheduler, color=DARK_BLUE, duration=FADE_MS):
+        """Desde color hacia lo que se dibuje debajo."""
+        self.over_scene = True
+        self._start(scheduler, 255, 0, color, duration)
+
+    def fade_out(self, scheduler, color=DARK_BLUE, duration=FADE_MS):
+        """De la pantalla actual hacia color (cada cuadro se suma sobre el anterior)."""
+        self.over_scene = False
+        self._start(scheduler, 0, 255, color, duration)
 
-    def fade_in(self, color=DARK_BLUE, speed=8):
-        surf = pygame.Surface((WIDTH, HEIGHT))
-        surf.fill(color)
-        for alpha in range(255, -1, -speed):
-            surf.set_alpha(alpha)
-            self.screen.blit(surf, (0, 0))
-            pygame.display.flip()
-            pygame.time.delay(8)
-
-    def fade_out(self, color=DARK_BLUE, speed=8):
-        surf = pygame.Surface((WIDTH, HEIGHT))
-        surf.fill(color)
-        for alpha in range(0, 255, speed):
-            surf.set_alpha(alpha)
-            self.screen.blit(surf, (0, 0))
-            pygame.display.flip()
-            pygame.time.delay(8)
+    def draw(self):
+        if self.alpha is not None:
+            self.surf.set_alpha(int(self.alpha))
+            self.screen.blit(self.surf, (0, 0))
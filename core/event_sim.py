@@ -0,0 +1,440 @@
+"""
+core/event_sim.py — RandomPac v1.4
+Simulación por eventos discretos.
+En vez de avanzar todas las entidades cuadro a cuadro, mantiene una cola de
+prioridad con los instantes (en ticks de TICK_MS) en que algo cambia:
+- ARRIVE:    una entidad llega al centro de una celda (o arranca quieta desde
+             uno) y decide ahí; sigue con lo que le sobraba del tick
+- SPEED:     cambia la velocidad del jugador (modo poder) y su tramo se rehace
+- POWER_END: un fantasma deja de estar asustado
+- RESPAWN:   tras perder una vida, jugador y fantasmas vuelven a sus casillas
+Entre dos eventos cada entidad avanza en línea recta a paso entero fijo
+(unidades de core/grid_mover): en el tick t va por off0 + paso·(t − t0) desde
+el centro de su celda, así el tick de llegada al centro siguiente es una
+división entera y la posición en cualquier tick sale sin simular los
+intermedios. Un fantasma comido vuelve como ojos a la casa (más rápido, por
+el campo de distancias) y tras revivir vuelve a decidir RESPAWN_WAIT_MS después.
+Las colisiones (continuas, sobre el tramo de cada tick: core/collision) solo
+se evalúan entre parejas a menos de dos celdas; entre dos eventos el primer
+tick de contacto sale de una vez de la distancia relativa, que es lineal
+(_first_contact), sin recorrer los ticks. El resultado coincide tick a tick
+con core/simulation para la misma semilla.
+Cada entidad llega a un centro cada ~8 ticks, así que casi uno de cada tres
+ticks tiene eventos: la ganancia frente a run_headless es ~2x (2.1x en
+total con python -m core.event_sim), no de un orden de magnitud.
+"""
+
+import heapq, math, time
+from settings import (DOT_SCORE, POWER_DOT_SCORE, GHOST_SCORE_BASE, FRENZY_TIME_MS, PLAYER_LIVES,
+                      EXTRA_LIFE_AT, MAX_LIVES, EATEN_SPEED_FACTOR)
+from core.simulation import TICK_MS, DIFFICULTY_SPEEDS, GHOST_SPAWNS
+from core.ghost import RESPAWN_WAIT_MS, VALIDS_BY_MASK, CHOICES
+from core.grid_mover import TILE_UNITS, HALF_UNITS, step_units
+from logic.map_compiler import DEFAULT_SPAWNS
+from core.input import NullInput, GreedyDotInput
+from core.collision import contact, COLLIDE_UNITS
+from logic.navigation import NavTable, DIRS4, DIR_BITS, OPEN_MASK
+from logic.map import load_compiled, eat_dot
+from logic.random_generators import LCG
+
+# Tipos de evento (el orden desempata eventos de la misma entidad en el mismo tick)
+EV_RESPAWN = 0
+EV_SPEED = 1
+EV_ARRIVE = 2
+EV_POWER_END = 3
+
+# Mismos valores que Player.update / Ghost
+PLAYER_SPEED = 3.2
+PLAYER_POWER_SPEED = 4.2
+STATE_NORMAL, STATE_FRIGHTENED, STATE_EATEN = 0, 1, 2
+RIGHT, UP = DIR_BITS[(1, 0)], DIR_BITS[(0, -1)]
+
+
+class _Mover:
+    """Entidad reducida: celda, dirección y el tramo recto que recorre desde el tick t0."""
+    __slots__ = ("slot", "c", "r", "d", "nd", "t0", "off0", "step", "bx", "by",
+                 "behavior", "state", "fr_until", "ver")
+
+    def __init__(self, slot, tile, d, behavior=None):
+        self.slot = slot
+        self.d = d
+        self.nd = RIGHT
+        self.behavior = behavior
+        self.state = STATE_NORMAL
+        self.fr_until = 0
+        self.ver = 0             # sube al reprogramarlo: descarta sus eventos pendientes
+        self.place(tile)
+
+    def place(self, tile):
+        """Quieto en el centro de tile."""
+        self.c, self.r = tile
+        self.bx = self.c * TILE_UNITS + HALF_UNITS
+        self.by = self.r * TILE_UNITS + HALF_UNITS
+        self.t0 = self.off0 = self.step = 0
+
+    def off_at(self, t):
+        return self.off0 + self.step * (t - self.t0)
+
+    def pos_at(self, t):
+        o = self.off0 + self.step * (t - self.t0)
+        dx, dy = DIRS4[self.d]
+        return self.bx + dx * o, self.by + dy * o
+
+
+class EventSimulation:
+    def __init__(self, generator, config=None, level=None, input_source=None, spawns=None):
+        self.config = config or {}
+        if level is None:
+            compiled = load_compiled(self.config.get("map"))
+            self.level, self.nav = compiled.new_grid(), compiled.nav
+            spawns = spawns or compiled.spawns
+        else:
+            self.level, self.nav = level, NavTable(level)
+        self.spawns = spawns or DEFAULT_SPAWNS
+        self.rows, self.cols = self.level.height, self.level.width
+        self.cells = self.level.cells
+        self.generator = generator
+        self.input = input_source or NullInput()
+
+        difficulty = self.config.get("difficulty", "Clásico")
+        self.speed_player, self.speed_ghost = DIFFICULTY_SPEEDS.get(difficulty, DIFFICULTY_SPEEDS["Clásico"])
+        # pasos enteros por tick (misma cuenta que GridMover.move_step)
+        self.step_ghost = step_units(self.speed_ghost, TICK_MS)
+        self.step_eyes = step_units(self.speed_ghost, TICK_MS * EATEN_SPEED_FACTOR)
+        self.nav.distances.pin(*self.spawns.house)
+
+        self.score = 0
+        self.lives = PLAYER_LIVES
+        self.extra_life_claimed = False
+        self.chain_eat = 0
+
+        # modo poder: último valor y el anterior (la velocidad del jugador lo ve con un tick de retraso)
+        self.power_until = 0
+        self.power_until_prev = 0
+        self.power_set_tick = -1
+
+        self.tick = 0
+        self.running = True
+        self.result = None
+        self.events_processed = 0
+        self.contact_ms = None      # ms de juego exactos del último choque
+
+        self._queue = []
+        self._seq = 0
+        self._epoch = 0
+        self._prev = None           # posiciones al empezar el tick en curso, por slot
+        self.player = None
+        self.ghosts = []
+        self._spawn(1)
+        self._push(2, EV_SPEED, self.player)      # la velocidad de la dificultad solo vale en el tick 1
+
+    # ---------- cola de eventos ----------
+    def _push(self, tick, kind, mover):
+        self._seq += 1
+        order = -1 if mover is None else mover.slot   # reinicio primero, luego jugador y fantasmas
+        ver = 0 if mover is None else mover.ver
+        heapq.heappush(self._queue, (tick, order, kind, self._seq, self._epoch, ver, mover))
+
+    def _spawn(self, tick):
+        """Coloca a todos quietos en sus casillas iniciales: deciden en este tick."""
+        self._epoch += 1
+        if self.player is None:
+            self.player = _Mover(0, self.spawns.player, RIGHT)
+        else:
+            self.player.place(self.spawns.player)
+            self.player.ver += 1
+        self.ghosts = [_Mover(i + 1, tile, UP, behavior)
+                       for i, (tile, (_, _, behavior)) in enumerate(zip(self.spawns.ghosts, GHOST_SPAWNS))]
+        for m in [self.player] + self.ghosts:
+            self._push(tick, EV_ARRIVE, m)
+
+    # ---------- reglas del mapa ----------
+    def _blocked_player(self, c, r):
+        if r < 0 or c < 0 or r >= self.rows or c >= self.cols:
+            return True
+        v = self.cells[r * self.cols + c]
+        return v == 1 or v == 4
+
+    def _player_speed(self, k):
+        """Velocidad usada en el tick k (Player.update la fija al final del tick anterior)."""
+        if k == 1:
+            return self.speed_player
+        pu = self.power_until if self.power_set_tick <= k - 2 else self.power_until_prev
+        return PLAYER_POWER_SPEED if TICK_MS * (k - 1) < pu else PLAYER_SPEED
+
+    def _step(self, m, k):
+        """Unidades que avanza m en el tick k."""
+        if m is self.player:
+            return step_units(self._player_speed(k), TICK_MS)
+        return self.step_eyes if m.state == STATE_EATEN else self.step_ghost
+
+    # ---------- movimiento ----------
+    def _arrive(self, m, t):
+        """Llega (o arranca quieto) en un centro en el tick t: decide y sigue con lo que sobra."""
+        if m.step:
+            rest = m.off_at(t) - TILE_UNITS
+            dx, dy = DIRS4[m.d]
+            m.place((m.c + dx, m.r + dy))
+        else:
+            rest = self._step(m, t)
+        c, r = m.c, m.r
+        if m is self.player:
+            mask = self.nav.player[r * self.cols + c]
+            d = self.input.decide(self.level, c, r, DIRS4[m.d ^ 1], self._blocked_player)
+            if d is not None:
+                m.nd = DIR_BITS[d]
+            if mask >> m.nd & 1:
+                m.d = m.nd
+        elif m.state == STATE_EATEN:
+            mask = self.nav.ghost[r * self.cols + c]
+            hc, hr = self.spawns.house
+            if (c, r) == (hc, hr):
+                # revive en la casa y espera (Ghost._return_to_house / respawn_timer)
+                m.state = STATE_NORMAL
+                self._push(t + -(-RESPAWN_WAIT_MS // TICK_MS), EV_ARRIVE, m)
+                return
+            valids = VALIDS_BY_MASK[mask & OPEN_MASK]
+            if valids:
+                m.d = DIR_BITS[self.nav.distances.best(c, r, [DIRS4[i] for i in valids], hc, hr)]
+            m.nd = m.d
+        else:
+            mask = self.nav.ghost[r * self.cols + c]
+            valids = CHOICES[mask & OPEN_MASK][m.d ^ 1]
+            if not valids:
+                m.nd = m.d ^ 1
+            elif m.behavior == "chaser":
+                pc, pr = self.player.c, self.player.r
+                m.nd = DIR_BITS[self.nav.distances.best(c, r, [DIRS4[i] for i in valids], pc, pr)]
+            else:
+                rv = self.generator.random()
+                m.nd = valids[int(rv * len(valids)) % len(valids)]
+            m.d = m.nd
+
+        if mask >> m.d & 1:
+            self._go(m, t, rest, self._step(m, t + 1))
+        # si no, queda quieto en el centro (sin más eventos hasta un reinicio)
+
+    def _go(self, m, t, off, step):
+        """Tramo recto desde el tick t (avance off) a `step` unidades por tick; programa la llegada."""
+        m.t0, m.off0, m.step = t, off, step
+        self._push(t + -(-(TILE_UNITS - off) // step), EV_ARRIVE, m)
+
+    def _rebase(self, m, t, step):
+        """Rehace el tramo en curso desde el tick t con otro paso (velocidad nueva o comido)."""
+        if not m.step:
+            return
+        m.ver += 1                   # descarta la llegada calculada con el paso anterior
+        self._go(m, t, m.off_at(t), step)
+
+    # ---------- reglas de juego ----------
+    def _add_score(self, v):
+        self.score += int(v)
+        if (not self.extra_life_claimed) and self.score >= EXTRA_LIFE_AT and self.lives < MAX_LIVES:
+            self.lives += 1
+            self.extra_life_claimed = True
+
+    def _eat_dots(self, t):
+        p = self.player
+        v = self.cells[p.r * self.cols + p.c]
+        if v not in (2, 3):
+            return
+        if v == 2:
+            self._add_score(DOT_SCORE)
+        else:
+            self._add_score(POWER_DOT_SCORE)
+            self.chain_eat = 0
+            now = t * TICK_MS
+            until = now + FRENZY_TIME_MS
+            for g in self.ghosts:
+                if g.state != STATE_EATEN:
+                    g.state = STATE_FRIGHTENED
+                    g.fr_until = until
+                    self._push(until // TICK_MS + 1, EV_POWER_END, g)
+            self.power_until_prev = self.power_until
+            self.power_until = until
+            self.power_set_tick = t
+            # el jugador acelera dos ticks después y frena en el primero que empieza con el modo vencido
+            self._push(t + 2, EV_SPEED, p)
+            self._push(-(-until // TICK_MS) + 1, EV_SPEED, p)
+        eat_dot(self.level, p.c, p.r)
+
+    def _near(self, g):
+        p = self.player
+        return abs(p.c - g.c) <= 2 and abs(p.r - g.r) <= 2
+
+    def _resolve_collisions(self, t):
+        """Mismo orden que Simulation._check_collisions. True si se perdió una vida."""
+        p = self.player
+        p0, p1 = self._prev[0], p.pos_at(t)
+        hits = []
+        for g in self.ghosts:
+            if g.state != STATE_EATEN and self._near(g):
+                s = contact(p0, p1, self._prev[g.slot], g.pos_at(t))
+                if s is not None:
+                    hits.append((s, g.slot, g))
+        hits.sort()
+        for s, _, g in hits:
+            self.contact_ms = (t - 1 + s) * TICK_MS
+            if g.state == STATE_FRIGHTENED:
+                self.chain_eat += 1
+                self._add_score(GHOST_SCORE_BASE * (2 ** (self.chain_eat - 1)))
+                self._eaten(g, t)
+            else:
+                self.lives -= 1
+                self.chain_eat = 0
+                if self.lives <= 0:
+                    self.result = "lose"
+                    self.running = False
+                else:
+                    self._epoch += 1
+                    self._push(t + 1, EV_RESPAWN, None)
+                return True
+        return False
+
+    def _eaten(self, g, t):
+        """g pasa a ojos al final del tick t; si iba a medio tramo, lo sigue a velocidad de ojos."""
+        g.state = STATE_EATEN
+        if g.step:
+            self._rebase(g, t, self.step_eyes)
+        else:
+            g.ver += 1               # descarta la espera en la casa
+            self._push(t + 1, EV_ARRIVE, g)      # quieto en un centro: decide como ojos en t + 1
+
+    def _end_of_tick(self, t):
+        self._eat_dots(t)
+        if self._resolve_collisions(t):
+            return
+        if self.level.dots_left == 0:
+            self.result = "win"
+            self.running = False
+
+    def _next_collision_tick(self, t0, t1):
+        """Primer tick en [t0, t1) con alguna pareja jugador-fantasma en contacto."""
+        if t0 >= t1:
+            return None
+        p = self.player
+        first = None
+        for g in self.ghosts:
+            if g.state != STATE_EATEN and self._near(g):
+                t = self._first_contact(p, g, t0, first or t1)
+                if t is not None:
+                    first = t
+        return first
+
+    @staticmethod
+    def _first_contact(p, g, t0, t1):
+        """
+        Primer tick en [t0, t1) en que core.collision.contact daría contacto
+        entre p y g, sin recorrer los ticks. Entre t0 - 1 y t1 los dos siguen
+        su tramo recto, así que la distancia relativa es D(k) = D0 + V·k (k en
+        ticks desde t0 - 1) y |D(k)|² − radio² es una cuadrática entera
+        a·k² + 2·b·k + c. El tick t0 + k choca si k ∈ (k1 − 1, k2), con k1 < k2
+        sus raíces: el primero es max(0, ⌊k1⌋). Todo en enteros (isqrt), así
+        coincide con el barrido tick a tick.
+        """
+        (px, py), (gx, gy) = p.pos_at(t0 - 1), g.pos_at(t0 - 1)
+        (pdx, pdy), (gdx, gdy) = DIRS4[p.d], DIRS4[g.d]
+        ax, ay = px - gx, py - gy
+        vx = pdx * p.step - gdx * g.step
+        vy = pdy * p.step - gdy * g.step
+        c = ax * ax + ay * ay - COLLIDE_UNITS * COLLIDE_UNITS
+        if c < 0:
+            return t0                    # ya se tocan al empezar
+        a = vx * vx + vy * vy
+        b = ax * vx + ay * vy
+        disc = b * b - a * c
+        if b >= 0 or disc <= 0:
+            return None                  # se alejan, o se rozan sin tocarse
+        # ⌊k1⌋ con k1 = (−b − √disc) / a
+        q = math.isqrt(disc)
+        k = (-b - q) // a if q * q == disc else (-b - q - 1) // a
+        y = a * k + b                    # k < k2  ⟺  a·k + b < √disc
+        if y >= 0 and y * y >= disc:
+            return None
+        t = t0 + k
+        return t if t < t1 else None
+
+    def _remember(self, t):
+        """Posiciones al empezar el tick t (antes de que sus eventos cambien los tramos)."""
+        self._prev = [m.pos_at(t - 1) for m in (self.player, *self.ghosts)]
+
+    # ---------- bucle ----------
+    def run(self, max_ms=None):
+        """Procesa eventos hasta terminar la partida (o agotar max_ms de juego)."""
+        max_tick = math.ceil(max_ms / TICK_MS) if max_ms is not None else None
+        queue = self._queue
+        while self.running and queue:
+            t = queue[0][0]
+            hit = self._next_collision_tick(self.tick + 1, t)
+            if hit is not None:
+                t = hit
+            if max_tick is not None and t > max_tick:
+                break
+            self.tick = t
+
+            self._prev = None
+            while queue and queue[0][0] == t:
+                _, _, kind, _, epoch, ver, m = heapq.heappop(queue)
+                if kind == EV_RESPAWN:
+                    self.events_processed += 1
+                    self._spawn(t)
+                    continue
+                if self._prev is None:
+                    self._remember(t)
+                if kind == EV_SPEED:
+                    # sobrevive a los reinicios: la velocidad sigue al modo poder, no a la vida
+                    self.events_processed += 1
+                    self._rebase(m, t - 1, self._step(m, t))
+                    continue
+                if epoch != self._epoch or ver != m.ver:
+                    continue
+                self.events_processed += 1
+                if kind == EV_ARRIVE:
+                    self._arrive(m, t)
+                elif kind == EV_POWER_END:
+                    if m.state == STATE_FRIGHTENED and t * TICK_MS > m.fr_until:
+                        m.state = STATE_NORMAL
+
+            if self._prev is None:
+                self._remember(t)
+            self._end_of_tick(t)
+
+        if self.running and max_tick is not None:
+            self.tick = max_tick
+        return self.result
+
+
+def run_events(generator_class, seed, config=None, level=None, max_ms=10 * 60 * 1000, spawns=None):
+    """Equivalente por eventos de core.simulation.run_headless (mismo bot, mismo resumen)."""
+    sim = EventSimulation(generator_class(seed), config=config, level=level,
+                          input_source=GreedyDotInput(LCG(seed)), spawns=spawns)
+    sim.run(max_ms)
+    return {
+        "seed": seed,
+        "score": sim.score,
+        "lives": sim.lives,
+        "time_ms": sim.tick * TICK_MS,
+        "result": sim.result or "timeout",
+    }
+
+
+if __name__ == "__main__":
+    # Compara resultados y velocidad frente al motor cuadro a cuadro
+    from core.simulation import run_headless
+    from logic.random_generators import MiddleSquare, PAM
+    total_frames = total_events = 0.0
+    for cls in (LCG, MiddleSquare, PAM):
+        for difficulty in DIFFICULTY_SPEEDS:
+            cfg = {"difficulty": difficulty}
+            seeds = range(1000, 1010)
+            t0 = time.perf_counter()
+            frames = [run_headless(cls, s, cfg) for s in seeds]
+            t1 = time.perf_counter()
+            events = [run_events(cls, s, cfg) for s in seeds]
+            t2 = time.perf_counter()
+            same = sum(a == b for a, b in zip(frames, events))
+            print(f"{cls.__name__:>12} {difficulty:>8}: {same}/{len(seeds)} iguales, "
+                  f"cuadros {t1 - t0:.2f}s, eventos {t2 - t1:.2f}s ({(t1 - t0) / (t2 - t1):.1f}x)")
+            total_frames += t1 - t0
+            total_events += t2 - t1
+    print(f"total: cuadros {total_frames:.2f}s, eventos {total_events:.2f}s ({total_frames / total_events:.1f}x)")
@@ -0,0 +1,51 @@
+"""
+core/frame_pacer.py — RandomPac v1.0
+Ritmo de cuadros del bucle principal (un solo tick de reloj por vuelta).
+La simulación no depende de esto: GameLoop acumula el dt y avanza en ticks
+fijos de TICK_MS (el paso que fijan las repeticiones y los motores
+headless), y al dibujar interpola las posiciones entre el tick anterior y el
+actual. Este módulo solo decide cuándo se presenta un cuadro:
+- "capped":   a FPS (clock.tick(FPS))
+- "uncapped": lo más rápido posible
+- "vsync":    al ritmo del monitor (display.flip espera el refresco)
+Protección contra la espiral de la muerte: un cuadro nunca aporta más de
+MAX_FRAME_MS de dt, así un cuadro lento no obliga a simular cada vez más.
+"""
+
+import pygame
+from settings import FPS, PRESENT_MODE, MAX_FRAME_MS
+
+PRESENT_MODES = ("capped", "uncapped", "vsync")
+
+
+def open_display(size, mode=PRESENT_MODE):
+    """Abre la ventana; devuelve (pantalla, modo). Sin soporte de vsync se usa "capped"."""
+    if mode not in PRESENT_MODES:
+        raise ValueError(f"PRESENT_MODE desconocido: {mode!r} (opciones: {', '.join(PRESENT_MODES)})")
+    if mode == "vsync":
+        try:
+            return pygame.display.set_mode(size, pygame.SCALED, vsync=1), mode
+        except pygame.error:
+            mode = "capped"
+    return pygame.display.set_mode(size), mode
+
+
+class FramePacer:
+    def __init__(self, mode=PRESENT_MODE, fps=FPS, max_frame_ms=MAX_FRAME_MS):
+        self.mode = mode
+        self.fps = fps
+        self.max_frame_ms = max_frame_ms
+        self.clock = pygame.time.Clock()
+        self.raw_ms = 0             # dt real del último cuadro (sin recortar)
+
+    def tick(self, game_frame=True):
+        """
+        Espera lo que corresponda y devuelve el dt del cuadro en ms (recortado
+        a max_frame_ms). Los menús (game_frame=False) siempre van a FPS.
+        """
+        limit = self.fps if (self.mode == "capped" or not game_frame) else 0
+        self.raw_ms = self.clock.tick(limit)
+        return min(self.raw_ms, self.max_frame_ms)
+
+    def get_fps(self):
+        return self.clock.get_fps()
@@ -1,79 +1,143 @@
 """
-core/game_loop.py — RandomPac v1.6
-Bucle principal: integra dificultad (velocidad), sonido y RNG.
+core/game_loop.py — RandomPac v2.2
+Bucle principal: renderer interactivo (pantalla, HUD, sonido) sobre core/simulation.
+La simulación avanza en ticks fijos de TICK_MS (acumulando el dt real), así
+cada partida queda grabada como repetición y se puede reproducir exacta.
+Al dibujar, los sprites se interpolan entre la posición del tick anterior y
+la del actual según lo que sobró en el acumulador (settings.INTERPOLATE),
+así el movimiento es suave a cualquier ritmo de cuadros (core/frame_pacer).
+Una cámara (core/camera) sigue al jugador: solo se dibujan las celdas y
+entidades visibles, así que los mapas pueden ser más grandes que la ventana.
+El laberinto no se redibuja celda a celda: core/maze_layer lo guarda ya
+dibujado y solo borra los puntos que se comen.
+Nada bloquea el bucle: el popup "+200", la pausa al morir y los fundidos son
+estados con duración de core/scheduler (la simulación se congela, el dibujo
+y los eventos siguen).
 """
 
 import pygame, sys, os, time
 from settings import *
-from core.player import Player
-from core.ghost import Ghost, STATE_FRIGHTENED, STATE_EATEN, STATE_NORMAL
+from core.simulation import Simulation, TICK_MS
+from core.input import KeyboardInput
+from core.replay import Replay, RecordingInput, ReplayInput, KEYFRAME_TICKS
+from core.snapshot import RewindBuffer
 from core.hud import HUD
-from core.effects import Transition
-from logic.map import load_map, eat_dot
+from core.camera import Camera
+from core.maze_layer import MazeLayer
+from core.effects import Transition, FADE_MS
+from core.scheduler import Scheduler
+from core.frame_pacer import FramePacer
+from core import text
 from audio.sfx import SFX
 from storage.profile import update_stats
 
 class GameLoop:
-    def __init__(self, screen, generator_class, method_name, seed, config=None):
+    def __init__(self, screen, generator_class, method_name, seed, config=None, input_source=None,
+                 replay=None, playback_speed=1, level=None, spawns=None, turbo=1):
         self.screen = screen
         self.config = config or {}
-        self.level = load_map(self.config.get("map"))
-        self.generator = generator_class(seed)
         self.method_name = method_name
         self.seed = seed
-        self.power_mode_until = 0  # tiempo en ms hasta cuando dura el modo poder
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(FONT_MAIN, 24)
-        self.running = True
+        self.pacer = FramePacer()
+        self.font = text.font(None, 24)
         self.paused = False
+        self._acc = 0.0            # ms reales pendientes de simular
 
-        # === CONFIGURACIÓN GENERAL ===
-        difficulty = self.config.get("difficulty", "Clásico")
-
-        # === VELOCIDADES POR DIFICULTAD ===
-        if difficulty == "Clásico":
-            self.speed_player = 3.2
-            self.speed_ghost = 3.0
-        elif difficulty == "Difícil":
-            self.speed_player = 3.8
-            self.speed_ghost = 3.6
-        elif difficulty == "Extremo":
-            self.speed_player = 4.4
-            self.speed_ghost = 4.2
+        # === SIMULACIÓN (reglas del juego, sin pygame.display) ===
+        # playback_speed: 1, 8... o None = lo más rápido posible (sin dibujar)
+        self.playback_speed = playback_speed
+        # turbo: ms de juego por ms real (también en partida). Siempre son más
+        # ticks fijos de TICK_MS, nunca ticks más largos: a 1x, 4x o 16x la
+        # partida es la misma tick a tick
+        self.turbo = turbo
+        if replay is not None:
+            self.replay = replay
+            self.recording = False
+            self.sim = replay.new_simulation(generator_class, input_source=ReplayInput(replay))
         else:
-            self.speed_player = 3.2
-            self.speed_ghost = 3.0
-
-        # === ENTIDADES ===
-        # === ENTIDADES ===
-        self.player = Player(self.level, start_tile=(13, 23), color=YELLOW, speed=self.speed_player)
-        self.player.game_ref = self  # <--- referencia al juego
-
-        self.ghosts = pygame.sprite.Group(
-            Ghost(self.level, (13, 13), RED, "chaser", self.player, self.speed_ghost, self.generator),
-            Ghost(self.level, (14, 13), PINK, "random", self.player, self.speed_ghost, self.generator),
-            Ghost(self.level, (12, 13), CYAN, "random", self.player, self.speed_ghost, self.generator),
-            Ghost(self.level, (15, 13), ORANGE, "random", self.player, self.speed_ghost, self.generator),
-        )
+            # level / spawns: mapa ya armado (p. ej. generado); si no, el de config["map"]
+            self.sim = Simulation(generator_class(seed), config=self.config, level=level, spawns=spawns)
+            self.replay = Replay.for_simulation(self.sim, seed, method_name, embed=level is not None)
+            self.recording = True
+            self.sim.input = self.sim.player.input = RecordingInput(input_source or KeyboardInput(), self.replay)
+            self.replay.add_keyframe(self.sim)
+        # últimos 10 s para rebobinar (mantener BACKSPACE)
+        self.rewind = RewindBuffer()
+        if self.recording:
+            self.rewind.push(self.sim)
+        self.generator = self.sim.generator
+        w, h = self.screen.get_size()
+        self.camera = Camera(w, h - HUD_HEIGHT, self.level.width, self.level.height)
+        # muros y puntos pre-dibujados; eat_dot borra cada punto comido de la capa
+        self.maze = MazeLayer(self.level)
+        # dibujo por rectángulos sucios (settings.DIRTY_RECTS)
+        self.dirty_rects = DIRTY_RECTS
+        self._full = True            # el próximo cuadro se dibuja entero
+        self._sprite_rects = []      # dónde quedaron los sprites en el cuadro anterior
+        self._view = pygame.Rect(0, HUD_HEIGHT, w, h - HUD_HEIGHT)
+        self._cam_at = None
+        self._blink = None
+
+        # efectos con tiempo (popups, pausa al morir, fundidos)
+        self.fx = Scheduler()
+        self.transition = Transition(self.screen)
+        self._popups = []            # (superficie, rect en pantalla) de los "+200"
+
+        # interpolación: posición de cada entidad antes del último tick
+        self.interpolate = INTERPOLATE
+        self._prev = {}
 
         self.hud = HUD(self.screen, self.font, self.method_name, self.seed)
+        self._refresh_hud()
 
         # sonidos
         self.sfx = SFX()
-        self.chain_eat = 0          # cadena de comer fantasmas
         self.start_time = time.time()
 
+    # ---------- ACCESOS A LA SIMULACIÓN ----------
+    @property
+    def level(self):
+        return self.sim.level
+
+    @property
+    def player(self):
+        return self.sim.player
+
+    @property
+    def ghosts(self):
+        return self.sim.ghosts
+
+    @property
+    def running(self):
+        return self.sim.running
+
+    @property
+    def result(self):
+        return self.sim.result
+
+    @property
+    def power_mode_until(self):
+        return self.sim.power_mode_until
+
+    @property
+    def chain_eat(self):
+        return self.sim.chain_eat
+
     # ---------- BUCLE ----------
     def run(self):
-        Transition(self.screen).fade_out()
-        while self.running:
-            dt = self.clock.tick(FPS)
+        self.transition.fade_out(self.fx)
+        self.fx.hold(FADE_MS)
+        ended = False
+        while self.running or self.busy:
+            dt = self.pacer.tick()
             for e in pygame.event.get():
                 if e.type == pygame.QUIT:
                     pygame.quit(); sys.exit()
             self.update(dt)
             self.draw()
-        pygame.time.delay(600)
+            if not self.running and not ended:
+                ended = True
+                self.fx.hold(600)        # última imagen en pantalla antes de salir
 
         # guardar estadísticas al salir de la partida
         duration = int(time.time() - self.start_time)
@@ -84,135 +148,288 @@ class GameLoop:
             self.config
         )
 
-    # ---------- LÓGICA ----------
-    def reset_positions(self):
-        self.player.teleport((13, 23))
-        self.ghosts.empty()  # limpia el grupo
-
-        # recrea todos los fantasmas en sus posiciones iniciales
-        new_ghosts = [
-            Ghost(self.level, (13, 13), RED, "chaser", self.player, self.speed_ghost, self.generator),
-            Ghost(self.level, (14, 13), PINK, "random", self.player, self.speed_ghost, self.generator),
-            Ghost(self.level, (12, 13), CYAN, "random", self.player, self.speed_ghost, self.generator),
-            Ghost(self.level, (15, 13), ORANGE, "random", self.player, self.speed_ghost, self.generator),
-        ]
-        self.ghosts.add(new_ghosts)
+    # ---------- REPETICIONES ----------
+    @property
+    def busy(self):
+        """¿Hay un efecto en curso (popup, pausa, fundido)? main.py espera a que termine."""
+        return self.fx.busy
 
-        for g in self.ghosts:
-            g.current_dir = pygame.Vector2(0, -1)
-            g.state = STATE_NORMAL
-            g._draw()
+    @property
+    def speed(self):
+        """Ritmo efectivo de la simulación (repetición x turbo)."""
+        return None if self.fast_forward else self.playback_speed * self.turbo
 
+    @property
+    def fast_forward(self):
+        return self.playback_speed is None
+
+    @property
+    def replay_done(self):
+        return not self.recording and self.sim.ticks >= self.replay.ticks
+
+    def seek(self, tick):
+        """Salta (adelante o atrás) a un tick de la repetición en reproducción."""
+        self.replay.seek(self.sim, tick)
+        self._prev = {}
+        self.fx.clear()
+        self._popups.clear()
+        self.maze.invalidate()
+        self.redraw_all()
+        self._acc = 0.0
+        self.sfx.stop("frightened")
+        self._refresh_hud()
+
+    def rewind_ticks(self, ticks):
+        """Rebobina la partida en curso; la repetición se corta en el punto restaurado."""
+        if self.rewind.rewind(self.sim, ticks):
+            self.replay.truncate(self.sim.ticks)
+            self._prev = {}
+            self.maze.invalidate()
+            self.redraw_all()
+            self._acc = 0.0
+            self.sfx.stop("frightened")
+            self._refresh_hud()
+
+    def save_replay(self, path=None):
+        """Guarda la partida grabada (storage/replays por defecto) y devuelve la ruta."""
+        self.replay.finish(self.sim)
+        return self.replay.save(path)
+
+    # ---------- LÓGICA ----------
+    def _refresh_hud(self, message=None):
+        self.hud.update(self.player.score, self.player.lives, message, dots=self.level.dots_left)
 
     def update(self, dt):
-        # mover entidades
-        self.player.update(dt)
+        self.fx.advance(dt)
+        if self.fx.holding:
+            return                       # simulación congelada por un efecto
+        if self.fast_forward:
+            # tantos ticks como quepan en el presupuesto de un cuadro
+            deadline = time.perf_counter() + 1.0 / FPS
+            while self.running and not self.replay_done and time.perf_counter() < deadline:
+                self.sim.step(TICK_MS)
+            self._prev = {}
+            self._refresh_hud()
+            return
+
+        if self.recording and pygame.key.get_pressed()[pygame.K_BACKSPACE]:
+            self.rewind_ticks(max(1, round(dt / TICK_MS)))
+            return
+
+        speed = self.speed
+        self._acc = min(self._acc + dt * speed, MAX_FRAME_MS * speed)
+        while self._acc >= TICK_MS and self.running and not self.replay_done:
+            self._acc -= TICK_MS
+            self._tick()
+            if self.fx.holding:
+                self._acc = 0.0          # el tiempo congelado no se recupera después
+                self._prev = {}          # y la escena queda quieta en el tick actual
+                break
+
+    def _remember(self):
+        """Guarda dónde estaba cada entidad antes del tick (para interpolar)."""
+        prev = {self.player: (self.player.pos.x, self.player.pos.y)}
         for g in self.ghosts:
-            g.update(dt)
-
-        # comer dots / power
-        # comer dots / power
-        c, r = int(self.player.tile.x), int(self.player.tile.y)
-        pre = self.level[r][c]
-        if pre in (2, 3):  # 2 = dot, 3 = power
-            if pre == 2:
-                self.player.add_score(DOT_SCORE)
+            prev[g] = (g.pos.x, g.pos.y)
+        self._prev = prev
+
+    def _render_rect(self, entity, alpha):
+        """Rect del mundo donde dibujar entity: entre el tick anterior y el actual."""
+        prev = self._prev.get(entity)
+        if prev is None or alpha >= 1.0:
+            return entity.rect
+        px, py = prev
+        x, y = entity.pos.x, entity.pos.y
+        if abs(x - px) + abs(y - py) > TILE_SIZE:
+            return entity.rect           # teletransporte (vida perdida): sin arrastre
+        return entity.rect.move(int(px + (x - px) * alpha) - entity.rect.centerx,
+                                int(py + (y - py) * alpha) - entity.rect.centery)
+
+    def _tick(self):
+        quiet = self.speed != 1               # sin pausas dramáticas al adelantar
+        if self.interpolate:
+            self._remember()
+        events = self.sim.step(TICK_MS)
+        if self.recording:
+            self.rewind.push(self.sim)
+            if self.sim.ticks % KEYFRAME_TICKS == 0:
+                self.replay.add_keyframe(self.sim)
+        for name, data in events:
+            if name == "dot":
                 self.sfx.play("dot")
-            else:
-                # power pellet
-                self.player.add_score(POWER_DOT_SCORE)
-                self.chain_eat = 0
-                now = pygame.time.get_ticks()
-                for g in self.ghosts:
-                    g.set_frightened(now)
-                # activar modo poder global
-                self.power_mode_until = now + FRENZY_TIME_MS
+                self._refresh_hud()
+            elif name == "power":
                 self.sfx.play("power")
                 self.sfx.stop("frightened")
                 self.sfx.loop("frightened")
-            eat_dot(self.level, c, r)
-            self.hud.update(self.player.score, self.player.lives)
+                self._refresh_hud()
+            elif name == "ghost_eaten":
+                gain, pos = data
+                self.sfx.play("ghost_eat")
+                if quiet:
+                    self._refresh_hud(f"+{gain}")
+                    continue
 
-        # -------- COLISIONES CIRCULARES --------
-        for g in self.ghosts:
-            dx = self.player.pos.x - g.pos.x
-            dy = self.player.pos.y - g.pos.y
-            dist = (dx * dx + dy * dy) ** 0.5
-
-            if dist < TILE_SIZE * 0.6:  # colisión justa
-                if g.state == STATE_FRIGHTENED:
-                    self.chain_eat += 1
-                    gain = GHOST_SCORE_BASE * (2 ** (self.chain_eat - 1))
-                    self.player.add_score(gain)
-                    g.was_eaten()
-                    self.sfx.play("ghost_eat")
-
-                    # 🔹 DIBUJA SOLO EL +100 sin limpiar la pantalla
-                    text = self.font.render(f"+{gain}", True, (255, 255, 255))
-                    rect = text.get_rect(center=g.pos)
-
-                    # Redibuja la escena actual (sin llenar la pantalla azul)
-                    self.draw_grid()
-                    self.screen.blit(self.player.image, self.player.rect)
-                    self.ghosts.draw(self.screen)
-                    self.hud.draw()
-
-                    # Ahora dibuja el texto encima
-                    self.screen.blit(text, rect)
-                    pygame.display.update(rect)  # actualiza solo esa zona
-                    pygame.time.delay(300)
-
-                    self.hud.update(self.player.score, self.player.lives, f"+{gain}")
-                elif g.state != STATE_EATEN:
-                    # perder vida
-                    self.player.lives -= 1
-                    self.sfx.stop("frightened")
-                    self.sfx.play("death")
-                    #Para que la música de la muerte suene en tiempo
-                    self.draw()
-                    pygame.display.flip()
-                    self.sfx.play("death")
-                    pygame.time.delay(300)
-                    #------------------------------------------
-                    self.chain_eat = 0
-                    if self.player.lives <= 0:
-                        self.result = "lose"
-                        self.running = False
-                        pygame.mixer.music.stop()
-                        return
-                    self.reset_positions()
-                    self.hud.update(self.player.score, self.player.lives, "¡Ay!")
+                # 🔹 "+200" sobre la escena congelada 300 ms
+                label = text.render(self.font, f"+{gain}", (255, 255, 255))
+                popup = (label, label.get_rect(center=self.camera.to_screen(*pos)))
+                self._popups.append(popup)
+                self.fx.hold(300)
+                self.fx.after(300, lambda p=popup: self._close_popup(p))
+                self._refresh_hud(f"+{gain}")
+            elif name == "death":
+                self.sfx.stop("frightened")
+                self.sfx.play("death")
+                if quiet and self.running:
+                    self._refresh_hud("¡Ay!")
+                    continue
+                # el cuadro del choque queda 300 ms en pantalla
+                self.fx.hold(300)
+                if not self.running:
+                    self.fx.after(300, pygame.mixer.music.stop)
+                    return
+                self._refresh_hud("¡Ay!")
 
         # detener sonido cuando termina el modo poder
-        # detener sonido cuando termina el modo poder
-        if pygame.time.get_ticks() > self.power_mode_until:
+        if not self.sim.power_active():
             self.sfx.stop("frightened")
 
-        # victoria
-        if all(all(v not in (2, 3) for v in row) for row in self.level):
-            self.result = "win"
-            self.running = False
-
     # ---------- DIBUJO ----------
     def draw_grid(self):
-        for r, row in enumerate(self.level):
-            for c, val in enumerate(row):
-                x = c * TILE_SIZE
-                y = HUD_HEIGHT + r * TILE_SIZE
-                if val == 1:
-                    pygame.draw.rect(self.screen, WALL_COLOR, (x, y, TILE_SIZE, TILE_SIZE))
-                elif val == 4:
-                    pygame.draw.rect(self.screen, (150,150,255), (x+8, y+TILE_SIZE//2-2, TILE_SIZE-16, 4))
-                elif val == 2:
-                    pygame.draw.circle(self.screen, (255,255,255), (x+TILE_SIZE//2, y+TILE_SIZE//2), 3)
-                elif val == 3:
-                    t = (pygame.time.get_ticks()//250)%2==0
-                    if t: pygame.draw.circle(self.screen, (255,255,102), (x+TILE_SIZE//2, y+TILE_SIZE//2), 6)
+        """Copia los bloques visibles de la capa del laberinto y dibuja los power dots."""
+        self.maze.draw(self.screen, self.camera, self.sim.now)
 
-    def draw(self):
-        self.screen.fill(DARK_BLUE)
+    def _close_popup(self, popup):
+        self._popups.remove(popup)
+        self.redraw_all()                # borra el texto
+
+    def redraw_all(self):
+        """El próximo cuadro se dibuja entero (cambio de escena, menú encima, seek…)."""
+        self._full = True
+
+    def _alpha(self):
+        """Fracción del próximo tick ya transcurrida (0 = justo en el tick actual)."""
+        if not self.interpolate or not self._prev:
+            return 1.0
+        return min(1.0, self._acc / TICK_MS)
+
+    def _follow(self, alpha):
+        rect = self._render_rect(self.player, alpha)
+        self.camera.follow(rect.centerx, rect.centery)
+
+    def _draw_scene(self):
+        self._follow(self._alpha())
         self.draw_grid()
-        self.screen.blit(self.player.image, self.player.rect)
-        self.ghosts.draw(self.screen)
+        self._sprite_rects = self._draw_sprites()
+        self.hud.set_time(self.sim.now)
         self.hud.draw()
-        pygame.display.flip()
\ No newline at end of file
+
+    def _draw_sprites(self):
+        """Dibuja los sprites visibles y devuelve sus rects en pantalla."""
+        cam, now, alpha = self.camera, self.sim.now, self._alpha()
+        self.player.render()
+        rect = cam.apply(self._render_rect(self.player, alpha))
+        self.screen.blit(self.player.image, rect)
+        rects = [rect]
+        for g in self.ghosts:
+            world = self._render_rect(g, alpha)
+            if cam.sees(world):
+                g.render(now)
+                rect = cam.apply(world)
+                self.screen.blit(g.image, rect)
+                rects.append(rect)
+        return rects
+
+    def _draw_dirty(self):
+        """
+        Repinta solo lo que cambió: el fondo donde estaban los sprites, las
+        celdas comidas y los power dots al parpadear; luego los sprites y el
+        HUD si cambió. Devuelve los rects a enviar a la pantalla, o None si
+        hay que dibujar todo (primer cuadro, cambio de escena o la cámara se movió).
+        """
+        cam, now = self.camera, self.sim.now
+        self._follow(self._alpha())
+        eaten = self.maze.take_eaten()
+        blink = (now // 250) % 2
+        if self._full or eaten is None or (cam.x, cam.y) != self._cam_at:
+            return None
+
+        dirty = self._sprite_rects + [self.maze.tile_rect(cam, c, r) for c, r in eaten]
+        if blink != self._blink:
+            dirty += self.maze.power_rects(cam)
+            self._blink = blink
+        dirty = [r.clip(self._view) for r in dirty]
+        for r in dirty:
+            self.maze.draw(self.screen, cam, now, area=r)
+        self._sprite_rects = self._draw_sprites()
+        dirty += self._sprite_rects
+        for label, rect in self._popups:
+            self.screen.blit(label, rect)
+            dirty.append(rect)
+        # un sprite que asoma sobre la barra obliga a repintarla encima
+        covered = self.hud.rect.collidelist(self._sprite_rects) >= 0
+        self.hud.set_time(self.sim.now)
+        dirty += self.hud.draw(force=covered)
+        return dirty
+
+    def draw(self):
+        if self.fast_forward and self.running and not self.replay_done:
+            return
+        if self.transition.active:
+            if self.transition.over_scene:
+                self.screen.fill(DARK_BLUE)
+                self._draw_scene()
+            self.transition.draw()
+            pygame.display.flip()
+            self.redraw_all()
+            return
+        if self.dirty_rects:
+            rects = self._draw_dirty()
+            if rects is not None:
+                pygame.display.update(rects)
+                return
+        self.screen.fill(DARK_BLUE)
+        self._draw_scene()
+        for label, rect in self._popups:
+            self.screen.blit(label, rect)
+        self._full = False
+        self._cam_at = (self.camera.x, self.camera.y)
+        self._blink = (self.sim.now // 250) % 2
+        self.maze.take_eaten()
+        pygame.display.flip()
+
+
+if __name__ == "__main__":
+    # python -m core.game_loop → tiempo de dibujo por cuadro con y sin rectángulos sucios
+    # (la prueba del turbo y de los tramos está en python -m core.turbo_check)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from core.input import GreedyDotInput
+    from logic.random_generators import LCG
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    sent = [0]                  # píxeles enviados a la pantalla
+    flip, update = pygame.display.flip, pygame.display.update
+    def counted_flip():
+        sent[0] += WIDTH * HEIGHT
+        flip()
+    def counted_update(rects):
+        sent[0] += sum(r.w * r.h for r in rects)
+        update(rects)
+    pygame.display.flip, pygame.display.update = counted_flip, counted_update
+
+    for dirty in (False, True):
+        game = GameLoop(screen, LCG, "LCG", 7, {"difficulty": "Clásico"}, GreedyDotInput(LCG(7)),
+                        playback_speed=2)
+        game.dirty_rects = dirty
+        times, sent[0] = [], 0
+        while game.running and len(times) < 1500:
+            game.update(TICK_MS)
+            t0 = time.perf_counter()
+            game.draw()
+            times.append((time.perf_counter() - t0) * 1000)
+        times.sort()
+        med, p95 = times[len(times) // 2], times[int(len(times) * 0.95)]
+        print(f"rects sucios {'sí' if dirty else 'no'}: mediana {med:.3f} ms, p95 {p95:.3f} ms, "
+              f"{sent[0] / len(times) / (WIDTH * HEIGHT):.1%} de la pantalla por cuadro ({len(times)} cuadros)")
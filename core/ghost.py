@@ -1,19 +1,37 @@
 """
-core/ghost.py — RandomPac v3.0
+core/ghost.py — RandomPac v3.4
 Fantasmas con comportamiento pseudoaleatorio controlado por el generador seleccionado.
+El aspecto sale de la caché compartida de core/sprites: render() solo cambia
+self.image cuando cambia el aspecto (estado, color, mirada o parpadeo).
+update(dt) avanza en tramos de un tick (core/grid_mover.slices): la IA
+elige (decide) en cada centro de celda al que llega el tramo.
+Un fantasma comido sigue en el grupo como ojos: vuelve a la casa por el campo
+de distancias fijo (pin), revive ahí y espera RESPAWN_WAIT_MS antes de salir.
 """
 
 import pygame
 from settings import *
-from core.grid_mover import GridMover
+from core.grid_mover import GridMover, MOVE_SLICE_MS, slices
+from core.sprites import ghost_sprite
+from logic.navigation import OPEN_MASK, DIRS4, DIR_BITS
 
-# Direcciones cardinales
-DIRS4 = [
-    pygame.Vector2(1, 0),
-    pygame.Vector2(-1, 0),
-    pygame.Vector2(0, 1),
-    pygame.Vector2(0, -1)
-]
+UP = DIR_BITS[(0, -1)]
+
+# Celda a la que vuelven los ojos (mapa clásico; cada mapa puede traer la suya)
+HOUSE_TILE = (13, 13)
+
+# Salidas libres por máscara de la NavTable (índices de DIRS4)
+VALIDS_BY_MASK = [tuple(i for i in range(4) if m >> i & 1) for m in range(16)]
+# Las mismas sin la reversa `back` cuando hay más de una: CHOICES[m][back]
+CHOICES = [[tuple(i for i in v if i != back) if len(v) > 1 and back in v else v for back in range(4)]
+           for v in VALIDS_BY_MASK]
+
+# Espera dentro de la casa tras revivir (ms de juego)
+RESPAWN_WAIT_MS = 1000
+
+# Cuerpo asustado y su parpadeo al final del modo poder
+FRIGHTENED_BODY = (40, 100, 255)
+FRIGHTENED_FLASH = (255, 255, 255)
 
 # Estados unificados
 STATE_NORMAL = 0
@@ -25,23 +43,21 @@ STATE_ROAMING = 5
 
 
 class Ghost(GridMover):
-    def __init__(self, grid, start_tile, color, behavior="random", target=None, speed=3.0, rng=None):
-        super().__init__(grid, start_tile, color=color, speed=speed)
+    def __init__(self, grid, start_tile, color, behavior="random", target=None, speed=3.0, rng=None, clock=None,
+                 nav=None, house=HOUSE_TILE):
+        super().__init__(grid, start_tile, color=color, speed=speed, clock=clock, nav=nav)
+        self.house = house
         self.behavior = behavior
         self.target = target
         self.state = STATE_ROAMING
-        self.current_dir = pygame.Vector2(0, -1)
+        self.d = UP
         self.base_color = color
         self._original_color = color
         self.leave_house = True
         self.rng = rng
         self.last_tile = self.tile
         self.leave_timer = 0
-
-        # --- Imagen inicial ---
-        self.image = pygame.Surface((TILE_SIZE - 2, TILE_SIZE - 2), pygame.SRCALPHA)
-        self.rect = self.image.get_rect(center=self.pos)
-        self._draw()  # pinta cuerpo y ojos iniciales
+        self._look = None           # aspecto de self.image (se elige en render)
 
     # ---------- ESTADOS ----------
     def set_frightened(self, now_ms):
@@ -50,9 +66,8 @@ class Ghost(GridMover):
             self.frightened_until = now_ms + FRENZY_TIME_MS
 
     def was_eaten(self):
+        """Queda como ojos (sigue en el grupo y en el índice) y vuelve a la casa."""
         self.state = STATE_EATEN
-        self.visible = False  # nuevo flag de visibilidad
-        self.kill()  # lo elimina del grupo de sprites temporalmente
 
     def _speed_factor(self):
         if self.state == STATE_FRIGHTENED:
@@ -63,132 +78,100 @@ class Ghost(GridMover):
 
     # ---------- ACTUALIZACIÓN ----------
     def update(self, dt):
-        now = pygame.time.get_ticks()
+        self._start = (self.c, self.r, self.d, self.off)
+        if dt <= MOVE_SLICE_MS:
+            self._update_slice(dt)      # caso de cada tick: un solo tramo
+            return
+        for part in slices(dt):
+            self._update_slice(part)
 
-        # 🔸 Si está "muerto" (solo ojos)
-        if self.state == STATE_EATEN:
-            # esperar si acaba de revivir
-            if hasattr(self, "respawn_timer") and now < self.respawn_timer:
-                return  # quieto dentro de casa
-            elif hasattr(self, "respawn_timer"):
-                del self.respawn_timer  # listo para moverse otra vez
-
-            # moverse hacia la casa
-            self._return_to_house_step(dt)
+    def _update_slice(self, dt):
+        state = self.state
+
+        # 🔸 Si está "muerto" (solo ojos): moverse hacia la casa
+        if state == STATE_EATEN:
+            self.move_step(dt * EATEN_SPEED_FACTOR)
             return
 
         # 🔸 Fin del modo asustado
-        if self.state == STATE_FRIGHTENED and now > self.frightened_until:
+        if state == STATE_FRIGHTENED and self.clock.get_ticks() > self.frightened_until:
             self.state = STATE_NORMAL
 
-        # 🔸 Movimiento normal o asustado
-        self._normal_ai_step(dt)
-
-        # 🔸 Redibujo (azul / parpadeo al final del modo poder)
-        self._draw(now)
+        # 🔸 Recién revivido: quieto dentro de casa hasta respawn_timer
+        if hasattr(self, "respawn_timer"):
+            if self.clock.get_ticks() < self.respawn_timer:
+                return
+            del self.respawn_timer
 
-    # ---------- IA / MOVIMIENTO ----------
-    def _normal_ai_step(self, dt):
-        """Decide dirección solo al llegar al centro de una celda."""
-        # 1. Verificar si está centrado
-        center = self._tile_center(self.tile)
-        at_center = self.pos.distance_to(center) < 2
-
-        if at_center:
-            valids = [d for d in DIRS4 if self._can_move_from_tile(self.tile, d)]
-            if not valids:
-                self.next_dir = -self.current_dir
-            else:
-                if len(valids) > 1 and -self.current_dir in valids:
-                    valids.remove(-self.current_dir)
-
-                if self.behavior == "chaser" and self.target:
-                    # elige la dirección que acerque más al jugador
-                    self.next_dir = min(
-                        valids,
-                        key=lambda d: abs((self.tile + d).x - self.target.tile.x)
-                                    + abs((self.tile + d).y - self.target.tile.y)
-                    )
-                else:
-                    # usa el generador pseudoaleatorio
-                    r = self.rng.random() if self.rng else __import__("random").random()
-                    idx = int(r * len(valids)) % len(valids)
-                    self.next_dir = valids[idx]
-
-            # actualizar dirección actual
-            self.current_dir = self.next_dir
-
-        # 2. Mover según la dirección actual
+        # 🔸 Movimiento normal o asustado
         self.move_step(dt)
 
-    def _leave_house_step(self, dt):
-        """Sale de la casa subiendo por la puerta."""
-        if self._can_move_from_tile(self.tile, pygame.Vector2(0, -1)):
-            self.current_dir = pygame.Vector2(0, -1)
-            self.move_step(dt)
-            if self.tile.y <= 12:
-                self.state = STATE_ROAMING
-        else:
-            self.state = STATE_ROAMING
-
-    def _return_to_house_step(self, dt):
-        """Mover solo los ojos hacia el centro (13,13)."""
-        target = pygame.Vector2(13, 13)
-        speed_factor = EATEN_SPEED_FACTOR
+    def render(self, now=None):
+        """Elige el sprite (azul / parpadeo al final del modo poder); lo llama el renderer."""
+        look = self.look(now)
+        if look != self._look:
+            self._look = look
+            self.image = ghost_sprite(*look)
 
-        # calcular dirección cardinal más corta
-        dirs = [pygame.Vector2(1,0), pygame.Vector2(-1,0), pygame.Vector2(0,1), pygame.Vector2(0,-1)]
-        valids = [d for d in dirs if self._can_move_from_tile(self.tile, d)]
+    # ---------- IA / MOVIMIENTO ----------
+    def decide(self, mask):
+        """Decisión al llegar al centro de una celda (la llama GridMover.move_step)."""
+        if self.state == STATE_EATEN:
+            return self._return_to_house(mask)
+        valids = CHOICES[mask & OPEN_MASK][self.d ^ 1]
         if not valids:
-            return
-
-        # elegir la que acerque más al centro
-        self.next_dir = min(valids, key=lambda d: (self.tile + d).distance_to(target))
-        self.current_dir = self.next_dir
-        self.move_step(dt * speed_factor)
-
-        # si ya llegó
-        if self.tile.distance_to(target) < 0.5:
+            self.nd = self.d ^ 1
+        elif self.behavior == "chaser" and self.target:
+            # elige la vecina más cercana al jugador por camino real (campo BFS compartido)
+            self.nd = self._toward(valids, self.target.c, self.target.r)
+        else:
+            # usa el generador pseudoaleatorio
+            r = self.rng.random() if self.rng else __import__("random").random()
+            self.nd = valids[int(r * len(valids)) % len(valids)]
+
+        # actualizar dirección actual
+        self.d = self.nd
+        return True
+
+    def _toward(self, valids, tc, tr):
+        """De las direcciones válidas, la que más acerca a (tc, tr) según el campo de distancias."""
+        fields = self.nav.distances
+        c, r = self.c, self.r
+        field = fields.around(tc, tr, c, r)
+        return min(valids, key=lambda i: fields.rank(field, c + DIRS4[i][0], r + DIRS4[i][1], tc, tr))
+
+    def _return_to_house(self, mask):
+        """
+        Ojos: en cada centro eligen la salida más corta hacia la casa por el
+        campo de distancias fijo (si lo comieron a medio camino siguen hasta la
+        celda siguiente) y reviven al llegar al centro de la casa.
+        """
+        hc, hr = self.house
+        if (self.c, self.r) == (hc, hr):
             self.state = STATE_NORMAL
             self.base_color = self._original_color
             self.leave_house = True
-            self.respawn_timer = pygame.time.get_ticks() + 1000
+            self.respawn_timer = self.clock.get_ticks() + RESPAWN_WAIT_MS
+            return False
+        # salidas libres de la celda actual (los ojos también pueden dar la vuelta)
+        valids = VALIDS_BY_MASK[mask & OPEN_MASK]
+        if valids:
+            # campo fijo hacia la casa (nunca sale del LRU)
+            self.nav.distances.pin(hc, hr)
+            self.d = self._toward(valids, hc, hr)
+        self.nd = self.d
+        return True
 
     # ---------- DIBUJO ----------
-    def _draw(self, now=None):
-        self.image.fill((0, 0, 0, 0))
-        w, h = self.image.get_size()
-
-        # --- estado visual ---
+    def look(self, now=None):
+        """Aspecto actual: (color del cuerpo o None si solo se ven los ojos, dx, dy de la mirada)."""
+        dx, dy = DIRS4[self.d]
         if self.state == STATE_EATEN:
-            # solo ojos
-            le = (w // 2 - 5, h // 2 - 3)
-            re = (w // 2 + 5, h // 2 - 3)
-            pygame.draw.circle(self.image, (255,255,255), le, 4)
-            pygame.draw.circle(self.image, (255,255,255), re, 4)
-            off = self.current_dir * 2
-            pygame.draw.circle(self.image, (30,30,200), (int(le[0]+off.x), int(le[1]+off.y)), 2)
-            pygame.draw.circle(self.image, (30,30,200), (int(re[0]+off.x), int(re[1]+off.y)), 2)
-            return
-
-        # --- cuerpo normal / asustado ---
+            return None, dx, dy
         if self.state == STATE_FRIGHTENED:
-            body = (40, 100, 255)
+            body = FRIGHTENED_BODY
             # parpadeo al final
-            if now and now > self.frightened_until - 1500:
-                if (now // 200) % 2 == 0:
-                    body = (255, 255, 255)
-        else:
-            body = self.base_color
-
-        pygame.draw.rect(self.image, body, (2, h // 3, w - 4, h // 2))
-        pygame.draw.circle(self.image, body, (w // 2, h // 3), w // 2 - 2)
-
-        # ojos
-        le = (w // 2 - 5, h // 3 - 3)
-        re = (w // 2 + 5, h // 3 - 3)
-        pygame.draw.circle(self.image, (255, 255, 255), le, 4)
-        pygame.draw.circle(self.image, (255, 255, 255), re, 4)
-        off = self.current_dir * 2
-        pygame.draw.circle(self.image, (30, 30, 200), (int(le[0]+off.x), int(le[1]+off.y)), 2)
-        pygame.draw.circle(self.image, (30, 30, 200), (int(re[0]+off.x), int(re[1]+off.y)), 2)
+            if now and now > self.frightened_until - 1500 and (now // 200) % 2 == 0:
+                body = FRIGHTENED_FLASH
+            return body, dx, dy
+        return self.base_color, dx, dy
@@ -1,127 +1,220 @@
 """
-core/grid_mover.py — RandomPac v2.3
+core/grid_mover.py — RandomPac v2.7
 Movimiento fiel a Pac-Man:
 - Solo gira si la celda vecina (tile + dir) es libre
 - Detiene justo antes del muro (sin vibrar)
 - Reversa inmediata solo si hay espacio detrás
+Las salidas libres de cada celda salen de la NavTable del mapa (una lectura).
+La posición es entera: celda (c, r) del último centro alcanzado, dirección
+d (índice de DIRS4) y avance `off` desde ese centro en centésimas de píxel
+(SUBPX), así 3.2 px por tick son 320 unidades exactas. El tramo que llega a
+un centro decide ahí (gira o se detiene ante un muro) y lo que sobraba sigue
+en la dirección nueva: la velocidad efectiva es la nominal. core/event_sim y
+core/batch_sim hacen la misma cuenta entera, así los tres motores coinciden
+tick a tick.
+Un dt largo (tirón, equipo lento, turbo) se avanza en tramos de un tick
+(slices), así se decide en cada centro que se cruce: update(64) deja a la
+entidad igual que cuatro update(16) (python -m core.turbo_check).
+Si la entidad está en un índice espacial (core/tile_index) se le avisa cada
+vez que cambia de celda.
 """
 
-import pygame, random
+import pygame
 from settings import TILE_SIZE, HUD_HEIGHT
+from logic.navigation import NavTable, DIRS4, DIR_BITS
+
+# Tramo máximo de movimiento (= TICK_MS de core/simulation). Un tramo cruza a
+# lo sumo un centro: ninguna velocidad del juego recorre una celda en un tick.
+MOVE_SLICE_MS = 16
+
+# Unidades de posición: centésimas de píxel
+SUBPX = 100
+TILE_UNITS = TILE_SIZE * SUBPX
+HALF_UNITS = TILE_UNITS // 2
+
+
+def slices(dt, size=MOVE_SLICE_MS):
+    """Parte dt en tramos de a lo sumo size ms (el último lleva el resto)."""
+    while dt > size:
+        yield size
+        dt -= size
+    yield dt
+
+
+def step_units(speed, dt):
+    """Unidades que avanza en dt ms una entidad de speed px por tick de 16 ms."""
+    return round(speed * dt * SUBPX / 16)
+
+
+def units_xy(c, r, d, off):
+    """Posición en unidades de quien está a off unidades del centro de (c, r) en la dirección d."""
+    dx, dy = DIRS4[d]
+    return (c * TILE_UNITS + HALF_UNITS + dx * off,
+            r * TILE_UNITS + HALF_UNITS + dy * off)
 
 
 class GridMover(pygame.sprite.Sprite):
-    def __init__(self, grid, start_tile, color=(255, 255, 255), speed=3.0):
+    blocks_door = False     # la puerta de la casa (4) solo bloquea al jugador
+
+    def __init__(self, grid, start_tile, color=(255, 255, 255), speed=3.0, clock=None, nav=None):
         super().__init__()
         self.grid = grid
-        self.tile = pygame.Vector2(start_tile)          # posición en CELDAS
-        self.pos = self._tile_center(self.tile)         # posición en PÍXELES
-        self.current_dir = pygame.Vector2(1, 0)
-        self.next_dir = pygame.Vector2(1, 0)
+        self.nav = nav or NavTable(grid)                # compartida por todas las entidades del mapa
+        self._open = self.nav.table(self.blocks_door)
+        self._width = self.nav.width
+        self.clock = clock or pygame.time                 # reloj inyectable (get_ticks)
+        self.c, self.r = int(start_tile[0]), int(start_tile[1])     # celda del último centro
+        self.d = self.nd = DIR_BITS[(1, 0)]             # dirección actual y pedida (DIRS4)
+        self.off = 0                                    # unidades recorridas desde el centro
+        self.moving = False                             # False: quieto en el centro, decide al moverse
         self.speed = speed
+        self._units = (None, None, 0)                   # (speed, dt, unidades) del último tramo
         self.color = color
+        self.index = None                               # TileIndex donde está (o None)
+        self._start = (self.c, self.r, self.d, self.off)    # estado al empezar el último update
 
         self.image = pygame.Surface((TILE_SIZE - 2, TILE_SIZE - 2), pygame.SRCALPHA)
-        self.rect = self.image.get_rect(center=self.pos)
 
-    # ---------- conversiones ----------
-    def _tile_center(self, tile):
-        return pygame.Vector2(
-            tile.x * TILE_SIZE + TILE_SIZE / 2,
-            HUD_HEIGHT + tile.y * TILE_SIZE + TILE_SIZE / 2
-        )
+    # ---------- posición ----------
+    def xy(self):
+        """Posición en unidades desde la esquina del mapa (sin el HUD)."""
+        return units_xy(self.c, self.r, self.d, self.off)
+
+    @property
+    def start_xy(self):
+        """Dónde empezó el último update, en unidades (colisión continua); se calcula solo si se pide."""
+        return units_xy(*self._start)
+
+    @property
+    def tile(self):
+        return self.c, self.r
+
+    @property
+    def pos(self):
+        """Posición en PÍXELES de pantalla (para dibujar)."""
+        x, y = self.xy()
+        return pygame.Vector2(x / SUBPX, HUD_HEIGHT + y / SUBPX)
+
+    @property
+    def rect(self):
+        x, y = self.pos
+        return self.image.get_rect(center=(int(x), int(y)))
 
-    def _pos_to_tile(self, pos):
-        c = int(pos.x // TILE_SIZE)
-        r = int((pos.y - HUD_HEIGHT) // TILE_SIZE)
-        return c, r
+    @property
+    def current_dir(self):
+        return pygame.Vector2(DIRS4[self.d])
+
+    @current_dir.setter
+    def current_dir(self, v):
+        self.d = DIR_BITS[(int(v[0]), int(v[1]))]
+
+    @property
+    def next_dir(self):
+        return pygame.Vector2(DIRS4[self.nd])
+
+    @next_dir.setter
+    def next_dir(self, v):
+        self.nd = DIR_BITS[(int(v[0]), int(v[1]))]
 
     # ---------- mapa / colisiones por CELDA ----------
     def _is_blocked_tile(self, c, r):
-        if r < 0 or c < 0 or r >= len(self.grid) or c >= len(self.grid[0]):
+        g = self.grid
+        if r < 0 or c < 0 or r >= g.height or c >= g.width:
             return True
-        v = self.grid[r][c]
+        v = g.cells[r * g.width + c]
         if v == 1:       # muro
             return True
         # 🔸 Ajuste: la puerta (4) bloquea solo al jugador, no a los fantasmas
-        if v == 4 and self.__class__.__name__ == "Player":
+        if v == 4 and self.blocks_door:
             return True
         return False
 
-    def _can_move_from_tile(self, tile, direction):
-        nxt = tile + direction
-        return not self._is_blocked_tile(int(nxt.x), int(nxt.y))
-
     # ---------- movimiento ----------
+    def _step(self, dt):
+        """step_units(speed, dt) con caché: casi todos los tramos repiten velocidad y dt."""
+        speed, last_dt, units = self._units
+        if speed != self.speed or last_dt != dt:
+            units = step_units(self.speed, dt)
+            self._units = (self.speed, dt, units)
+        return units
+
+    def center_ahead(self, dt=MOVE_SLICE_MS):
+        """Centro (c, r) donde decidirá en el próximo tramo de dt ms, o None si no llega a uno."""
+        if not self.moving:
+            return self.c, self.r
+        if self.off + self._step(dt) < TILE_UNITS:
+            return None
+        dx, dy = DIRS4[self.d]
+        return self.c + dx, self.r + dy
+
     def move_step(self, dt):
-        center = self._tile_center(self.tile)
-        at_center = self.pos.distance_to(center) < 2
-
-        # 1) En el centro: decidir giro SOLO si la CELDA vecina es libre
-        if at_center:
-            if self._can_move_from_tile(self.tile, self.next_dir):
-                self.current_dir = self.next_dir
-            # si el frente está bloqueado, no avances (quédate centrado)
-            if not self._can_move_from_tile(self.tile, self.current_dir):
-                self.pos = center
-                self.rect.center = (int(self.pos.x), int(self.pos.y))
-                return
-
-        # 2) Avanzar hacia el centro de la siguiente celda (sin pasarse)
-        target_tile = self.tile + self.current_dir
-        # si el target está bloqueado y aún no salimos del centro, alíneate y no avances
-        if at_center and not self._can_move_from_tile(self.tile, self.current_dir):
-            self.pos = center
-            self.rect.center = (int(self.pos.x), int(self.pos.y))
+        """Un tramo: avanza y, si llega a un centro, decide ahí y sigue con lo que sobra."""
+        speed, last_dt, step = self._units
+        if speed != self.speed or last_dt != dt:
+            step = self._step(dt)
+        if not self.moving:
+            self._turn(step)
             return
-
-        target_center = self._tile_center(target_tile)
-        step = self.current_dir * (self.speed * dt / 16)
-
-        # mover y clamp al target_center
-        self.pos += step
-        if self.current_dir.x > 0 and self.pos.x >= target_center.x:
-            self.pos.x = target_center.x
-        elif self.current_dir.x < 0 and self.pos.x <= target_center.x:
-            self.pos.x = target_center.x
-        if self.current_dir.y > 0 and self.pos.y >= target_center.y:
-            self.pos.y = target_center.y
-        elif self.current_dir.y < 0 and self.pos.y <= target_center.y:
-            self.pos.y = target_center.y
-
-        # ¿llegamos a la siguiente celda?
-        if self.pos == target_center:
-            self.tile = target_tile  # avanzamos una celda
-
-        self.rect.center = (int(self.pos.x), int(self.pos.y))
+        off = self.off + step
+        if off < TILE_UNITS:
+            self.off = off
+            return
+        dx, dy = DIRS4[self.d]
+        self.c += dx
+        self.r += dy
+        if self.index is not None:
+            self.index.move(self)
+        self._turn(off - TILE_UNITS)
+
+    def _turn(self, rest):
+        """En el centro de (c, r): decide y sale con `rest` unidades, o se queda si el frente está bloqueado."""
+        mask = self._open[self.r * self._width + self.c]
+        if self.decide(mask) and mask >> self.d & 1:
+            self.off, self.moving = rest, True
+        else:
+            self.off, self.moving = 0, False
+
+    def decide(self, mask):
+        """
+        Decisión en el centro con las salidas libres `mask` (bits DIRS4): gira a
+        la dirección pedida si esa salida está libre. False = quedarse quieto.
+        """
+        if mask >> self.nd & 1:
+            self.d = self.nd
+        return True
 
     # ---------- utilidades ----------
     def reverse_direction(self):
-        self.current_dir = -self.current_dir
-        self.next_dir = self.current_dir
+        if self.off:
+            # a medio camino: la celda de referencia pasa a ser la de adelante
+            dx, dy = DIRS4[self.d]
+            self.c += dx
+            self.r += dy
+            self.off = TILE_UNITS - self.off
+            if self.index is not None:
+                self.index.move(self)
+        self.d ^= 1                 # DIRS4 va en pares opuestos
+        self.nd = self.d
 
     def try_reverse(self, desired_dir):
         """Permite reversa solo si hay espacio en la celda posterior."""
-        if desired_dir == -self.current_dir and self._can_move_from_tile(self.tile, desired_dir):
+        back = self.d ^ 1
+        if DIR_BITS.get((int(desired_dir[0]), int(desired_dir[1]))) == back \
+                and self._open[self.r * self._width + self.c] >> back & 1:
             self.reverse_direction()
 
-    def _find_alternative_dir(self):
-        """Para IA: busca una dirección válida distinta a la contraria si hay opciones."""
-        dirs = [pygame.Vector2(1,0), pygame.Vector2(-1,0), pygame.Vector2(0,1), pygame.Vector2(0,-1)]
-        valids = [d for d in dirs if self._can_move_from_tile(self.tile, d)]
-        if valids:
-            if -self.current_dir in valids and len(valids) > 1:
-                valids.remove(-self.current_dir)
-            return random.choice(valids)
-        return -self.current_dir
-    
     def update(self, dt):
-        """Actualiza el movimiento continuo, dependiente del tiempo."""
-        self.move_step(dt)
+        """Actualiza el movimiento continuo, dependiente del tiempo (en tramos de un tick)."""
+        self._start = (self.c, self.r, self.d, self.off)
+        if dt <= MOVE_SLICE_MS:
+            self.move_step(dt)          # caso de cada tick: un solo tramo
+            return
+        for part in slices(dt):
+            self.move_step(part)
 
     def teleport(self, new_tile):
         """Mueve instantáneamente al centro de la celda indicada."""
-        self.tile = pygame.Vector2(new_tile)
-        self.pos = self._tile_center(self.tile)
-        self.rect.center = (int(self.pos.x), int(self.pos.y))
-
+        self.c, self.r = int(new_tile[0]), int(new_tile[1])
+        self.off, self.moving = 0, False
+        if self.index is not None:
+            self.index.move(self)
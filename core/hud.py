@@ -1,10 +1,28 @@
 """
-core/hud.py — RandomPac (v1.2)
-HUD: Puntaje, vidas, método, semilla y tiempo transcurrido.
+core/hud.py — RandomPac (v1.5)
+HUD: Puntaje, vidas, puntos restantes, método, semilla y tiempo transcurrido.
+La barra se compone en una superficie propia: cada campo guarda el texto ya
+renderizado y solo se vuelve a renderizar cuando cambia su valor. El tiempo
+es el de la partida (ms que le pasa GameLoop con set_time), no time.time().
+draw() copia la barra entera; draw(force=False) copia solo los campos que
+cambiaron y devuelve sus rects (dibujo por rectángulos sucios en core/game_loop).
 """
 
 import pygame, time
 from settings import *
+from core import text as texts
+
+# campo → (posición, color); el orden es el de dibujo
+FIELDS = {
+    "title":  ((20, 20), YELLOW),
+    "score":  ((250, 20), WHITE),
+    "lives":  ((430, 20), WHITE),
+    "time":   ((540, 20), WHITE),
+    "method": ((20, 50), YELLOW),
+    "dots":   ((250, 50), WHITE),
+    "seed":   ((430, 50), GRAY),
+}
+
 
 class HUD:
     def __init__(self, screen, font, method_name, seed):
@@ -14,39 +32,90 @@ class HUD:
         self.seed = seed
         self.score = 0
         self.lives = PLAYER_LIVES
+        self.dots = None
         self.message = ""
         self.message_timer = 0
         self.t0 = time.time()
+        self.elapsed_ms = None      # tiempo de partida (set_time); None = reloj real desde t0
+        self.rect = pygame.Rect(0, 0, WIDTH, HUD_HEIGHT)
+
+        self.bar = pygame.Surface(self.rect.size)
+        if pygame.display.get_surface() is not None:
+            self.bar = self.bar.convert()
+        self.bar.fill(BLUE)
+        self._fields = {}           # campo → (texto, superficie renderizada, rect en la barra)
+        self.changed = []           # campos que cambiaron en el último draw()
 
-    def update(self, score, lives, message=None):
+    def update(self, score, lives, message=None, dots=None):
         self.score = score
         self.lives = lives
+        if dots is not None:
+            self.dots = dots
         if message:
             self.message = message
             self.message_timer = 120
 
+    def set_time(self, ms):
+        """Tiempo de partida en ms (el texto solo cambia una vez por segundo)."""
+        self.elapsed_ms = ms
+
     def _fmt_time(self):
-        t = int(time.time() - self.t0)
+        t = int(time.time() - self.t0) if self.elapsed_ms is None else self.elapsed_ms // 1000
         m, s = divmod(t, 60)
         return f"{m:02d}:{s:02d}"
 
-    def draw(self):
-        # barra superior
-        pygame.draw.rect(self.screen, BLUE, (0, 0, WIDTH, 80))
-        title = self.font.render("RANDOMPAC", True, YELLOW)
-        self.screen.blit(title, (20, 20))
-
-        score_text = self.font.render(f"Puntaje: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (250, 20))
-
-        lives_text = self.font.render(f"Vidas: {self.lives}", True, WHITE)
-        self.screen.blit(lives_text, (430, 20))
+    def _texts(self):
+        return {
+            "title": "RANDOMPAC",
+            "score": f"Puntaje: {self.score}",
+            "lives": f"Vidas: {self.lives}",
+            "time": f"Tiempo: {self._fmt_time()}",
+            "dots": f"Puntos: {self.dots}" if self.dots is not None else "",
+            "method": f"Método: {self.method_name}",
+            "seed": f"Semilla: {self.seed if self.seed else 'Auto'}",
+        }
 
-        time_text = self.font.render(f"Tiempo: {self._fmt_time()}", True, WHITE)
-        self.screen.blit(time_text, (600, 20))
+    def _compose(self):
+        """Renderiza en la barra los campos cuyo texto cambió; devuelve las zonas tocadas."""
+        dirty = []
+        for name, text in self._texts().items():
+            old = self._fields.get(name)
+            if old is not None and old[0] == text:
+                continue
+            pos, color = FIELDS[name]
+            surf = texts.render(self.font, text, color) if text else None
+            rect = surf.get_rect(topleft=pos) if surf else pygame.Rect(pos, (0, 0))
+            area = rect.union(old[2]) if old is not None else rect
+            self._fields[name] = (text, surf, rect)
+            self.changed.append(name)
+            dirty.append(area)
+        if not dirty:
+            return dirty
 
-        method_text = self.font.render(f"Método: {self.method_name}", True, YELLOW)
-        self.screen.blit(method_text, (20, 50))
+        # si una zona tocada pisa un campo sin cambios se recompone la barra entera
+        overlap = any(rect.colliderect(area) for name, (_, _, rect) in self._fields.items()
+                      if name not in self.changed for area in dirty)
+        if overlap:
+            self.bar.fill(BLUE)
+            dirty = [self.bar.get_rect()]
+        for area in dirty:
+            self.bar.fill(BLUE, area)
+        for name in (FIELDS if overlap else self.changed):
+            text, surf, rect = self._fields[name]
+            if surf:
+                self.bar.blit(surf, rect)
+        return dirty
 
-        seed_text = self.font.render(f"Semilla: {self.seed if self.seed else 'Auto'}", True, GRAY)
-        self.screen.blit(seed_text, (430,  Fifty:=50))  # keep alignment
+    def draw(self, force=True):
+        """
+        Copia la barra a la pantalla. force=True: la barra entera; si no, solo
+        las zonas de los campos que cambiaron. Devuelve los rects copiados.
+        """
+        self.changed = []
+        dirty = self._compose()
+        if force:
+            self.screen.blit(self.bar, self.rect)
+            return [self.rect]
+        for area in dirty:
+            self.screen.blit(self.bar, area, area)
+        return dirty
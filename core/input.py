@@ -0,0 +1,68 @@
+"""
+core/input.py — RandomPac v1.0
+Fuentes de entrada para el jugador.
+Cada fuente implementa poll(player) y devuelve una dirección (dx, dy) o None
+si no hay una nueva orden en este tick.
+- KeyboardInput: teclado real (partida interactiva)
+- NullInput: sin entrada (el jugador sigue su dirección actual)
+- GreedyDotInput: bot determinista para simulaciones offline
+"""
+
+import pygame
+
+DIRS4 = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+
+class KeyboardInput:
+    def poll(self, player):
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_UP]:
+            return (0, -1)
+        elif keys[pygame.K_DOWN]:
+            return (0, 1)
+        elif keys[pygame.K_LEFT]:
+            return (-1, 0)
+        elif keys[pygame.K_RIGHT]:
+            return (1, 0)
+        return None
+
+
+class NullInput:
+    def poll(self, player):
+        return None
+
+    def decide(self, grid, c, r, back, is_blocked):
+        return None
+
+
+class GreedyDotInput:
+    """
+    Bot simple: en cada centro de celda al que llega prefiere una vecina con
+    punto; si no hay, elige una salida válida con su propio generador (sin
+    reversa salvo callejón sin salida).
+    """
+    def __init__(self, rng):
+        self.rng = rng
+
+    def poll(self, player):
+        at = player.center_ahead()          # el centro que cruza en este tick, si cruza alguno
+        if at is None:
+            return None
+        c, r = at
+        return self.decide(player.grid, c, r, DIRS4[player.d ^ 1], player._is_blocked_tile)
+
+    def decide(self, grid, c, r, back, is_blocked):
+        """Decisión en el centro de la celda (c, r); la usan ambos motores de simulación."""
+        valids = [d for d in DIRS4 if not is_blocked(c + d[0], r + d[1])]
+        if not valids:
+            return None
+        if len(valids) > 1 and back in valids:
+            valids.remove(back)
+
+        cells, w = grid.cells, grid.width
+        for dx, dy in valids:
+            if cells[(r + dy) * w + c + dx] in (2, 3):
+                return (dx, dy)
+
+        idx = int(self.rng.random() * len(valids)) % len(valids)
+        return valids[idx]
@@ -0,0 +1,199 @@
+"""
+core/maze_layer.py — RandomPac v1.1
+Capa estática del laberinto: muros, puertas y puntos pre-dibujados.
+El mapa se dibuja una vez, por bloques de CHUNK_TILES x CHUNK_TILES celdas
+en superficies con el formato de la pantalla, y cada cuadro solo se copian
+(blit) los bloques visibles. Los muros no cambian y los puntos solo
+desaparecen: logic.map.eat_dot avisa a la capa (grid.listener) y el punto se
+borra pintando el fondo sobre su celda. Los power dots parpadean, así que no
+van en la capa: se dibujan por cuadro, y solo se recorren los de los bloques
+visibles (self.power los agrupa por bloque).
+
+Para el dibujo por rectángulos sucios (core/game_loop) la capa anota las
+celdas comidas desde el último take_eaten() y da los rects de los power dots.
+
+En mapas grandes los bloques se crean al entrar en la vista y se descartan
+(LRU) al pasar el tope de memoria. Quien reescriba la grilla entera
+(seek / rebobinado) llama a invalidate().
+
+python -m core.maze_layer → costo de dibujar el mapa por cuadro, celda a celda vs capa
+"""
+
+from collections import OrderedDict
+import pygame
+from settings import TILE_SIZE, HUD_HEIGHT, WALL_COLOR, DARK_BLUE
+from logic.grid import DOT, POWER_DOT
+
+CHUNK_TILES = 16
+LAYER_BUDGET_BYTES = 64 * 1024 * 1024
+# más celdas comidas que esto entre dos cuadros → conviene redibujar todo
+MAX_EATEN = 64
+
+DOOR_COLOR = (150, 150, 255)
+DOT_COLOR = (255, 255, 255)
+POWER_COLOR = (255, 255, 102)
+
+
+def draw_tiles(surface, grid, c0, r0, c1, r1, ox, oy, power=True, blink=True):
+    """Dibuja celda a celda el rango [c0, c1) x [r0, r1); (ox, oy) es el píxel de la celda (0, 0)."""
+    w, cells = grid.width, grid.cells
+    half = TILE_SIZE // 2
+    for r in range(r0, r1):
+        base = r * w
+        y = oy + r * TILE_SIZE
+        for c in range(c0, c1):
+            val = cells[base + c]
+            if not val:
+                continue
+            x = ox + c * TILE_SIZE
+            if val == 1:
+                pygame.draw.rect(surface, WALL_COLOR, (x, y, TILE_SIZE, TILE_SIZE))
+            elif val == 4:
+                pygame.draw.rect(surface, DOOR_COLOR, (x+8, y+half-2, TILE_SIZE-16, 4))
+            elif val == DOT:
+                pygame.draw.circle(surface, DOT_COLOR, (x+half, y+half), 3)
+            elif val == POWER_DOT and power and blink:
+                pygame.draw.circle(surface, POWER_COLOR, (x+half, y+half), 6)
+
+
+class MazeLayer:
+    def __init__(self, grid, chunk_tiles=CHUNK_TILES, budget_bytes=LAYER_BUDGET_BYTES):
+        self.grid = grid
+        self.chunk_tiles = chunk_tiles
+        side = chunk_tiles * TILE_SIZE
+        self.capacity = max(4, budget_bytes // (side * side * 4))
+        self._chunks = OrderedDict()          # (cx, cy) → Surface
+        self.rendered = 0                     # bloques dibujados desde cero (diagnóstico)
+        self.eaten = []                       # celdas comidas sin informar (None = demasiadas)
+        self.invalidate()
+        grid.listener = self._on_eat
+
+    def invalidate(self):
+        """Descarta los bloques y vuelve a leer los power dots (la grilla cambió entera)."""
+        self._chunks.clear()
+        self.eaten = None
+        cells, w, n = self.grid.cells, self.grid.width, self.chunk_tiles
+        data = bytes(cells) if isinstance(cells, memoryview) else cells     # grilla compartida
+        self.power = {}                       # (cx, cy) → {índice plano de cada power dot}
+        i = data.find(POWER_DOT)
+        while i >= 0:
+            r, c = divmod(i, w)
+            self.power.setdefault((c // n, r // n), set()).add(i)
+            i = data.find(POWER_DOT, i + 1)
+
+    def detach(self):
+        if self.grid.listener == self._on_eat:
+            self.grid.listener = None
+
+    # ---------- bloques ----------
+    def _chunk(self, cx, cy):
+        key = (cx, cy)
+        surf = self._chunks.get(key)
+        if surf is not None:
+            self._chunks.move_to_end(key)
+            return surf
+        n, g = self.chunk_tiles, self.grid
+        surf = pygame.Surface((n * TILE_SIZE, n * TILE_SIZE))
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        surf.fill(DARK_BLUE)
+        c0, r0 = cx * n, cy * n
+        draw_tiles(surf, g, c0, r0, min(c0 + n, g.width), min(r0 + n, g.height),
+                   -c0 * TILE_SIZE, -r0 * TILE_SIZE, power=False)
+        self._chunks[key] = surf
+        self.rendered += 1
+        if len(self._chunks) > self.capacity:
+            self._chunks.popitem(last=False)
+        return surf
+
+    def _on_eat(self, c, r, value):
+        """Un punto comido: se borra de su bloque (si está dibujado)."""
+        if self.eaten is not None:
+            self.eaten.append((c, r))
+            if len(self.eaten) > MAX_EATEN:
+                self.eaten = None
+        n = self.chunk_tiles
+        if value == POWER_DOT:
+            bucket = self.power.get((c // n, r // n))
+            if bucket is not None:
+                bucket.discard(r * self.grid.width + c)
+            return
+        surf = self._chunks.get((c // n, r // n))
+        if surf is not None:
+            surf.fill(DARK_BLUE, ((c % n) * TILE_SIZE, (r % n) * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+
+    def take_eaten(self):
+        """Celdas comidas desde la última llamada; None si fueron demasiadas (redibujar todo)."""
+        eaten, self.eaten = self.eaten, []
+        return eaten
+
+    # ---------- dibujo ----------
+    def tile_rect(self, camera, c, r):
+        """Rect en pantalla de la celda (c, r)."""
+        return pygame.Rect(c * TILE_SIZE - camera.x, HUD_HEIGHT + r * TILE_SIZE - camera.y,
+                           TILE_SIZE, TILE_SIZE)
+
+    def _visible_power(self, c0, r0, c1, r1):
+        """Celdas (c, r) de los power dots en [c0, c1) x [r0, r1); solo mira los bloques del rango."""
+        n, w, power = self.chunk_tiles, self.grid.width, self.power
+        for cy in range(r0 // n, (r1 - 1) // n + 1):
+            for cx in range(c0 // n, (c1 - 1) // n + 1):
+                for i in power.get((cx, cy), ()):
+                    r, c = divmod(i, w)
+                    if c0 <= c < c1 and r0 <= r < r1:
+                        yield c, r
+
+    def power_rects(self, camera):
+        """Rects en pantalla de los power dots visibles (cambian al parpadear)."""
+        return [self.tile_rect(camera, c, r) for c, r in self._visible_power(*camera.visible_tiles())]
+
+    def draw(self, screen, camera, now, area=None):
+        """Dibuja la vista; con area (rect en pantalla) solo repinta esa zona."""
+        if area is not None:
+            screen.set_clip(area)
+            self.draw(screen, camera, now)
+            screen.set_clip(None)
+            return
+        n = self.chunk_tiles
+        c0, r0, c1, r1 = camera.visible_tiles()
+        ox, oy = -camera.x, HUD_HEIGHT - camera.y
+        side = n * TILE_SIZE
+        for cy in range(r0 // n, (r1 - 1) // n + 1):
+            for cx in range(c0 // n, (c1 - 1) // n + 1):
+                screen.blit(self._chunk(cx, cy), (ox + cx * side, oy + cy * side))
+
+        if (now // 250) % 2 == 0:
+            half = TILE_SIZE // 2
+            for c, r in self._visible_power(c0, r0, c1, r1):
+                pygame.draw.circle(screen, POWER_COLOR,
+                                   (ox + c * TILE_SIZE + half, oy + r * TILE_SIZE + half), 6)
+
+
+if __name__ == "__main__":
+    import os, time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from settings import WIDTH, HEIGHT
+    from core.camera import Camera
+    from logic.map import load_map
+    from logic.map_generator import generate
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    frames = 500
+    for name, grid in (("clásico 28x31", load_map(None)), ("generado 512x511", generate(1, width=512, height=511))):
+        cam = Camera(WIDTH, HEIGHT - HUD_HEIGHT, grid.width, grid.height)
+        c0, r0, c1, r1 = cam.visible_tiles()
+
+        t0 = time.perf_counter()
+        for f in range(frames):
+            draw_tiles(screen, grid, c0, r0, c1, r1, -cam.x, HUD_HEIGHT - cam.y, blink=(f // 15) % 2 == 0)
+        per_tile = (time.perf_counter() - t0) / frames * 1000
+
+        layer = MazeLayer(grid)
+        layer.draw(screen, cam, 0)
+        t0 = time.perf_counter()
+        for f in range(frames):
+            layer.draw(screen, cam, f * 16)
+        cached = (time.perf_counter() - t0) / frames * 1000
+        print(f"{name}: celda a celda {per_tile:.2f} ms/cuadro, capa {cached:.3f} ms/cuadro "
+              f"(x{per_tile / cached:.0f}), {layer.rendered} bloques dibujados")
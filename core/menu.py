@@ -1,18 +1,21 @@
 """
-core/menu.py — RandomPac (v1.0)
+core/menu.py — RandomPac (v1.1)
 ===============================
 Menú retro animado para selección de método pseudoaleatorio y semilla.
+Fuentes y textos salen de las cachés compartidas de core/text.
 """
 
 import pygame, sys
 from settings import *
 from logic.random_generators import LCG, MiddleSquare, PAM
+from core import text
 
 class Menu:
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.Font(FONT_MAIN, 64)
-        self.font_option = pygame.font.Font(FONT_MAIN, 32)
+        self.font_title = text.font(None, 64)
+        self.font_option = text.font(None, 32)
+        self.font_small = text.font(None, 24)
         self.clock = pygame.time.Clock()
 
         # Métodos disponibles
@@ -28,8 +31,8 @@ class Menu:
         self.glow = 0
         self.fade_dir = 1
 
-    def draw_text_center(self, text, font, color, y):
-        surf = font.render(text, True, color)
+    def draw_text_center(self, label, font, color, y):
+        surf = text.render(font, label, color)
         rect = surf.get_rect(center=(WIDTH//2, y))
         self.screen.blit(surf, rect)
 
@@ -57,13 +60,13 @@ class Menu:
                 color = YELLOW if i == self.selected else WHITE
                 self.draw_text_center(f"{i+1}. {name}", self.font_option, color, start_y + i * 60)
                 if i == self.selected:
-                    self.draw_text_center(desc, pygame.font.Font(FONT_MAIN, 24), GRAY, start_y + 100)
+                    self.draw_text_center(desc, self.font_small, GRAY, start_y + 100)
 
             # Entrada de semilla
             if self.entering_seed:
                 self.draw_text_center(f"Ingresa semilla numérica: {self.seed_input}", self.font_option, WHITE, 700)
             else:
-                self.draw_text_center("Presiona S para establecer una semilla personalizada", pygame.font.Font(FONT_MAIN, 24), GRAY, 700)
+                self.draw_text_center("Presiona S para establecer una semilla personalizada", self.font_small, GRAY, 700)
 
             # Eventos
             for e in pygame.event.get():
@@ -0,0 +1,286 @@
+"""
+core/replay.py — RandomPac v1.0
+Repeticiones deterministas.
+Una repetición guarda lo mínimo para reproducir una partida tick a tick:
+semilla, nombre del RNG, dificultad, mapa (con su hash) y la entrada del
+jugador por tick de simulación, comprimida por tramos (RLE). Si la partida
+no usó un mapa con nombre (GameLoop(level=...), p. ej. uno generado), las
+celdas y los spawns del mapa van dentro del archivo. Cada
+KEYFRAME_TICKS se guarda además un estado completo de la simulación, así
+saltar al minuto 10 restaura el keyframe más cercano y simula solo el resto.
+
+Formato .rpac (little endian):
+    b"RPAC" | versión u8 | cabecera JSON (u32 largo + utf-8)
+    | mapa: u32 largo + zlib(celdas) (largo 0 si el mapa tiene nombre)
+    | tramos: u32 n + n × (valor u8, cantidad u32)
+    | keyframes: u32 n + n × (tick u32, u32 largo + zlib(snapshot de core/snapshot))
+
+Uso:
+    python -m core.replay storage/replays/partida.rpac --speed 8 --seek 600
+    python -m core.replay storage/replays/partida.rpac --verify
+"""
+
+import os, json, struct, zlib, hashlib, time
+from bisect import bisect_right
+from core.input import DIRS4
+from core.simulation import Simulation, TICK_MS
+from core import snapshot
+from logic.grid import Grid
+from logic.map_compiler import Spawns
+
+MAGIC = b"RPAC"
+VERSION = 1
+REPLAYS_DIR = os.path.join("storage", "replays")
+
+# un keyframe cada 10 s de juego
+KEYFRAME_TICKS = 625
+
+# valor de entrada por tick: 0 = sin orden, 1..4 = DIRS4[v - 1]
+_CODES = {d: i + 1 for i, d in enumerate(DIRS4)}
+_RUN = struct.Struct("<BI")
+_U32 = struct.Struct("<I")
+
+
+def map_hash(level):
+    """Hash estable del mapa (dimensiones + celdas)."""
+    h = hashlib.sha1(_U32.pack(level.height) + _U32.pack(level.width))
+    h.update(level.cells)
+    return h.hexdigest()
+
+
+class Replay:
+    def __init__(self, seed, rng, difficulty="Clásico", map_name="Clásico", map_sha1="", tick_ms=TICK_MS):
+        self.seed = seed
+        self.rng = rng
+        self.difficulty = difficulty
+        self.map_name = map_name
+        self.map_sha1 = map_sha1
+        self.tick_ms = tick_ms
+        self.level = None       # (ancho, alto, celdas) del mapa incrustado, o None si tiene nombre
+        self.spawns = None      # Spawns del mapa incrustado
+        self.runs = []          # [[valor, cantidad], ...]
+        self.starts = []        # primer tick (1-based) de cada tramo
+        self.ticks = 0          # ticks grabados
+        self.keyframes = {}     # tick → estado comprimido
+        self.final = {}         # puntaje / resultado al terminar la grabación
+        self._cursor = 0
+
+    @classmethod
+    def for_simulation(cls, sim, seed, rng_name, embed=False):
+        """Repetición vacía para sim; embed=True guarda su mapa (no sale de config["map"])."""
+        cfg = sim.config
+        rep = cls(seed, rng_name, cfg.get("difficulty", "Clásico"),
+                  None if embed else cfg.get("map") or "Clásico", map_hash(sim.level))
+        if embed:
+            rep.level = (sim.level.width, sim.level.height, bytes(sim.level.cells))
+            rep.spawns = sim.spawns
+        return rep
+
+    def config(self):
+        return {"seed": self.seed, "rng": self.rng, "difficulty": self.difficulty, "map": self.map_name}
+
+    # ---------- GRABACIÓN ----------
+    def append(self, direction):
+        """Agrega la entrada del siguiente tick (dirección o None)."""
+        v = _CODES[direction] if direction is not None else 0
+        self.ticks += 1
+        if self.runs and self.runs[-1][0] == v:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([v, 1])
+            self.starts.append(self.ticks)
+
+    def add_keyframe(self, sim):
+        self.keyframes[sim.ticks] = zlib.compress(snapshot.take(sim))
+
+    def truncate(self, tick):
+        """Descarta lo grabado después de `tick` (al rebobinar durante la partida)."""
+        while self.runs and self.starts[-1] > tick:
+            self.runs.pop()
+            self.starts.pop()
+        if self.runs:
+            self.runs[-1][1] = min(self.runs[-1][1], tick - self.starts[-1] + 1)
+        self.ticks = min(self.ticks, tick)
+        self._cursor = 0
+        for k in [k for k in self.keyframes if k > tick]:
+            del self.keyframes[k]
+
+    def finish(self, sim):
+        self.final = {"ticks": sim.ticks, "score": sim.player.score, "lives": sim.player.lives,
+                      "result": sim.result}
+
+    # ---------- REPRODUCCIÓN ----------
+    def input_at(self, tick):
+        """Entrada grabada para el tick (1-based); None más allá del final."""
+        if tick < 1 or tick > self.ticks:
+            return None
+        i = self._cursor
+        # caso común: el mismo tramo o el siguiente
+        if not (self.starts[i] <= tick < self.starts[i] + self.runs[i][1]):
+            i = bisect_right(self.starts, tick) - 1
+            self._cursor = i
+        v = self.runs[i][0]
+        return DIRS4[v - 1] if v else None
+
+    def new_simulation(self, generator_class, input_source=None, clock=None, level=None):
+        spawns = None
+        if level is None and self.level is not None:
+            w, h, cells = self.level
+            level, spawns = Grid(w, h, bytearray(cells)), self.spawns
+        sim = Simulation(generator_class(self.seed), config=self.config(), level=level, clock=clock,
+                         input_source=input_source or ReplayInput(self), spawns=spawns)
+        if self.map_sha1 and map_hash(sim.level) != self.map_sha1:
+            what = "incrustado" if self.level is not None else f"'{self.map_name}'"
+            raise ValueError(f"El mapa {what} no coincide con el que se grabó en la repetición")
+        return sim
+
+    def seek(self, sim, tick):
+        """Lleva sim al tick indicado desde el keyframe más cercano anterior."""
+        tick = max(0, min(tick, self.ticks))
+        base = max((k for k in self.keyframes if k <= tick), default=None)
+        if base is not None and (sim.ticks > tick or base > sim.ticks):
+            snapshot.restore(sim, zlib.decompress(self.keyframes[base]))
+        elif sim.ticks > tick:
+            raise ValueError("No hay keyframe anterior al tick pedido")
+        while sim.ticks < tick and sim.running:
+            sim.step(self.tick_ms)
+        return sim
+
+    # ---------- ARCHIVO ----------
+    def to_bytes(self):
+        head = {
+            "seed": self.seed, "rng": self.rng, "difficulty": self.difficulty, "map": self.map_name,
+            "map_sha1": self.map_sha1, "tick_ms": self.tick_ms, "ticks": self.ticks, "final": self.final,
+        }
+        cells = b""
+        if self.level is not None:
+            w, h, raw = self.level
+            head["size"] = [w, h]
+            head["spawns"] = self.spawns.to_json()
+            cells = zlib.compress(raw)
+        header = json.dumps(head, ensure_ascii=False).encode("utf-8")
+        out = [MAGIC, bytes([VERSION]), _U32.pack(len(header)), header, _U32.pack(len(cells)), cells,
+               _U32.pack(len(self.runs))]
+        out.extend(_RUN.pack(v, n) for v, n in self.runs)
+        out.append(_U32.pack(len(self.keyframes)))
+        for tick in sorted(self.keyframes):
+            blob = self.keyframes[tick]
+            out += [_U32.pack(tick), _U32.pack(len(blob)), blob]
+        return b"".join(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:4] != MAGIC:
+            raise ValueError("No es un archivo de repetición de RandomPac")
+        if data[4] != VERSION:
+            raise ValueError(f"Versión de repetición no soportada: {data[4]}")
+        off = 5
+        (n,) = _U32.unpack_from(data, off); off += 4
+        h = json.loads(data[off:off + n].decode("utf-8")); off += n
+        rep = cls(h["seed"], h["rng"], h["difficulty"], h["map"], h["map_sha1"], h["tick_ms"])
+        rep.final = h.get("final", {})
+        (n,) = _U32.unpack_from(data, off); off += 4
+        if n:
+            w, hgt = h["size"]
+            rep.level = (w, hgt, zlib.decompress(data[off:off + n])); off += n
+            sp = h["spawns"]
+            rep.spawns = Spawns(sp["player_spawn"], sp["ghost_spawns"], sp["house"])
+        (n,) = _U32.unpack_from(data, off); off += 4
+        for _ in range(n):
+            v, count = _RUN.unpack_from(data, off); off += _RUN.size
+            rep.runs.append([v, count])
+            rep.starts.append(rep.ticks + 1)
+            rep.ticks += count
+        (n,) = _U32.unpack_from(data, off); off += 4
+        for _ in range(n):
+            tick, size = struct.unpack_from("<II", data, off); off += 8
+            rep.keyframes[tick] = bytes(data[off:off + size]); off += size
+        return rep
+
+    def save(self, path=None):
+        if path is None:
+            os.makedirs(REPLAYS_DIR, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(REPLAYS_DIR, f"{stamp}-{self.rng}-{self.seed}.rpac")
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class RecordingInput:
+    """Envuelve otra fuente de entrada y graba lo que devuelve en cada tick."""
+    def __init__(self, inner, replay):
+        self.inner = inner
+        self.replay = replay
+
+    def poll(self, player):
+        d = self.inner.poll(player)
+        self.replay.append(d)
+        return d
+
+
+class ReplayInput:
+    """Devuelve la entrada grabada según el tick actual de la simulación."""
+    def __init__(self, replay):
+        self.replay = replay
+
+    def poll(self, player):
+        return self.replay.input_at(player.game_ref.ticks)
+
+
+# ---------- CLI ----------
+def _verify(replay):
+    from logic.random_generators import RNG_MAP
+    sim = replay.new_simulation(RNG_MAP[replay.rng])
+    t0 = time.perf_counter()
+    while sim.running and sim.ticks < replay.ticks:
+        sim.step(replay.tick_ms)
+    got = {"ticks": sim.ticks, "score": sim.player.score, "lives": sim.player.lives, "result": sim.result}
+    ok = not replay.final or got == replay.final
+    print(f"{'✅' if ok else '❌'} {got} en {time.perf_counter() - t0:.2f}s (grabado: {replay.final})")
+    return ok
+
+
+def main(argv=None):
+    import argparse, sys
+    parser = argparse.ArgumentParser(description="Reproductor de repeticiones de RandomPac")
+    parser.add_argument("path")
+    parser.add_argument("--speed", default="1", choices=("1", "8", "max"))
+    parser.add_argument("--seek", type=float, default=0, help="segundo de juego donde empezar")
+    parser.add_argument("--verify", action="store_true", help="reproduce sin ventana y compara el final")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.path)
+    if args.verify:
+        sys.exit(0 if _verify(replay) else 1)
+
+    import pygame
+    from settings import WIDTH, HEIGHT
+    from logic.random_generators import RNG_MAP
+    from core.game_loop import GameLoop
+    from core.frame_pacer import FramePacer, open_display
+    pygame.init()
+    screen, mode = open_display((WIDTH, HEIGHT))
+    game = GameLoop(screen, RNG_MAP[replay.rng], replay.rng, replay.seed, config=replay.config(),
+                    replay=replay, playback_speed=None if args.speed == "max" else int(args.speed))
+    if args.seek:
+        game.seek(int(args.seek * 1000 / replay.tick_ms))
+    pacer = FramePacer(mode)
+    while game.running and not game.replay_done:
+        dt = pacer.tick()
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                game.sim.running = False
+        game.update(dt)
+        game.draw()
+    print(f"Fin de la repetición: {game.player.score} puntos, tick {game.sim.ticks}/{replay.ticks}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
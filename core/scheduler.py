@@ -0,0 +1,66 @@
+"""
+core/scheduler.py — RandomPac v1.0
+Acciones diferidas y tweens sin bloquear el bucle.
+El tiempo lo avanza el bucle de cuadros (advance(dt) una vez por cuadro), así
+los efectos (popup "+200", pausa al morir, fundidos) son estados con
+duración y nunca se llama a pygame.time.delay: los eventos se siguen
+atendiendo y cada cuadro cuesta lo mismo con o sin efectos.
+- after(ms, fn): llama a fn cuando pasen ms
+- tween(ms, fn, done): llama a fn(progreso 0..1) cada cuadro y a done() al final
+- hold(ms): congela la simulación ese tiempo (el dibujo sigue)
+"""
+
+import heapq
+from itertools import count
+
+
+class Scheduler:
+    def __init__(self):
+        self.now = 0.0
+        self.hold_until = 0.0
+        self._tasks = []            # montículo (vence, orden, fn)
+        self._tweens = []           # [inicio, duración, fn, done]
+        self._seq = count()
+
+    def after(self, ms, fn):
+        heapq.heappush(self._tasks, (self.now + ms, next(self._seq), fn))
+
+    def tween(self, ms, fn, done=None):
+        fn(0.0)
+        self._tweens.append([self.now, max(ms, 1), fn, done])
+
+    def hold(self, ms):
+        self.hold_until = max(self.hold_until, self.now + ms)
+
+    @property
+    def holding(self):
+        """¿La simulación está congelada por un efecto?"""
+        return self.now < self.hold_until
+
+    @property
+    def busy(self):
+        """¿Queda algún efecto pendiente?"""
+        return self.holding or bool(self._tasks) or bool(self._tweens)
+
+    def advance(self, dt):
+        """Avanza dt ms: ejecuta las acciones vencidas y actualiza los tweens."""
+        self.now += dt
+        tasks = self._tasks
+        while tasks and tasks[0][0] <= self.now:
+            heapq.heappop(tasks)[2]()
+        if self._tweens:
+            running = []
+            for tw in self._tweens:
+                start, ms, fn, done = tw
+                p = min(1.0, (self.now - start) / ms)
+                fn(p)
+                if p < 1.0:
+                    running.append(tw)
+                elif done is not None:
+                    done()
+            self._tweens = running
+
+    def clear(self):
+        self._tasks.clear()
+        self._tweens.clear()
+        self.hold_until = self.now
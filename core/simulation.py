@@ -0,0 +1,307 @@
+"""
+core/simulation.py — RandomPac v1.2
+Núcleo de simulación headless.
+Aplica las mismas reglas que la partida interactiva (movimiento por celdas,
+IA de fantasmas, puntos, modo poder, vidas, victoria/derrota) contra un reloj
+virtual y una fuente de entrada inyectables. No abre ventana, fuentes ni
+mezclador: GameLoop es solo un renderer encima de esta clase.
+Las colisiones son continuas (core/collision): se prueba el tramo que cada
+entidad recorrió en el tick y se resuelven en el orden en que ocurrieron.
+Los fantasmas viven además en un índice por celda (core/tile_index): cada
+choque solo revisa los que están cerca del jugador, tengan 4 o 1000.
+"""
+
+import time
+import pygame
+from settings import *
+from core.clock import VirtualClock
+from core.input import NullInput, GreedyDotInput
+from core.player import Player
+from core.ghost import Ghost, STATE_FRIGHTENED, STATE_EATEN, STATE_NORMAL
+from core.collision import contact
+from core.tile_index import TileIndex
+from logic.map import load_compiled, eat_dot
+from logic.map_compiler import DEFAULT_SPAWNS
+from logic.grid import Grid
+from logic.navigation import NavTable
+from logic.random_generators import LCG
+
+# Paso fijo de simulación (ms de juego por tick)
+TICK_MS = 16
+
+# Velocidades (jugador, fantasma) por dificultad
+DIFFICULTY_SPEEDS = {
+    "Clásico": (3.2, 3.0),
+    "Difícil": (3.8, 3.6),
+    "Extremo": (4.4, 4.2),
+}
+
+# Posiciones iniciales del mapa clásico (cada mapa puede traer las suyas, ver map_compiler.Spawns)
+PLAYER_SPAWN = DEFAULT_SPAWNS.player
+GHOST_SPAWNS = [
+    (DEFAULT_SPAWNS.ghosts[0], RED, "chaser"),
+    (DEFAULT_SPAWNS.ghosts[1], PINK, "random"),
+    (DEFAULT_SPAWNS.ghosts[2], CYAN, "random"),
+    (DEFAULT_SPAWNS.ghosts[3], ORANGE, "random"),
+]
+
+
+class Simulation:
+    def __init__(self, generator, config=None, level=None, clock=None, input_source=None, spawns=None):
+        self.config = config or {}
+        if level is None:
+            # mapa compilado: la tabla de navegación (y su caché de distancias) se comparte entre partidas
+            compiled = load_compiled(self.config.get("map"))
+            self.level, self.nav = compiled.new_grid(), compiled.nav
+            spawns = spawns or compiled.spawns
+        else:
+            self.level, self.nav = level, NavTable(level)
+        self.spawns = spawns or DEFAULT_SPAWNS
+        self.generator = generator
+        self.clock = clock or VirtualClock()
+        self.input = input_source or NullInput()
+
+        difficulty = self.config.get("difficulty", "Clásico")
+        self.speed_player, self.speed_ghost = DIFFICULTY_SPEEDS.get(difficulty, DIFFICULTY_SPEEDS["Clásico"])
+
+        self.power_mode_until = 0   # ms de juego hasta cuando dura el modo poder
+        self.chain_eat = 0          # cadena de comer fantasmas
+        self.running = True
+        self.result = None          # "win" / "lose" al terminar
+        self.ticks = 0
+        self.events = []            # eventos del último tick: (nombre, dato)
+        self.contact_ms = None      # ms de juego exactos del último choque
+        self._pending_reset = False
+
+        # === ENTIDADES ===
+        self.player = Player(self.level, self.spawns.player, color=YELLOW, speed=self.speed_player,
+                             clock=self.clock, input_source=self.input, nav=self.nav)
+        self.player.game_ref = self
+        self.ghosts = pygame.sprite.Group(self._spawn_ghosts())
+        self.occupancy = TileIndex()        # fantasmas por celda (colisiones, consultas de cercanía)
+        self.reindex()
+
+    def _spawn_ghosts(self, slots=None):
+        ghosts = []
+        for slot in (range(len(GHOST_SPAWNS)) if slots is None else slots):
+            _, color, behavior = GHOST_SPAWNS[slot]
+            g = Ghost(self.level, self.spawns.ghosts[slot], color, behavior, self.player, self.speed_ghost,
+                      self.generator, clock=self.clock, nav=self.nav, house=self.spawns.house)
+            g.slot = slot
+            ghosts.append(g)
+        return ghosts
+
+    def reindex(self):
+        """Rehace el índice por celda con los fantasmas del grupo (tras reiniciar o restaurar)."""
+        for g in self.ghosts:
+            g.index = self.occupancy
+        self.occupancy.rebuild(self.ghosts)
+
+    def ghosts_near(self, c, r, k):
+        """Fantasmas (también los ojos de vuelta a casa) a k celdas o menos de (c, r) en cada eje."""
+        return self.occupancy.near(c, r, k)
+
+    # ---------- CONSULTAS ----------
+    @property
+    def now(self):
+        return self.clock.get_ticks()
+
+    def power_active(self):
+        return self.clock.get_ticks() < self.power_mode_until
+
+    # ---------- LÓGICA ----------
+    def reset_positions(self):
+        self.player.teleport(self.spawns.player)
+        self.ghosts.empty()
+        self.ghosts.add(self._spawn_ghosts())
+        for g in self.ghosts:
+            g.current_dir = (0, -1)
+            g.state = STATE_NORMAL
+        self.reindex()
+
+    def step(self, dt=TICK_MS):
+        """Avanza un tick de dt ms de juego. Devuelve la lista de eventos del tick."""
+        self.events = []
+        if not self.running:
+            return self.events
+
+        # la vida perdida se resuelve al inicio del tick siguiente,
+        # así el renderer alcanza a mostrar el cuadro del choque
+        if self._pending_reset:
+            self._pending_reset = False
+            self.reset_positions()
+
+        t0 = self.clock.get_ticks()
+        self.clock.advance(dt)
+        self.ticks += 1
+
+        # mover entidades (cada una recuerda dónde empezó: start_xy)
+        self.player.update(dt)
+        for g in self.ghosts.sprites():
+            g.update(dt)
+
+        self._eat_dots()
+        if self._check_collisions(t0, dt):
+            return self.events
+
+        # victoria
+        if not self.level.dots_left:
+            self.result = "win"
+            self.running = False
+            self.events.append(("win", None))
+        return self.events
+
+    def _eat_dots(self):
+        c, r = self.player.c, self.player.r
+        level = self.level
+        pre = level.cells[r * level.width + c]
+        if pre != 2 and pre != 3:  # 2 = dot, 3 = power
+            return
+        if pre == 2:
+            self.player.add_score(DOT_SCORE)
+            self.events.append(("dot", None))
+        else:
+            self.player.add_score(POWER_DOT_SCORE)
+            self.chain_eat = 0
+            now = self.clock.get_ticks()
+            for g in self.ghosts:
+                g.set_frightened(now)
+            # activar modo poder global
+            self.power_mode_until = now + FRENZY_TIME_MS
+            self.events.append(("power", None))
+        eat_dot(self.level, c, r)
+
+    def _check_collisions(self, t0, dt):
+        """
+        Colisiones continuas del tick que empezó en t0: cada fantasma tocado,
+        en orden de contacto. Devuelve True si el jugador perdió una vida.
+        """
+        p = self.player
+        near = self.occupancy.near(p.c, p.r)
+        if not near:
+            return False                      # lo común: ningún fantasma a 2 celdas
+        p0, p1 = p.start_xy, p.xy()
+        hits = []
+        for g in near:
+            if g.state == STATE_EATEN:
+                continue                      # los ojos no chocan
+            s = contact(p0, p1, g.start_xy, g.xy())
+            if s is not None:
+                hits.append((s, g.slot, g))   # el grupo siempre está en orden de slot
+        hits.sort(key=lambda h: h[:2])
+
+        for s, _, g in hits:
+            self.contact_ms = t0 + s * dt
+            if g.state == STATE_FRIGHTENED:
+                self.chain_eat += 1
+                gain = GHOST_SCORE_BASE * (2 ** (self.chain_eat - 1))
+                self.player.add_score(gain)
+                pos = g.pos
+                g.was_eaten()
+                self.events.append(("ghost_eaten", (gain, pos)))
+            else:
+                self.player.lives -= 1
+                self.chain_eat = 0
+                if self.player.lives <= 0:
+                    self.result = "lose"
+                    self.running = False
+                else:
+                    self._pending_reset = True
+                self.events.append(("death", self.contact_ms))
+                return True
+        return False
+
+    # ---------- ESTADO (repeticiones / rebobinado) ----------
+    def get_state(self):
+        """Estado completo de la partida como dict de tipos simples."""
+        p = self.player
+        return {
+            "clock": self.clock.ms,
+            "ticks": self.ticks,
+            "power_mode_until": self.power_mode_until,
+            "chain_eat": self.chain_eat,
+            "running": self.running,
+            "result": self.result,
+            "pending_reset": self._pending_reset,
+            "level": self.level.to_rows(),
+            "rng": self.generator.getstate(),
+            "player": {
+                "tile": p.tile, "off": p.off, "moving": p.moving, "cur": p.d, "next": p.nd,
+                "speed": p.speed, "score": p.score, "lives": p.lives,
+                "extra": p.extra_life_claimed, "mouth": p.mouth_phase, "facing": p.dir_vec,
+                "flash": p.power_flash,
+            },
+            "ghosts": [
+                {
+                    "slot": g.slot, "tile": g.tile, "off": g.off, "moving": g.moving, "cur": g.d,
+                    "next": g.nd, "state": g.state,
+                    "frightened_until": getattr(g, "frightened_until", None),
+                    "respawn_timer": getattr(g, "respawn_timer", None),
+                }
+                for g in self.ghosts
+            ],
+        }
+
+    def set_state(self, state):
+        """Restaura un estado tomado con get_state (misma partida o una rama nueva)."""
+        self.clock.ms = state["clock"]
+        self.ticks = state["ticks"]
+        self.power_mode_until = state["power_mode_until"]
+        self.chain_eat = state["chain_eat"]
+        self.running = state["running"]
+        self.result = state["result"]
+        self._pending_reset = state["pending_reset"]
+        self.level.copy_from(Grid.from_rows(state["level"]))
+        self.generator.setstate(state["rng"])
+
+        ps, p = state["player"], self.player
+        p.teleport(ps["tile"])
+        p.off, p.moving, p.d, p.nd = ps["off"], ps["moving"], ps["cur"], ps["next"]
+        p.speed = ps["speed"]
+        p.score, p.lives, p.extra_life_claimed = ps["score"], ps["lives"], ps["extra"]
+        p.mouth_phase, p.dir_vec, p.power_flash = ps["mouth"], tuple(ps["facing"]), ps["flash"]
+
+        self.ghosts.empty()
+        ghosts = self._spawn_ghosts([gs["slot"] for gs in state["ghosts"]])
+        for g, gs in zip(ghosts, state["ghosts"]):
+            g.teleport(gs["tile"])
+            g.off, g.moving, g.d, g.nd = gs["off"], gs["moving"], gs["cur"], gs["next"]
+            g.state = gs["state"]
+            if gs["frightened_until"] is not None:
+                g.frightened_until = gs["frightened_until"]
+            if gs["respawn_timer"] is not None:
+                g.respawn_timer = gs["respawn_timer"]
+        self.ghosts.add(ghosts)
+        self.reindex()
+
+    def run(self, max_ms=None, dt=TICK_MS):
+        """Simula a paso fijo hasta terminar la partida (o agotar max_ms de juego)."""
+        while self.running and (max_ms is None or self.clock.get_ticks() < max_ms):
+            self.step(dt)
+        return self.result
+
+
+def run_headless(generator_class, seed, config=None, level=None, max_ms=10 * 60 * 1000, spawns=None):
+    """Juega una partida completa con el bot GreedyDotInput y devuelve un resumen."""
+    sim = Simulation(generator_class(seed), config=config, level=level,
+                     input_source=GreedyDotInput(LCG(seed)), spawns=spawns)
+    sim.run(max_ms)
+    return {
+        "seed": seed,
+        "score": sim.player.score,
+        "lives": sim.player.lives,
+        "time_ms": sim.clock.get_ticks(),
+        "result": sim.result or "timeout",
+    }
+
+
+if __name__ == "__main__":
+    # Medición rápida de rendimiento: segundos de juego por segundo real
+    from logic.random_generators import MiddleSquare, PAM
+    for cls in (LCG, MiddleSquare, PAM):
+        t0 = time.perf_counter()
+        game_ms = 0
+        for seed in range(1000, 1010):
+            game_ms += run_headless(cls, seed)["time_ms"]
+        wall = time.perf_counter() - t0
+        print(f"{cls.__name__:>12}: {game_ms / 1000 / wall:8.0f} s de juego / s real")
@@ -0,0 +1,223 @@
+"""
+core/snapshot.py — RandomPac v1.0
+Snapshots binarios del estado completo de una partida.
+Un snapshot es un bytes empaquetado con struct (≈1.3 KB en el mapa clásico):
+cabecera (tick, reloj, modo poder, cadena, banderas, velocidades), estado del
+generador, las celdas de la Grid tal cual, jugador y fantasmas. Restaurar no
+crea objetos nuevos salvo los fantasmas que falten en el grupo (comidos).
+
+- take(sim) → bytes
+- restore(sim, blob, rng=True) → vuelve sim a ese instante
+- RewindBuffer: últimos N ticks (10 s a 60 Hz por defecto) para rebobinar
+- fork / branch: bifurca una posición con otras semillas (análisis "¿y si…?")
+"""
+
+import struct
+from collections import deque
+from core.input import GreedyDotInput, DIRS4
+from core.simulation import Simulation, TICK_MS
+from logic.random_generators import LCG
+from logic.grid import Grid
+
+VERSION = 1
+
+# 10 s de juego a 60 Hz, con un tope de memoria (en mapas grandes entran menos ticks)
+REWIND_TICKS = 600
+REWIND_BYTES = 64 * 1024 * 1024
+
+_RESULTS = (None, "win", "lose")
+_NONE = -(2 ** 63)                       # ausencia de frightened_until / respawn_timer
+
+# versión, tick, reloj, fin modo poder, cadena, banderas, vel. jugador, vel. fantasma
+_HEAD = struct.Struct("<BIdqHBdd")
+# filas, columnas
+_DIMS = struct.Struct("<HH")
+# tile, avance, dir actual, próxima dir, orientación (índices de DIRS4), velocidad, puntaje, vidas, banderas, boca
+_PLAYER = struct.Struct("<hhiBBBdIBBd")
+# slot, estado, tile, avance, dir actual, próxima dir, en marcha, velocidad, asustado hasta, reaparece en
+_GHOST = struct.Struct("<BBhhiBBBdqq")
+_U8 = struct.Struct("<B")
+_I64 = struct.Struct("<q")
+
+
+def take(sim):
+    """Empaqueta el estado completo de sim en bytes."""
+    flags = sim.running | sim._pending_reset << 1 | _RESULTS.index(sim.result) << 2
+    out = [_HEAD.pack(VERSION, sim.ticks, sim.clock.ms, sim.power_mode_until, sim.chain_eat, flags,
+                      sim.speed_player, sim.speed_ghost)]
+
+    # generador: lista de enteros (PAM.history) o un entero (LCG / MiddleSquare)
+    state = sim.generator.getstate()
+    values = state if isinstance(state, list) else [state]
+    out.append(_U8.pack(len(values) << 1 | isinstance(state, list)))
+    out.extend(_I64.pack(v) for v in values)
+
+    level = sim.level
+    out.append(_DIMS.pack(level.height, level.width))
+    out.append(bytes(level.cells))
+
+    p = sim.player
+    out.append(_PLAYER.pack(
+        p.c, p.r, p.off, p.d, p.nd, DIRS4.index(p.dir_vec), p.speed, p.score, p.lives,
+        p.extra_life_claimed | p.power_flash << 1 | p.moving << 2, p.mouth_phase))
+
+    ghosts = sim.ghosts.sprites()
+    out.append(_U8.pack(len(ghosts)))
+    for g in ghosts:
+        out.append(_GHOST.pack(
+            g.slot, g.state, g.c, g.r, g.off, g.d, g.nd, g.moving, g.speed,
+            getattr(g, "frightened_until", _NONE), getattr(g, "respawn_timer", _NONE)))
+    return b"".join(out)
+
+
+def _read_grid(blob, off):
+    rows, cols = _DIMS.unpack_from(blob, off)
+    off += _DIMS.size
+    return rows, cols, off
+
+
+def grid_of(blob):
+    """Grilla guardada en el snapshot (Grid nueva)."""
+    off = _HEAD.size
+    (n,) = _U8.unpack_from(blob, off)
+    rows, cols, off = _read_grid(blob, off + 1 + (n >> 1) * 8)
+    return Grid(cols, rows, bytearray(blob[off:off + rows * cols]))
+
+
+def restore(sim, blob, rng=True):
+    """
+    Devuelve sim al instante del snapshot. Con rng=False se conserva el
+    generador actual de sim (para bifurcar con otra semilla).
+    """
+    (version, sim.ticks, ms, sim.power_mode_until, sim.chain_eat, flags,
+     sim.speed_player, sim.speed_ghost) = _HEAD.unpack_from(blob, 0)
+    if version != VERSION:
+        raise ValueError(f"Versión de snapshot no soportada: {version}")
+    sim.clock.ms = int(ms) if ms.is_integer() else ms
+    sim.running = bool(flags & 1)
+    sim._pending_reset = bool(flags & 2)
+    sim.result = _RESULTS[flags >> 2]
+    off = _HEAD.size
+
+    (n,) = _U8.unpack_from(blob, off)
+    off += 1
+    values = list(struct.unpack_from(f"<{n >> 1}q", blob, off))
+    off += (n >> 1) * 8
+    if rng:
+        sim.generator.setstate(values if n & 1 else values[0])
+
+    rows, cols, off = _read_grid(blob, off)
+    sim.level.cells[:] = blob[off:off + rows * cols]
+    sim.level.recount()
+    off += rows * cols
+
+    (tc, tr, advance, cur, nxt, facing, speed, score, lives, pflags, mouth) = _PLAYER.unpack_from(blob, off)
+    off += _PLAYER.size
+    p = sim.player
+    p.c, p.r, p.off, p.d, p.nd, p.dir_vec = tc, tr, advance, cur, nxt, DIRS4[facing]
+    p.speed, p.score, p.lives, p.mouth_phase = speed, score, lives, mouth
+    p.extra_life_claimed, p.power_flash, p.moving = bool(pflags & 1), bool(pflags & 2), bool(pflags & 4)
+
+    # reutilizar los fantasmas vivos; crear solo los que falten
+    (n,) = _U8.unpack_from(blob, off)
+    off += 1
+    current = {g.slot: g for g in sim.ghosts}
+    records = [_GHOST.unpack_from(blob, off + i * _GHOST.size) for i in range(n)]
+    missing = [rec[0] for rec in records if rec[0] not in current]
+    for g in sim._spawn_ghosts(missing):
+        current[g.slot] = g
+    order = []
+    for slot, state, tc, tr, advance, cur, nxt, moving, speed, fright, respawn in records:
+        g = current[slot]
+        g.state, g.speed = state, speed
+        g.c, g.r, g.off, g.d, g.nd, g.moving = tc, tr, advance, cur, nxt, bool(moving)
+        if fright != _NONE:
+            g.frightened_until = fright
+        elif hasattr(g, "frightened_until"):
+            del g.frightened_until
+        if respawn != _NONE:
+            g.respawn_timer = respawn
+        elif hasattr(g, "respawn_timer"):
+            del g.respawn_timer
+        order.append(g)
+    # el orden del grupo decide el orden de los sorteos del RNG
+    if sim.ghosts.sprites() != order:
+        sim.ghosts.empty()
+        sim.ghosts.add(order)
+    sim.reindex()
+    return sim
+
+
+class RewindBuffer:
+    """Anillo con los snapshots de los últimos `capacity` ticks (sin pasar de budget_bytes)."""
+    def __init__(self, capacity=REWIND_TICKS, budget_bytes=REWIND_BYTES):
+        self.frames = deque(maxlen=capacity)
+        self.budget_bytes = budget_bytes
+
+    def __len__(self):
+        return len(self.frames)
+
+    def push(self, sim):
+        blob = take(sim)
+        if not self.frames and len(blob) * self.frames.maxlen > self.budget_bytes:
+            self.frames = deque(maxlen=max(2, self.budget_bytes // len(blob)))
+        self.frames.append(blob)
+
+    def rewind(self, sim, ticks=1):
+        """Retrocede hasta `ticks` ticks; devuelve cuántos retrocedió de verdad."""
+        done = 0
+        while done < ticks and len(self.frames) > 1:
+            self.frames.pop()
+            done += 1
+        if self.frames:
+            restore(sim, self.frames[-1])
+        return done
+
+    def clear(self):
+        self.frames.clear()
+
+
+def fork(blob, generator, input_source=None, config=None, spawns=None):
+    """Nueva simulación independiente que arranca en el snapshot, con otro generador."""
+    sim = Simulation(generator, config=config, level=grid_of(blob), input_source=input_source, spawns=spawns)
+    return restore(sim, blob, rng=False)
+
+
+def branch(blob, generator_class, seeds, config=None, max_ms=10 * 60 * 1000, spawns=None):
+    """Juega desde el mismo snapshot una rama por semilla (bot GreedyDotInput) y resume cada una."""
+    results = []
+    for seed in seeds:
+        sim = fork(blob, generator_class(seed), GreedyDotInput(LCG(seed)), config, spawns)
+        sim.run(max_ms)
+        results.append({
+            "seed": seed,
+            "score": sim.player.score,
+            "lives": sim.player.lives,
+            "time_ms": sim.clock.get_ticks(),
+            "result": sim.result or "timeout",
+        })
+    return results
+
+
+if __name__ == "__main__":
+    import time
+
+    # snapshot a mitad de partida (tick 300, ~5 s): las ramas siguen desde ahí
+    sim = Simulation(LCG(1234), input_source=GreedyDotInput(LCG(1234)))
+    for _ in range(300):
+        sim.step(TICK_MS)
+    assert sim.running, "la partida terminó antes del snapshot"
+    blob = take(sim)
+    n = 20000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        take(sim)
+    t1 = time.perf_counter()
+    for _ in range(n):
+        restore(sim, blob)
+    t2 = time.perf_counter()
+    print(f"snapshot: {len(blob)} bytes, take {(t1 - t0) / n * 1e6:.1f} µs, restore {(t2 - t1) / n * 1e6:.1f} µs")
+    print(f"rebobinado de {REWIND_TICKS} ticks: {REWIND_TICKS * len(blob) / 1024:.0f} KB")
+    print(f"ramas desde el tick {sim.ticks} (puntaje {sim.player.score}, vidas {sim.player.lives}):")
+    for row in branch(blob, LCG, range(1, 6)):
+        print(row)
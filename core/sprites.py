@@ -0,0 +1,191 @@
+"""
+core/sprites.py — RandomPac v1.0
+Sprites pre-dibujados: cada cuadro el renderer elige una imagen ya hecha en
+vez de rasterizarla.
+- PacmanAtlas: una sola hoja con todos los cuadros de Pac-Man
+  (4 direcciones x aperturas de boca x normal / destello de poder).
+  La boca abre de 0 a MOUTH_MAX_DEG grados en pasos de 1°, así que hay un
+  cuadro por cada apertura posible y el resultado es idéntico al de dibujar.
+- pacman_atlas() devuelve el atlas del tamaño actual de sprite y lo rearma si
+  cambió settings.TILE_SIZE.
+- ghost_sprite(cuerpo, dx, dy): caché compartida por todos los fantasmas de
+  cada aspecto (color del cuerpo o solo ojos x dirección de la mirada). Son
+  pocas combinaciones, así que cientos de fantasmas comparten las mismas
+  superficies; también se vacía si cambió TILE_SIZE.
+"""
+
+import pygame
+import settings
+
+MOUTH_MAX_DEG = 60
+PACMAN_COLOR = (255, 220, 0)
+FLASH_COLOR = (255, 255, 150)
+HALO_COLOR = (255, 255, 200, 60)
+
+# filas del atlas; sin dirección (0, 0) se dibuja mirando arriba
+DIRECTIONS = ((1, 0), (-1, 0), (0, -1), (0, 1))
+_MOUTH_CENTER = {0: 0, 1: 180, 2: -90, 3: 90}
+
+
+def sprite_size():
+    """Tamaño de los sprites de entidades (una celda menos 2 px)."""
+    side = settings.TILE_SIZE - 2
+    return side, side
+
+
+def mouth_opening(phase):
+    """Apertura de la boca en grados para mouth_phase 0..1 (abre y cierra en triángulo)."""
+    return int(abs(0.5 - phase) * 2 * MOUTH_MAX_DEG)
+
+
+def _draw_pacman(image, direction, mouth_deg, flash):
+    w, h = image.get_size()
+    r = min(w, h) // 2 - 1
+    cx, cy = w // 2, h // 2
+    center = _MOUTH_CENTER[direction]
+    start, end = center - mouth_deg, center + mouth_deg
+
+    pygame.draw.circle(image, FLASH_COLOR if flash else PACMAN_COLOR, (cx, cy), r)
+
+    # halo visual durante el poder
+    if flash:
+        halo = pygame.Surface((w, h), pygame.SRCALPHA)
+        pygame.draw.circle(halo, HALO_COLOR, (cx, cy), r + 3)
+        pygame.draw.circle(halo, (0, 0, 0, 0), (cx, cy), r - 2)
+        image.blit(halo, (0, 0), special_flags=pygame.BLEND_ADD)
+
+    # cortar la boca con un polígono transparente
+    theta1 = pygame.math.Vector2(1, 0).rotate(start)
+    theta2 = pygame.math.Vector2(1, 0).rotate(end)
+    p2 = (cx + int(theta1.x * r * 2), cy + int(theta1.y * r * 2))
+    p3 = (cx + int(theta2.x * r * 2), cy + int(theta2.y * r * 2))
+    pygame.draw.polygon(image, (0, 0, 0, 0), ((cx, cy), p2, p3))
+
+
+class PacmanAtlas:
+    """Hoja (aperturas x [dirección, destello]) con un cuadro de Pac-Man por celda."""
+    def __init__(self, size):
+        self.size = size
+        w, h = size
+        phases = MOUTH_MAX_DEG + 1
+        sheet = pygame.Surface((w * phases, h * len(DIRECTIONS) * 2), pygame.SRCALPHA)
+        for flash in (0, 1):
+            for d in range(len(DIRECTIONS)):
+                y = (flash * len(DIRECTIONS) + d) * h
+                for deg in range(phases):
+                    _draw_pacman(sheet.subsurface((deg * w, y, w, h)), d, deg, flash)
+        if pygame.display.get_surface() is not None:
+            sheet = sheet.convert_alpha()
+        self.sheet = sheet
+        # frames[flash][dirección][grados] → subsuperficie de la hoja (sin copia)
+        self.frames = [[[sheet.subsurface((deg * w, (flash * len(DIRECTIONS) + d) * h, w, h))
+                         for deg in range(phases)]
+                        for d in range(len(DIRECTIONS))]
+                       for flash in (0, 1)]
+
+    def frame(self, dir_vec, mouth_phase, flash):
+        dx, dy = dir_vec
+        if dx > 0:
+            d = 0
+        elif dx < 0:
+            d = 1
+        elif dy > 0:
+            d = 3
+        else:
+            d = 2
+        return self.frames[1 if flash else 0][d][mouth_opening(mouth_phase)]
+
+
+_PACMAN = None
+_GHOSTS = {}            # (cuerpo, dx, dy) → Surface
+_GHOSTS_SIZE = None
+
+
+def pacman_atlas():
+    """Atlas de Pac-Man del tamaño de sprite actual (se arma la primera vez o si cambió TILE_SIZE)."""
+    global _PACMAN
+    size = sprite_size()
+    if _PACMAN is None or _PACMAN.size != size:
+        _PACMAN = PacmanAtlas(size)
+    return _PACMAN
+
+
+def _draw_ghost(image, body, dx, dy):
+    w, h = image.get_size()
+    if body is None:
+        # solo ojos (comido, volviendo a la casa)
+        le, re = (w // 2 - 5, h // 2 - 3), (w // 2 + 5, h // 2 - 3)
+    else:
+        pygame.draw.rect(image, body, (2, h // 3, w - 4, h // 2))
+        pygame.draw.circle(image, body, (w // 2, h // 3), w // 2 - 2)
+        le, re = (w // 2 - 5, h // 3 - 3), (w // 2 + 5, h // 3 - 3)
+    pygame.draw.circle(image, (255, 255, 255), le, 4)
+    pygame.draw.circle(image, (255, 255, 255), re, 4)
+    pygame.draw.circle(image, (30, 30, 200), (le[0] + dx * 2, le[1] + dy * 2), 2)
+    pygame.draw.circle(image, (30, 30, 200), (re[0] + dx * 2, re[1] + dy * 2), 2)
+
+
+def ghost_sprite(body, dx, dy):
+    """Sprite de fantasma con ese cuerpo (None = solo ojos) mirando hacia (dx, dy)."""
+    global _GHOSTS_SIZE
+    size = sprite_size()
+    if size != _GHOSTS_SIZE:
+        _GHOSTS.clear()
+        _GHOSTS_SIZE = size
+    key = (body, dx, dy)
+    image = _GHOSTS.get(key)
+    if image is None:
+        image = pygame.Surface(size, pygame.SRCALPHA)
+        _draw_ghost(image, body, dx, dy)
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        _GHOSTS[key] = image
+    return image
+
+
+if __name__ == "__main__":
+    # python -m core.sprites → costo de armar los atlas y de elegir un cuadro
+    import os, time
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+
+    t0 = time.perf_counter()
+    atlas = pacman_atlas()
+    built = (time.perf_counter() - t0) * 1000
+    w, h = atlas.sheet.get_size()
+    print(f"Pac-Man: {w}x{h} px ({w * h * 4 / 1024:.0f} KiB), armado en {built:.1f} ms")
+
+    right = pygame.Vector2(1, 0)
+    t0 = time.perf_counter()
+    for k in range(100000):
+        atlas.frame(right, (k % 100) / 100, k & 1)
+    print(f"  elegir cuadro: {(time.perf_counter() - t0) * 10:.2f} µs")
+
+    # fantasmas: cientos de instancias comparten los mismos sprites
+    from core.ghost import Ghost
+    from core.clock import VirtualClock
+    from logic.map import load_map
+    from logic.random_generators import LCG
+    grid, clock, rng = load_map(None), VirtualClock(), LCG(1)
+    ghosts = [Ghost(grid, (1, 1), color, rng=rng, clock=clock)
+              for color in (settings.RED, settings.PINK, settings.CYAN, settings.ORANGE) * 125]
+    dirs = [pygame.Vector2(d) for d in ((1, 0), (-1, 0), (0, 1), (0, -1))]
+    frames = 200
+    scratch = pygame.Surface(sprite_size(), pygame.SRCALPHA)
+    t0 = time.perf_counter()
+    for f in range(frames):
+        for g in ghosts:                        # lo que hacía cada fantasma antes: repintar siempre
+            scratch.fill((0, 0, 0, 0))
+            _draw_ghost(scratch, g.base_color, 1, 0)
+    before = (time.perf_counter() - t0) / frames * 1000
+    t0 = time.perf_counter()
+    for f in range(frames):
+        for i, g in enumerate(ghosts):
+            if (f + i) % 24 == 0:
+                g.current_dir = dirs[(f + i) % 4]
+            g.render(f * 16)
+    ms = (time.perf_counter() - t0) / frames * 1000
+    import core.sprites                         # la caché que usa core.ghost
+    print(f"{len(ghosts)} fantasmas: repintar {before:.2f} ms por cuadro, caché {ms:.2f} ms "
+          f"({len(core.sprites._GHOSTS)} sprites distintos)")
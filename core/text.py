@@ -0,0 +1,83 @@
+"""
+core/text.py — RandomPac v1.0
+Fuentes y textos compartidos por todas las pantallas (menús, HUD, editor).
+- font(familia, tamaño, bold): registro único por proceso; SysFont busca la
+  fuente en el sistema cada vez, así que cada combinación se crea una sola vez.
+  familia None = FONT_MAIN (settings).
+- render(fuente, texto, color): superficie de texto en una caché LRU; un
+  menú quieto vuelve a copiar las mismas superficies sin rasterizar nada.
+- wrap(fuente, texto, ancho): líneas de un párrafo partido por palabras (LRU).
+"""
+
+from collections import OrderedDict
+import pygame
+from settings import FONT_MAIN
+
+TEXT_CACHE_SIZE = 512
+WRAP_CACHE_SIZE = 64
+
+_FONTS = {}                 # (familia, tamaño, bold) → Font
+_TEXTS = OrderedDict()      # (fuente, texto, color) → Surface
+_WRAPS = OrderedDict()      # (fuente, texto, ancho) → tupla de líneas
+
+
+def font(family=None, size=24, bold=False):
+    """Fuente compartida; se crea la primera vez que se pide."""
+    key = (family, size, bold)
+    f = _FONTS.get(key)
+    if f is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if family is None:
+            f = pygame.font.Font(FONT_MAIN, size)
+            f.set_bold(bold)
+        else:
+            f = pygame.font.SysFont(family, size, bold=bold)
+        _FONTS[key] = f
+    return f
+
+
+def _lru_get(cache, key):
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _lru_put(cache, key, value, size):
+    cache[key] = value
+    if len(cache) > size:
+        cache.popitem(last=False)
+    return value
+
+
+def render(f, text, color):
+    """font.render(text, True, color) con caché; la superficie es compartida (no modificarla)."""
+    key = (f, text, tuple(color))
+    surf = _lru_get(_TEXTS, key)
+    if surf is None:
+        surf = _lru_put(_TEXTS, key, f.render(text, True, color), TEXT_CACHE_SIZE)
+    return surf
+
+
+def wrap(f, text, width):
+    """Parte text en líneas que no pasen de width píxeles (cortando entre palabras)."""
+    key = (f, text, width)
+    lines = _lru_get(_WRAPS, key)
+    if lines is None:
+        out, line = [], ""
+        for w in text.split(" "):
+            if f.size(line + w)[0] > width:
+                out.append(line.strip())
+                line = w + " "
+            else:
+                line += w + " "
+        out.append(line.strip())
+        lines = _lru_put(_WRAPS, key, tuple(out), WRAP_CACHE_SIZE)
+    return lines
+
+
+def clear():
+    """Vacía las cachés de textos (las fuentes se conservan)."""
+    _TEXTS.clear()
+    _WRAPS.clear()
@@ -0,0 +1,77 @@
+"""
+core/turbo_check.py — RandomPac v1.0
+Comprobación del turbo y del movimiento en tramos (no la usa el juego).
+- La misma partida del bot con GameLoop a 1x, 4x y 16x: firma (crc32 de
+  Simulation.get_state) tick a tick; el turbo solo agrega ticks fijos por
+  cuadro, así que las tres deben ser iguales.
+- Un fantasma suelto avanzado con dt de 64 y 256 ms queda donde lo dejan 4 y
+  16 pasos de TICK_MS (core/grid_mover.slices).
+
+    python -m core.turbo_check          (sale con 1 si algo difiere)
+"""
+
+import os, sys, zlib
+import pygame
+from settings import WIDTH, HEIGHT
+from core.simulation import TICK_MS
+
+
+def turbo_trace(screen, turbo, seed, config, max_frames=20000):
+    """Partida del bot a cuadros de TICK_MS con el turbo dado: firma del estado tick a tick."""
+    from core.game_loop import GameLoop
+    from core.input import GreedyDotInput
+    from logic.random_generators import LCG
+    game = GameLoop(screen, LCG, "LCG", seed, config, GreedyDotInput(LCG(seed)), turbo=turbo)
+    trace, step = [], game.sim.step
+    def traced(dt):
+        events = step(dt)
+        trace.append(zlib.crc32(repr(game.sim.get_state()).encode()))
+        return events
+    game.sim.step = traced
+    frames = 0
+    while (game.running or game.busy) and frames < max_frames:
+        game.update(TICK_MS)
+        frames += 1
+    return trace, frames
+
+
+def slice_trace(ms, dt, seed=3):
+    """Fantasma suelto avanzado de a dt ms hasta ms: (celda, posición) al final de cada llamada."""
+    from core.clock import VirtualClock
+    from core.ghost import Ghost
+    from logic.map import load_map
+    from logic.random_generators import LCG
+    g = Ghost(load_map(None), (1, 1), (255, 0, 0), speed=4.2, rng=LCG(seed), clock=VirtualClock())
+    trace = {}
+    for t in range(dt, ms + 1, dt):
+        g.update(dt)
+        trace[t] = (g.tile, g.xy())
+    return trace
+
+
+def main():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    ok = True
+    for diff in ("Clásico", "Extremo"):
+        base, frames = turbo_trace(screen, 1, 7, {"difficulty": diff})
+        for turbo in (4, 16):
+            trace, n = turbo_trace(screen, turbo, 7, {"difficulty": diff})
+            same = trace == base
+            ok &= same
+            print(f"{diff:>8} turbo {turbo:>2}x: {len(trace)} ticks en {n} cuadros "
+                  f"(1x: {len(base)} en {frames}) {'✅ iguales' if same else '❌ distintos'}")
+    ref = slice_trace(4096, TICK_MS)
+    for k in (4, 16):
+        trace = slice_trace(4096, TICK_MS * k)
+        same = all(ref[t] == v for t, v in trace.items())
+        ok &= same
+        print(f"fantasma con dt de {TICK_MS * k} ms: {'✅ igual' if same else '❌ distinto'} a {k} pasos de {TICK_MS} ms")
+    pygame.quit()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
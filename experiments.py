@@ -0,0 +1,317 @@
+"""
+experiments.py — RandomPac
+==========================
+Corredor de experimentos Monte Carlo.
+Recorre la grilla semillas × RNG × dificultad × mapa, reparte los trabajos en
+un ProcessPoolExecutor (bloques de semillas de tamaño fijo por trabajador) y
+cada trabajador escribe su propio fragmento .npz en el directorio de salida.
+Los mapas se cargan una vez en el proceso principal y viajan a los
+trabajadores en memoria compartida (logic.grid.Grid.share / attach), junto
+con sus spawns (jugador, fantasmas y casa de cada mapa).
+Nada se acumula en memoria y los fragmentos ya escritos se saltan al relanzar,
+así una corrida interrumpida se retoma donde quedó.
+Con --generated los mapas salen de logic.map_generator: cada trabajador
+genera el suyo a partir de la semilla del mapa ("gen:<semilla>"), así un
+corpus de miles de mapas nunca se escribe en disco.
+
+Uso:
+    python experiments.py run --seeds 1000:101000 --rng LCG PAM --difficulty all --out runs/exp1
+    python experiments.py run --seeds 1:65 --generated 1:5001 --out runs/gen1
+    python experiments.py summary runs/exp1
+    python experiments.py check --map mi_mapa --generated 1:4    # mismo resultado que run_headless
+"""
+
+import os
+# un hilo por proceso: el paralelismo lo pone el pool
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse, glob, json, sys, time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+import numpy as np
+
+from logic.random_generators import RNG_MAP
+from logic.map import load_compiled, list_custom_maps
+from logic.grid import Grid
+from logic.map_generator import generate, spawns as generated_spawns, map_name as generated_name, seed_of
+from core.simulation import DIFFICULTY_SPEEDS
+
+MANIFEST = "manifest.json"
+DEFAULT_MAX_MS = 10 * 60 * 1000
+
+# grillas adjuntas (memoria compartida) por proceso trabajador
+_LEVELS = {}
+
+
+def _level(spec):
+    if spec not in _LEVELS:
+        _LEVELS[spec] = Grid.attach(spec)   # (grid, shm): el shm se mantiene abierto
+    return _LEVELS[spec][0]
+
+
+def _map_for(map_name, spec, spawns):
+    """(grilla, spawns) de un trabajo: la compartida con sus spawns, o la generada desde su semilla."""
+    if spec is not None:
+        return _level(spec), spawns
+    level = generate(seed_of(map_name))
+    return level, generated_spawns(level.width, level.height)
+
+
+def _run_chunk(task):
+    """Trabajo de un proceso: simula un bloque de semillas y guarda su fragmento."""
+    out_dir, shard, rng_name, difficulty, map_name, spec, spawns, start, stop, max_ms, engine = task
+    t0 = time.perf_counter()
+    cls = RNG_MAP[rng_name]
+    config = {"difficulty": difficulty, "map": map_name}
+    seeds = range(start, stop)
+    # solo lectura; el motor por eventos trabaja sobre copias
+    level, spawns = _map_for(map_name, spec, spawns)
+
+    if engine == "batch":
+        from core.batch_sim import run_batch, OUTCOME_NAMES
+        res = run_batch(cls, seeds, config=config, level=level, max_ms=max_ms, spawns=spawns)
+        outcome = res["outcome"]
+    else:
+        from core.event_sim import run_events
+        from core.batch_sim import OUTCOME_NAMES
+        codes = {v: k for k, v in OUTCOME_NAMES.items()}
+        rows = [run_events(cls, s, config=config, level=level.copy(), max_ms=max_ms, spawns=spawns) for s in seeds]
+        res = {k: np.array([r[k] for r in rows], dtype=np.int64) for k in ("seed", "score", "lives", "time_ms")}
+        outcome = np.array([codes[r["result"]] for r in rows], dtype=np.int8)
+
+    # escritura atómica: un fragmento a medias nunca queda con el nombre final
+    path = os.path.join(out_dir, shard)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, seed=np.asarray(res["seed"], dtype=np.int64), score=res["score"], lives=res["lives"],
+                 time_ms=res["time_ms"], outcome=outcome, rng=rng_name, difficulty=difficulty, map=map_name)
+    os.replace(tmp, path)
+    return shard, stop - start, time.perf_counter() - t0
+
+
+def _parse_seeds(text):
+    """'1000:2000' → semillas 1000..1999; 'N' → semillas 1..N."""
+    if ":" in text:
+        a, b = text.split(":")
+        return int(a), int(b)
+    n = int(text)
+    return 1, n + 1
+
+
+def _plan(args):
+    rngs = list(RNG_MAP) if args.rng == ["all"] else args.rng
+    diffs = list(DIFFICULTY_SPEEDS) if args.difficulty == ["all"] else args.difficulty
+    if args.map is None:
+        maps = [] if args.generated else ["Clásico"]
+    else:
+        maps = ["Clásico"] + sorted(list_custom_maps()) if args.map == ["all"] else args.map
+    for name in rngs:
+        if name not in RNG_MAP:
+            sys.exit(f"RNG desconocido: {name} (opciones: {', '.join(RNG_MAP)})")
+    for name in diffs:
+        if name not in DIFFICULTY_SPEEDS:
+            sys.exit(f"Dificultad desconocida: {name} (opciones: {', '.join(DIFFICULTY_SPEEDS)})")
+    start, stop = _parse_seeds(args.seeds)
+    plan = {
+        "rng": rngs, "difficulty": diffs, "map": maps,
+        "seeds": [start, stop], "chunk": args.chunk, "max_ms": args.max_ms, "engine": args.engine,
+    }
+    if args.generated:
+        plan["generated"] = list(_parse_seeds(args.generated))
+    return plan
+
+
+def _maps(plan):
+    """Mapas del plan: los nombrados y luego los generados, de a uno."""
+    yield from plan["map"]
+    if plan.get("generated"):
+        for seed in range(*plan["generated"]):
+            yield generated_name(seed)
+
+
+def _tasks(out_dir, plan, specs=None):
+    start, stop = plan["seeds"]
+    chunk = plan["chunk"]
+    for ri, rng_name in enumerate(plan["rng"]):
+        for di, difficulty in enumerate(plan["difficulty"]):
+            for mi, map_name in enumerate(_maps(plan)):
+                for ci, s in enumerate(range(start, stop, chunk)):
+                    shard = f"{ri}-{di}-{mi}-{ci:06d}.npz"
+                    spec, spawns = specs.get(map_name, (None, None)) if specs else (None, None)
+                    yield (out_dir, shard, rng_name, difficulty, map_name, spec, spawns, s, min(s + chunk, stop),
+                           plan["max_ms"], plan["engine"])
+
+
+def cmd_run(args):
+    plan = _plan(args)
+    os.makedirs(args.out, exist_ok=True)
+    manifest = os.path.join(args.out, MANIFEST)
+    if os.path.exists(manifest):
+        with open(manifest, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        if old != plan:
+            sys.exit(f"⚠️ {args.out} ya contiene otro experimento; usa otro --out.")
+    else:
+        with open(manifest, "w", encoding="utf-8") as f:
+            json.dump(plan, f, ensure_ascii=False, indent=2)
+
+    # retomar: solo los fragmentos que aún no existen
+    todo = [t for t in _tasks(args.out, plan) if not os.path.exists(os.path.join(args.out, t[1]))]
+    total = sum(1 for _ in _tasks(args.out, plan))
+    print(f"🎲 {total - len(todo)}/{total} fragmentos listos, {len(todo)} pendientes, {args.workers} procesos")
+
+    t0 = time.perf_counter()
+    games = 0
+    done_count = total - len(todo)
+
+    def report(finished):
+        nonlocal games, done_count
+        for fut in finished:
+            shard, n, secs = fut.result()
+            games += n
+            done_count += 1
+            rate = games / max(time.perf_counter() - t0, 1e-9)
+            print(f"  ✔ {shard}  {n} partidas en {secs:.1f}s  [{done_count}/{total}, {rate:.0f} partidas/s]")
+
+    shared, specs = _share_maps(plan["map"])
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as ex:
+            # ventana acotada de trabajos en vuelo (no se materializa toda la grilla)
+            pending = set()
+            for task in _tasks(args.out, plan, specs):
+                if os.path.exists(os.path.join(args.out, task[1])):
+                    continue
+                if len(pending) >= 2 * args.workers:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    report(finished)
+                pending.add(ex.submit(_run_chunk, task))
+            report(as_completed(pending))
+    finally:
+        _release(shared)
+
+    print(f"✅ {games} partidas en {time.perf_counter() - t0:.1f}s → {args.out}")
+
+
+def _share_maps(names):
+    """Cada mapa se carga una sola vez y se comparte sin copia: {nombre: (spec, spawns)}."""
+    shared, specs = {}, {}
+    for name in names:
+        cm = load_compiled(name)
+        shm, spec = cm.grid.share()
+        shared[name] = shm
+        specs[name] = (spec, cm.spawns)
+    return shared, specs
+
+
+def _release(shared):
+    for shm in shared.values():
+        shm.close()
+        shm.unlink()
+
+
+def cmd_check(args):
+    """
+    Corre unas semillas por el mismo camino que `run` (pool de procesos,
+    memoria compartida, spawns del mapa, fragmento .npz) y las compara con
+    core.simulation.run_headless sobre el mapa cargado directamente.
+    """
+    import tempfile
+    from core.simulation import run_headless
+    plan = _plan(args)
+    engines = ("batch", "events") if args.engine == "both" else (args.engine,)
+    shared, specs = _share_maps(plan["map"])
+    bad = 0
+    try:
+        with tempfile.TemporaryDirectory() as out, ProcessPoolExecutor(max_workers=args.workers) as ex:
+            for engine in engines:
+                plan["engine"] = engine
+                tasks = list(_tasks(out, plan, specs))
+                for task, _ in zip(tasks, ex.map(_run_chunk, tasks)):
+                    with np.load(os.path.join(out, task[1])) as got:
+                        got = {k: got[k] for k in got.files}
+                    _, shard, rng_name, difficulty, map_name, spec, spawns, start, stop = task[:9]
+                    if spec is None:
+                        level, spawns = _map_for(map_name, None, None)
+                    else:
+                        cm = load_compiled(map_name)
+                        level, spawns = cm.new_grid(), cm.spawns
+                    config = {"difficulty": difficulty, "map": map_name}
+                    same = 0
+                    for i, seed in enumerate(range(start, stop)):
+                        ref = run_headless(RNG_MAP[rng_name], seed, config, level=level.copy(),
+                                           max_ms=plan["max_ms"], spawns=spawns)
+                        same += (ref["score"], ref["lives"], ref["time_ms"]) == (
+                            int(got["score"][i]), int(got["lives"][i]), int(got["time_ms"][i]))
+                    n = stop - start
+                    bad += n - same
+                    mark = "✔" if same == n else "✗"
+                    print(f"  {mark} {map_name} {level.width}x{level.height} {rng_name} {difficulty} {engine}: "
+                          f"{same}/{n} iguales a run_headless")
+    finally:
+        _release(shared)
+    if bad:
+        sys.exit(f"⚠️ {bad} partidas distintas")
+
+
+def iter_shards(out_dir):
+    """Recorre los fragmentos de un experimento sin cargarlos todos a la vez."""
+    for path in sorted(glob.glob(os.path.join(out_dir, "*.npz"))):
+        with np.load(path) as data:
+            yield {k: data[k] for k in data.files}
+
+
+def cmd_summary(args):
+    stats = {}
+    for shard in iter_shards(args.out):
+        map_name = str(shard["map"])
+        # los mapas generados se resumen juntos
+        key = (str(shard["rng"]), str(shard["difficulty"]), "generados" if seed_of(map_name) is not None else map_name)
+        s = stats.setdefault(key, [0, 0, 0, 0])
+        s[0] += len(shard["score"])
+        s[1] += int(shard["score"].sum())
+        s[2] += int((shard["outcome"] == 1).sum())
+        s[3] += int(shard["time_ms"].sum())
+    print(f"{'RNG':<14}{'Dificultad':<11}{'Mapa':<12}{'Partidas':>9}{'Puntaje':>10}{'Victorias':>11}{'Tiempo(s)':>11}")
+    for (rng, diff, map_name), (n, score, wins, ms) in sorted(stats.items()):
+        print(f"{rng:<14}{diff:<11}{map_name:<12}{n:>9}{score / n:>10.1f}{wins / n:>10.1%}{ms / n / 1000:>11.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Experimentos Monte Carlo de RandomPac")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    run = sub.add_parser("run", help="corre (o retoma) un experimento")
+    run.add_argument("--seeds", default="1000:2000", help="rango de semillas inicio:fin")
+    run.add_argument("--rng", nargs="+", default=["all"], help=f"generadores ({', '.join(RNG_MAP)}) o all")
+    run.add_argument("--difficulty", nargs="+", default=["all"], help="dificultades o all")
+    run.add_argument("--map", nargs="+", default=None, help="mapas (storage/maps) o all (por defecto Clásico)")
+    run.add_argument("--generated", default=None, help="semillas de mapas generados inicio:fin (o N)")
+    run.add_argument("--chunk", type=int, default=256, help="semillas por trabajo")
+    run.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    run.add_argument("--max-ms", type=int, default=DEFAULT_MAX_MS, help="límite de tiempo de juego por partida")
+    run.add_argument("--engine", choices=("batch", "events"), default="batch")
+    run.add_argument("--out", required=True, help="directorio de fragmentos .npz")
+    run.set_defaults(func=cmd_run)
+
+    check = sub.add_parser("check", help="compara unas semillas contra run_headless (mismos mapas y spawns)")
+    check.add_argument("--seeds", default="1:9", help="rango de semillas inicio:fin")
+    check.add_argument("--rng", nargs="+", default=["LCG"], help=f"generadores ({', '.join(RNG_MAP)}) o all")
+    check.add_argument("--difficulty", nargs="+", default=["Clásico"], help="dificultades o all")
+    check.add_argument("--map", nargs="+", default=None, help="mapas (storage/maps) o all (por defecto Clásico)")
+    check.add_argument("--generated", default=None, help="semillas de mapas generados inicio:fin (o N)")
+    check.add_argument("--max-ms", type=int, default=DEFAULT_MAX_MS, help="límite de tiempo de juego por partida")
+    check.add_argument("--engine", choices=("batch", "events", "both"), default="both")
+    check.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    check.set_defaults(func=cmd_check, chunk=1 << 30)
+
+    summary = sub.add_parser("summary", help="resume un experimento ya corrido")
+    summary.add_argument("out")
+    summary.set_defaults(func=cmd_summary)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
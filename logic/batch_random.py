@@ -0,0 +1,153 @@
+"""
+batch_random.py — RandomPac (v1.0)
+==================================
+Versiones vectorizadas (NumPy) de los generadores de random_generators.py.
+Cada instancia guarda el estado de N generadores independientes (uno por
+partida) y produce exactamente la misma secuencia que la clase escalar con
+la misma semilla.
+
+- .random(mask) → arreglo float64 de N valores en [0,1); solo avanzan los
+  generadores donde mask es True (los demás conservan su estado).
+- .random_rows(rows) → un valor por elemento de rows (índices de generador
+  en orden no decreciente): una fila repetida saca valores sucesivos de su
+  generador, lo mismo que llamar random() una vez por repetición. El LCG los
+  saca en una sola operación saltando k pasos con (A_k, C_k); los otros, en
+  una pasada por repetición.
+"""
+
+import numpy as np
+from logic.random_generators import LCG, MiddleSquare, PAM
+
+def _ranks(rows):
+    """Posición de cada elemento dentro de su tramo de filas iguales (rows ordenado)."""
+    at = np.arange(len(rows))
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = rows[1:] != rows[:-1]
+    return at - np.maximum.accumulate(np.where(first, at, 0))
+
+
+class _BatchGenerator:
+    def random_rows(self, rows):
+        """Valores sucesivos para rows (ordenado): la k-ésima repetición de una fila saca su valor k + 1."""
+        rank = _ranks(rows)
+        out = np.empty(len(rows))
+        for k in range(int(rank.max(initial=-1)) + 1):
+            sel = rank == k
+            mask = np.zeros(len(self), dtype=bool)
+            mask[rows[sel]] = True
+            out[sel] = self.random(mask)[rows[sel]]
+        return out
+
+
+# ------------------------------
+# MÉTODO 2: CONGRUENCIAL LINEAL
+# ------------------------------
+class BatchLCG(_BatchGenerator):
+    def __init__(self, seeds):
+        gens = [LCG(s) for s in seeds]
+        g0 = gens[0] if gens else LCG(1)
+        self.a, self.c, self.m = g0.a, g0.c, g0.m
+        self.state = np.array([g.state for g in gens], dtype=np.int64)
+        self._jump_table = None
+
+    def random(self, mask):
+        nxt = (self.a * self.state + self.c) % self.m
+        self.state = np.where(mask, nxt, self.state)
+        return self.state / self.m
+
+    def _jumps(self, k):
+        """(A_j, C_j) para j = 1..k: j pasos del LCG son x → (A_j·x + C_j) mod m."""
+        jumps = self._jump_table
+        if jumps is None or len(jumps[0]) < k:
+            A, C = [1], [0]
+            for _ in range(k):
+                A.append(A[-1] * self.a % self.m)
+                C.append((C[-1] * self.a + self.c) % self.m)
+            jumps = self._jump_table = (np.array(A[1:], dtype=np.int64), np.array(C[1:], dtype=np.int64))
+        return jumps
+
+    def random_rows(self, rows):
+        rank = _ranks(rows)
+        A, C = self._jumps(int(rank.max(initial=-1)) + 1)
+        seq = (A[rank] * self.state[rows] + C[rank]) % self.m
+        last = np.ones(len(rows), dtype=bool)
+        last[:-1] = rows[1:] != rows[:-1]
+        self.state[rows[last]] = seq[last]
+        return seq / self.m
+
+    def take(self, idx):
+        self.state = self.state[idx]
+
+    def __len__(self):
+        return len(self.state)
+
+
+# ------------------------------
+# MÉTODO 1: CUADRADO MEDIO
+# ------------------------------
+class BatchMiddleSquare(_BatchGenerator):
+    def __init__(self, seeds):
+        # El cuadrado de una semilla grande no cabe en int64: ese primer paso se
+        # da acá con enteros de Python y queda pendiente (el primer random() lo
+        # devuelve sin volver a avanzar). Así el arreglo solo guarda estados de
+        # 4 dígitos, cuyo cuadrado tiene a lo sumo 8.
+        gens = [MiddleSquare(s) for s in seeds]
+        pending = [abs(g.state) >= 10000 for g in gens]
+        for g, p in zip(gens, pending):
+            if p:
+                g.rand()
+        self.state = np.array([g.state for g in gens], dtype=np.int64)
+        self.pending = np.array(pending, dtype=bool)
+
+    def random(self, mask):
+        mid = (self.state * self.state // 100) % 10000       # str(sq).zfill(8)[2:6]
+        nonzero = self.state != 0
+        if self.pending.any():
+            nonzero |= self.pending
+            mid = np.where(self.pending, self.state, mid)
+            self.pending &= ~mask
+        self.state = np.where(mask & nonzero, mid, self.state)
+        return np.where(nonzero, self.state / 9999, 0.0)
+
+    def take(self, idx):
+        self.state, self.pending = self.state[idx], self.pending[idx]
+
+    def __len__(self):
+        return len(self.state)
+
+
+# ------------------------------
+# MÉTODO 3: PROMEDIO ARITMÉTICO MÚLTIPLE (Original)
+# ------------------------------
+class BatchPAM(_BatchGenerator):
+    def __init__(self, seeds):
+        gens = [PAM(s) for s in seeds]
+        self.m = gens[0].m if gens else 10000
+        hist = np.array([g.history[-3:] for g in gens], dtype=np.int64).reshape(-1, 3)
+        self.x0, self.x1, self.x2 = hist[:, 0].copy(), hist[:, 1].copy(), hist[:, 2].copy()
+
+    def random(self, mask):
+        total = (self.x2 + 2 * self.x1 + 3 * self.x0).astype(np.float64)
+        nxt = ((total / 6) * 10000).astype(np.int64) % self.m
+        self.x0 = np.where(mask, self.x1, self.x0)
+        self.x1 = np.where(mask, self.x2, self.x1)
+        self.x2 = np.where(mask, nxt, self.x2)
+        return nxt / self.m
+
+    def take(self, idx):
+        self.x0, self.x1, self.x2 = self.x0[idx], self.x1[idx], self.x2[idx]
+
+    def __len__(self):
+        return len(self.x0)
+
+
+BATCH_GENERATORS = {
+    LCG: BatchLCG,
+    MiddleSquare: BatchMiddleSquare,
+    PAM: BatchPAM,
+}
+
+
+def batch_generator(generator_class, seeds):
+    """Crea la versión vectorizada de generator_class para una lista de semillas."""
+    return BATCH_GENERATORS[generator_class](seeds)
@@ -0,0 +1,204 @@
+"""
+logic/grid.py — RandomPac v1.0
+==============================
+Grilla del mapa respaldada por un bytearray plano (un byte por celda).
+- Índice plano O(1): i = r * width + c  (grid.cells[i])
+- Vistas de fila / columna sin copia (memoryview)
+- copy() / copy_from() son un solo memcpy
+- array() → vista NumPy uint8 (height, width) sin copia
+- share() / attach() → la misma grilla en memoria compartida entre procesos
+- Contadores incrementales de puntos (total, power y por cuadrante):
+  dots_left y region_dots se leen en O(1); eat() y set() los mantienen.
+  Quien escriba grid.cells directamente debe llamar a recount().
+- listener: función opcional (c, r, valor) que logic.map.eat_dot llama al
+  comer un punto (core/maze_layer borra el punto de la capa ya dibujada).
+  No se copia con copy().
+
+Valores de celda (igual que logic/map.py):
+0 = vacío, 1 = muro, 2 = punto, 3 = power dot, 4 = puerta de la casa
+"""
+
+
+DOT, POWER_DOT = 2, 3
+
+# Cuadrantes: 0 = NO, 1 = NE, 2 = SO, 3 = SE
+REGION_NAMES = ("NO", "NE", "SO", "SE")
+
+
+class Grid:
+    __slots__ = ("width", "height", "cells", "dots", "power_dots", "region_dots", "listener")
+
+    def __init__(self, width, height, cells=None):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(width * height) if cells is None else cells
+        self.listener = None
+        if len(self.cells) != width * height:
+            raise ValueError(f"La grilla {width}x{height} necesita {width * height} celdas, hay {len(self.cells)}")
+        self.recount()
+
+    # ---------- contadores de puntos ----------
+    def recount(self):
+        """Recuenta puntos y power dots (tras escribir cells directamente)."""
+        data = bytes(self.cells)
+        w, h = self.width, self.height
+        self.dots = data.count(DOT)
+        self.power_dots = data.count(POWER_DOT)
+        mc, mr = w // 2, h // 2
+        regions = [0, 0, 0, 0]
+        for r in range(h):
+            row = data[r * w:(r + 1) * w]
+            q = 2 if r >= mr else 0
+            left = row[:mc]
+            regions[q] += left.count(DOT) + left.count(POWER_DOT)
+            right = row[mc:]
+            regions[q + 1] += right.count(DOT) + right.count(POWER_DOT)
+        self.region_dots = regions
+
+    @property
+    def dots_left(self):
+        """Puntos + power dots que quedan (O(1))."""
+        return self.dots + self.power_dots
+
+    def region_of(self, c, r):
+        return (2 if r >= self.height // 2 else 0) + (1 if c >= self.width // 2 else 0)
+
+    def _count(self, c, r, value, delta):
+        if value == DOT:
+            self.dots += delta
+        elif value == POWER_DOT:
+            self.power_dots += delta
+        else:
+            return
+        self.region_dots[self.region_of(c, r)] += delta
+
+    def eat(self, c, r):
+        """Vacía la celda si tiene punto o power dot; devuelve el valor que tenía (o 0)."""
+        i = r * self.width + c
+        v = self.cells[i]
+        if v == DOT or v == POWER_DOT:
+            self.cells[i] = 0
+            self._count(c, r, v, -1)
+            return v
+        return 0
+
+    # ---------- construcción ----------
+    @classmethod
+    def from_rows(cls, rows):
+        """Crea la grilla desde una lista de filas (formato JSON de storage/maps)."""
+        if not rows or not all(isinstance(row, (list, tuple, str, bytes, bytearray, memoryview)) for row in rows):
+            raise ValueError("Formato de grilla inválido: se esperaba una lista de filas")
+        width = len(rows[0])
+        if any(len(row) != width for row in rows):
+            raise ValueError("Formato de grilla inválido: filas de distinto largo")
+        cells = bytearray()
+        for row in rows:
+            cells.extend(int(v) for v in row)
+        return cls(width, len(rows), cells)
+
+    @classmethod
+    def with_counts(cls, width, height, cells, dots, power_dots, region_dots):
+        """Grilla con contadores ya conocidos (mapa compilado): evita el recuento."""
+        g = cls.__new__(cls)
+        g.width, g.height, g.cells = width, height, cells
+        g.dots, g.power_dots, g.region_dots = dots, power_dots, list(region_dots)
+        g.listener = None
+        return g
+
+    def to_rows(self):
+        """Lista de listas de int (para guardar como JSON)."""
+        w = self.width
+        return [list(self.cells[r * w:(r + 1) * w]) for r in range(self.height)]
+
+    def copy(self):
+        g = Grid.__new__(Grid)
+        g.width, g.height, g.cells = self.width, self.height, bytearray(self.cells)
+        g.dots, g.power_dots, g.region_dots = self.dots, self.power_dots, self.region_dots[:]
+        g.listener = None
+        return g
+
+    def copy_from(self, other):
+        """Sobrescribe el contenido con el de otra grilla del mismo tamaño (memcpy)."""
+        self.cells[:] = other.cells
+        self.dots, self.power_dots, self.region_dots = other.dots, other.power_dots, other.region_dots[:]
+
+    # ---------- acceso ----------
+    def index(self, c, r):
+        return r * self.width + c
+
+    def in_bounds(self, c, r):
+        return 0 <= c < self.width and 0 <= r < self.height
+
+    def get(self, c, r, default=1):
+        """Valor de la celda; fuera del mapa cuenta como muro."""
+        if 0 <= c < self.width and 0 <= r < self.height:
+            return self.cells[r * self.width + c]
+        return default
+
+    def set(self, c, r, value):
+        i = r * self.width + c
+        self._count(c, r, self.cells[i], -1)
+        self.cells[i] = value
+        self._count(c, r, value, 1)
+
+    def row(self, r):
+        """Vista (sin copia) de la fila r."""
+        w = self.width
+        return memoryview(self.cells)[r * w:(r + 1) * w]
+
+    def column(self, c):
+        """Vista (sin copia) de la columna c."""
+        return memoryview(self.cells)[c::self.width]
+
+    def count(self, *values):
+        data = bytes(self.cells) if isinstance(self.cells, memoryview) else self.cells
+        return sum(data.count(v) for v in values)
+
+    def array(self):
+        """Vista NumPy uint8 (height, width) sobre las mismas celdas."""
+        import numpy as np
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width)
+
+    # compatibilidad con código que recorre filas: for row in grid / grid[r][c] / len(grid)
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, r):
+        if r < 0:
+            r += self.height
+        if not 0 <= r < self.height:
+            raise IndexError(r)
+        return self.row(r)
+
+    def __iter__(self):
+        for r in range(self.height):
+            yield self.row(r)
+
+    def __eq__(self, other):
+        return (isinstance(other, Grid) and self.width == other.width and self.height == other.height
+                and self.cells == other.cells)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Grid({self.width}x{self.height})"
+
+    # ---------- memoria compartida ----------
+    def share(self):
+        """
+        Copia la grilla a un bloque de memoria compartida y devuelve
+        (shm, spec). spec = (nombre, ancho, alto) viaja a otros procesos;
+        quien crea el bloque debe cerrarlo y liberarlo con shm.unlink().
+        """
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(create=True, size=max(len(self.cells), 1))
+        shm.buf[:len(self.cells)] = self.cells
+        return shm, (shm.name, self.width, self.height)
+
+    @classmethod
+    def attach(cls, spec):
+        """Grilla sin copia sobre un bloque creado con share(); devuelve (grid, shm)."""
+        from multiprocessing import shared_memory
+        name, width, height = spec
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(width, height, shm.buf[:width * height]), shm
@@ -1,17 +1,19 @@
 """
-logic/map.py — RandomPac v4.0
+logic/map.py — RandomPac v4.2
 ==============================
 Gestor de mapas del juego.
 Ahora soporta:
 - Mapa clásico fijo (generate_level)
 - Mapas personalizados en /storage/maps/*.json
 - Funciones utilitarias (is_wall, is_door, eat_dot)
+Todos los mapas se devuelven como logic.grid.Grid (bytearray plano).
+Los JSON se validan y compilan una vez (logic/map_compiler); un mapa puede
+medir hasta 1000x1000 y traer sus propios spawns.
 """
 
 import os, json
-
-# --- CONFIGURACIÓN GENERAL ---
-MAPS_DIR = os.path.join("storage", "maps")
+from logic.grid import Grid
+from logic.map_compiler import MAPS_DIR, MapError, compile_map, compile_grid, map_index, parse_map
 
 # --- MAPA CLÁSICO BASE ---
 def generate_level():
@@ -49,65 +51,74 @@ def generate_level():
         "1222222222222222222222222231",
         "1111111111111111111111111111",
     ]
-    return [[int(ch) for ch in row] for row in level]
+    return Grid.from_rows(level)
 
 # --- MAPAS PERSONALIZADOS ---
 def list_custom_maps():
-    """Devuelve una lista de nombres de mapas disponibles en storage/maps."""
-    if not os.path.exists(MAPS_DIR):
-        return []
-    return [f[:-5] for f in os.listdir(MAPS_DIR) if f.endswith(".json")]
+    """Devuelve los nombres de mapas en storage/maps (desde el índice de map_compiler)."""
+    return sorted(map_index())
 
 def load_custom_map(name):
-    """Carga un mapa guardado como JSON desde /storage/maps/."""
-    path = os.path.join(MAPS_DIR, f"{name}.json")
-    if not os.path.exists(path):
+    """Carga un mapa de /storage/maps/ (validado y compilado una vez, ver map_compiler)."""
+    try:
+        return compile_map(name).new_grid()
+    except FileNotFoundError:
         raise FileNotFoundError(f"❌ No se encontró el mapa '{name}' en {MAPS_DIR}")
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # validar formato (debe ser lista de listas de enteros)
-    if not isinstance(data, list) or not all(isinstance(row, list) for row in data):
-        raise ValueError(f"Formato inválido del mapa '{name}'")
+# mapa clásico compilado (se arma una vez por proceso) y mapas ya cargados
+_CLASSIC = None
+_LOADED = {}     # nombre → (mtime_ns, tamaño, CompiledMap)
 
-    # aseguramos que todos los valores sean int
-    grid = [[int(v) for v in row] for row in data]
-    return grid
+def load_compiled(name):
+    """CompiledMap del mapa pedido; si falta o es inválido, avisa y usa el clásico."""
+    global _CLASSIC
+    if name and name.lower() != "clásico":
+        try:
+            st = os.stat(os.path.join(MAPS_DIR, f"{name}.json"))
+            hit = _LOADED.get(name)
+            if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+                return hit[2]
+            cm = compile_map(name)
+            _LOADED[name] = (st.st_mtime_ns, st.st_size, cm)
+            return cm
+        except FileNotFoundError:
+            print(f"⚠️ Mapa '{name}' no encontrado. Usando clásico.")
+        except (MapError, ValueError) as e:
+            print(f"⚠️ Mapa '{name}' inválido ({e}). Usando clásico.")
+    if _CLASSIC is None:
+        _CLASSIC = compile_grid("Clásico", generate_level())
+    return _CLASSIC
 
 def load_map(name: str):
     """Carga un mapa desde JSON o retorna el clásico por defecto."""
-    if not name or name.lower() == "clásico":
-        return generate_level()
+    return load_compiled(name).new_grid()
 
-    path = os.path.join("storage", "maps", f"{name}.json")
-    if not os.path.exists(path):
-        print(f"⚠️ Mapa '{name}' no encontrado. Usando clásico.")
-        return generate_level()
-
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            # validar dimensiones básicas
-            if isinstance(data, list) and len(data) > 10 and all(isinstance(row, list) for row in data):
-                return data
-            else:
-                print(f"⚠️ Mapa '{name}' inválido. Usando clásico.")
-                return generate_level()
-    except Exception as e:
-        print(f"⚠️ Error al cargar mapa {name}: {e}")
-        return generate_level()
+def save_custom_map(name, grid, spawns=None):
+    """
+    Guarda una grilla como JSON en /storage/maps/ y la compila. Sin spawns se
+    escribe la lista de filas original; con spawns (map_compiler.Spawns), un
+    dict con "tiles" y las posiciones. Se valida antes de escribir: si el mapa
+    no compilaría lanza MapError y no toca el archivo.
+    """
+    data = grid.to_rows() if spawns is None else {"tiles": grid.to_rows(), **spawns.to_json()}
+    parse_map(data, name)
+    os.makedirs(MAPS_DIR, exist_ok=True)
+    path = os.path.join(MAPS_DIR, f"{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    compile_map(name)
+    return path
 
-# --- FUNCIONES AUXILIARES (sin cambios) ---
+# --- FUNCIONES AUXILIARES ---
 def is_wall(grid, c, r):
-    return grid[r][c] == 1
+    return grid.cells[r * grid.width + c] == 1
 
 def is_door(grid, c, r):
-    return grid[r][c] == 4
+    return grid.cells[r * grid.width + c] == 4
 
 def eat_dot(grid, c, r):
-    """Elimina el punto o power dot cuando Pac-Man lo come."""
-    if grid[r][c] in (2, 3):
-        grid[r][c] = 0
-        return True
-    return False
+    """Elimina el punto o power dot cuando Pac-Man lo come (y avisa a grid.listener)."""
+    v = grid.eat(c, r)
+    if v and grid.listener is not None:
+        grid.listener(c, r, v)
+    return v != 0
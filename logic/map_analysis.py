@@ -0,0 +1,319 @@
+"""
+logic/map_analysis.py — RandomPac v1.2
+======================================
+Análisis estático de un mapa (vectorizado con NumPy).
+Responde si el mapa se puede ganar y cómo es su trazado:
+- alcance: componente conexa del spawn del jugador (la puerta 4 bloquea)
+- puntos inalcanzables: puntos / power dots fuera de esa componente
+  (con uno solo la partida nunca termina en victoria)
+- callejones sin salida (1 salida), cruces (3+ salidas) y bocas de túnel
+  (celdas transitables en el borde; el motor no teletransporta)
+- si cada spawn de fantasma llega al jugador (los fantasmas cruzan la puerta)
+- spawns y casa válidos con las reglas de map_compiler.spawn_errors (un mapa
+  que no las cumple no compila, así que tampoco cuenta como ganable)
+
+La conectividad es un union-find vectorizado: los tramos de celdas libres
+(horizontales o verticales, lo que dé menos nodos) son los nodos; en cada
+ronda cada raíz se engancha a la menor de sus raíces vecinas (np.minimum.at,
+así una raíz con muchas aristas no pierde escrituras) y se comprimen solo las
+raíces enganchadas en esa ronda; todo el arreglo se comprime una vez al final.
+No hay cota logarítmica garantizada para las rondas (no es Shiloach-Vishkin):
+en --bench son 1 en la serpentina y el peine y 3 en el laberinto generado.
+Las salidas de cada celda se cuentan con la grilla desplazada (no hace falta
+una NavTable) y el grafo de los fantasmas se arma uniendo solo las puertas a
+las componentes del jugador.
+
+El editor lo llama en cada edición; `python -m logic.map_analysis` audita
+storage/maps en paralelo (--bench mide la llamada completa en 28x31, en una
+serpentina y un peine de 1000x1000 y en un laberinto generado de 1000x999).
+"""
+
+import numpy as np
+from logic.grid import DOT, POWER_DOT
+from logic.navigation import PLAYER_BLOCKS, GHOST_BLOCKS
+from logic.map_compiler import DEFAULT_PLAYER_SPAWN, DEFAULT_GHOST_SPAWNS, DEFAULT_HOUSE, Spawns, spawn_errors
+
+# celdas transitables por valor de celda (una lectura por celda, sin np.isin)
+_WALK = np.ones(256, dtype=bool)
+_WALK[list(PLAYER_BLOCKS)] = False
+_GHOST_WALK = np.ones(256, dtype=bool)
+_GHOST_WALK[list(GHOST_BLOCKS)] = False
+
+
+def _labels(passable, w):
+    """Etiqueta de la componente conexa (4-vecinos) de cada celda transitable; -1 en las demás."""
+    h = passable.size // w if w else 0
+    cells = passable.reshape(h, w)
+    # los tramos van en el sentido que da menos nodos (el peine de --bench
+    # tiene ~1 500 tramos verticales y ~500 000 horizontales de una celda)
+    across = np.count_nonzero(cells[:, 1:] > cells[:, :-1]) + np.count_nonzero(cells[:, 0])
+    down = np.count_nonzero(cells[1:] > cells[:-1]) + np.count_nonzero(cells[0])
+    if down < across:
+        labels = _run_labels(np.ascontiguousarray(cells.T).ravel(), h)
+        return np.ascontiguousarray(labels.reshape(w, h).T).ravel()
+    return _run_labels(passable, w)
+
+
+def _run_labels(passable, w):
+    """_labels con los tramos horizontales (filas de ancho w) como nodos."""
+    # 1) cada tramo horizontal de celdas transitables es un nodo (conexo por construcción)
+    start = passable.copy()
+    start[1:] &= ~passable[:-1]
+    start[::w] = passable[::w]                   # cada fila empieza tramos nuevos
+    run = np.cumsum(start, dtype=np.int32) - 1
+
+    # 2) union-find entre tramos unidos por aristas verticales
+    below = np.flatnonzero(passable[:-w] & passable[w:])
+    n = int(run[-1]) + 1 if run.size else 0
+    return np.where(passable, _union(n, run[below], run[below + w])[run], -1)
+
+
+def _union(n, lu, lv):
+    """Raíz (el menor índice de su componente) de cada uno de los n nodos unidos por las aristas lu-lv."""
+    L = np.arange(n, dtype=np.int32)
+    while True:
+        keep = lu != lv
+        if not keep.any():
+            break
+        lu, lv = lu[keep], lv[keep]
+        # cada raíz se engancha a la menor raíz vecina (con asignación simple,
+        # una raíz repetida conservaría solo la última escritura)
+        hooked = np.maximum(lu, lv)
+        np.minimum.at(L, hooked, np.minimum(lu, lv))
+        # solo las raíces enganchadas cambiaron: se comprimen ellas, no todo L,
+        # y cada una deja de saltar en cuanto su padre es raíz
+        mark = np.zeros(n, dtype=bool)
+        mark[hooked] = True
+        nodes = np.flatnonzero(mark)
+        parent = L[nodes]
+        while nodes.size:
+            up = L[parent]
+            moving = up != parent
+            nodes, parent = nodes[moving], up[moving]
+            L[nodes] = parent
+        lu, lv = L[lu], L[lv]
+
+    # los nodos enganchados en rondas anteriores apuntan a raíces viejas: una compresión final
+    while True:
+        nxt = L[L]
+        if np.array_equal(nxt, L):
+            break
+        L = nxt
+    return L
+
+
+def _join(labels, extra, passable, w, query):
+    """
+    Componente en `passable` de cada celda de query (-1 si no es transitable),
+    a partir de las etiquetas (labels) de un subconjunto más las celdas
+    `extra` (índices planos). Cada componente y cada celda extra es un nodo y
+    solo entran las aristas que tocan una celda extra: los fantasmas (que
+    además cruzan la puerta) no vuelven a etiquetar todo el mapa.
+    """
+    col, size = extra % w, passable.size
+    src, dst = [], []
+    for step, ok in ((1, col < w - 1), (-1, col > 0), (w, extra < size - w), (-w, extra >= w)):
+        s = extra[ok]
+        s = s[passable[s + step]]
+        src.append(s)
+        dst.append(s + step)
+    cells = np.concatenate(src + dst + [query])
+    is_extra = np.zeros(size, dtype=bool)
+    is_extra[extra] = True
+    keys, ids = np.unique(np.where(is_extra[cells], size + cells, labels[cells]), return_inverse=True)
+    edges = sum(len(s) for s in src)
+    L = _union(keys.size, ids[:edges], ids[edges:2 * edges])
+    return np.where(passable[query], L[ids[2 * edges:]], -1)
+
+
+class MapReport:
+    """Resultado de analyze(); los conjuntos de celdas son índices planos (r * width + c)."""
+    def __init__(self, width, height, player_spawn, spawn_ok, reachable, dots, unreachable_dots,
+                 dead_ends, tunnels, junctions, ghosts_reach, spawn_errors=()):
+        self.width, self.height = width, height
+        self.player_spawn = player_spawn
+        self.spawn_ok = spawn_ok
+        self.spawn_errors = list(spawn_errors)    # spawns / casa sobre muros o fuera del mapa
+        self.reachable = reachable                # celdas alcanzables por el jugador
+        self.dots = dots                          # puntos + power dots del mapa
+        self.unreachable_dots = unreachable_dots
+        self.dead_ends = dead_ends
+        self.tunnels = tunnels
+        self.junctions = junctions
+        self.ghosts_reach = ghosts_reach          # un bool por spawn de fantasma
+
+    @property
+    def winnable(self):
+        """Los spawns son válidos, hay puntos y el jugador puede comerlos todos."""
+        return (self.spawn_ok and not self.spawn_errors and self.dots > 0
+                and not len(self.unreachable_dots))
+
+    def tiles(self, indices):
+        """Índices planos → lista de (c, r)."""
+        return [(int(i) % self.width, int(i) // self.width) for i in indices]
+
+    def problems(self):
+        """Problemas en texto; todos menos los fantasmas que no llegan impiden ganar."""
+        out = list(self.spawn_errors)
+        if self.spawn_ok and len(self.unreachable_dots):
+            out.append(f"{len(self.unreachable_dots)} puntos inalcanzables")
+        if self.dots == 0:
+            out.append("El mapa no tiene puntos")
+        lost = [i for i, ok in enumerate(self.ghosts_reach) if not ok]
+        if lost:
+            out.append(f"Fantasmas que no llegan al jugador: {lost}")
+        return out
+
+    def summary(self):
+        return {
+            "size": f"{self.width}x{self.height}",
+            "winnable": self.winnable,
+            "reachable": self.reachable,
+            "dots": self.dots,
+            "unreachable_dots": len(self.unreachable_dots),
+            "dead_ends": len(self.dead_ends),
+            "tunnels": len(self.tunnels),
+            "junctions": self.junctions,
+            "ghosts_reach": sum(self.ghosts_reach),
+        }
+
+
+def analyze(grid, player_spawn=DEFAULT_PLAYER_SPAWN, ghost_spawns=DEFAULT_GHOST_SPAWNS,
+            house=DEFAULT_HOUSE):
+    """Analiza grid (logic.grid.Grid); todo sale de las celdas, sin NavTable."""
+    w, h = grid.width, grid.height
+    cells = np.frombuffer(grid.cells, dtype=np.uint8)
+    walk = _WALK[cells]
+    ghost_walk = _GHOST_WALK[cells]
+
+    # alcance del jugador
+    pc, pr = player_spawn
+    spawn = pr * w + pc
+    spawn_ok = grid.in_bounds(pc, pr) and bool(walk[spawn])
+    is_dot = (cells == DOT) | (cells == POWER_DOT)
+    if spawn_ok:
+        labels = _labels(walk, w)
+        mine = labels == labels[spawn]
+        reachable = int(mine.sum())
+        unreachable = np.flatnonzero(is_dot & ~mine)
+    else:
+        reachable, unreachable = 0, np.flatnonzero(is_dot)
+
+    # trazado (salidas del jugador, solo en celdas transitables): vecinas
+    # transitables contadas con la grilla desplazada en las 4 direcciones
+    open2d = walk.reshape(h, w)
+    exits2d = np.zeros((h, w), dtype=np.uint8)
+    exits2d[:, :-1] += open2d[:, 1:]
+    exits2d[:, 1:] += open2d[:, :-1]
+    exits2d[:-1] += open2d[1:]
+    exits2d[1:] += open2d[:-1]
+    exits = exits2d.ravel()
+    dead_ends = np.flatnonzero(walk & (exits == 1))
+    junctions = int((walk & (exits >= 3)).sum())
+    border = np.zeros((h, w), dtype=bool)
+    border[0, :] = border[-1, :] = border[:, 0] = border[:, -1] = True
+    tunnels = np.flatnonzero(walk & border.ravel())
+
+    # fantasmas → jugador (con la puerta abierta)
+    if spawn_ok:
+        # el grafo de los fantasmas es el del jugador más las puertas; solo se
+        # pregunta la componente del spawn y de cada fantasma (dentro del mapa)
+        inside = [grid.in_bounds(gc, gr) for gc, gr in ghost_spawns]
+        query = np.array([spawn] + [gr * w + gc if ok else spawn for (gc, gr), ok in zip(ghost_spawns, inside)])
+        doors = np.flatnonzero(ghost_walk & ~walk)
+        roots = _join(labels, doors, ghost_walk, w, query) if doors.size else labels[query]
+        ghosts_reach = [ok and bool(root == roots[0]) for ok, root in zip(inside, roots[1:])]
+    else:
+        ghosts_reach = [False] * len(ghost_spawns)
+
+    errors = spawn_errors(grid, Spawns(player_spawn, ghost_spawns, house))
+    return MapReport(w, h, player_spawn, spawn_ok, reachable, int(is_dot.sum()), unreachable,
+                     dead_ends, tunnels, junctions, ghosts_reach, errors)
+
+
+def analyze_compiled(cm):
+    """Analiza un logic.map_compiler.CompiledMap con sus propios spawns."""
+    return analyze(cm.grid, cm.spawns.player, cm.spawns.ghosts, cm.spawns.house)
+
+
+# ---------- auditoría por lotes ----------
+def _audit_one(name):
+    from logic.map_compiler import compile_map, MapError
+    try:
+        report = analyze_compiled(compile_map(name))
+    except (OSError, MapError, ValueError) as e:
+        return name, {"error": str(e)}, []
+    return name, report.summary(), report.problems()
+
+
+def audit(names=None, workers=None):
+    """Analiza los mapas (por defecto todos los de storage/maps) en procesos paralelos."""
+    from concurrent.futures import ProcessPoolExecutor
+    from logic.map_compiler import map_index
+    names = sorted(map_index()) if names is None else list(names)
+    if not names:
+        return []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_audit_one, names))
+
+
+def _bench():
+    import time
+    from logic.grid import Grid
+    from logic.map import load_map
+
+    # se mide la llamada completa, como la hacen el editor y logic.map_generator
+    def timed(grid, spawn, reps, ghosts=DEFAULT_GHOST_SPAWNS, house=DEFAULT_HOUSE):
+        analyze(grid, spawn, ghosts, house)
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            report = analyze(grid, spawn, ghosts, house)
+        return (time.perf_counter() - t0) / reps * 1000, report
+
+    classic = load_map(None)
+    ms, rep = timed(classic, DEFAULT_PLAYER_SPAWN, 200)
+    print(f"clásico 28x31: {ms:.2f} ms  {rep.summary()}")
+
+    # 1000x1000: pasillos en serpentina (una sola componente muy larga) con puntos
+    side = 1000
+    a = np.ones((side, side), dtype=np.uint8)
+    a[1:-1:2, 1:-1] = DOT
+    a[2:-1:4, -2] = DOT
+    a[4:-1:4, 1] = DOT
+    big = Grid(side, side, bytearray(a.tobytes()))
+    ms, rep = timed(big, (1, 1), 5, [(1, 1)] * 4, (1, 1))
+    print(f"serpentina {side}x{side}: {ms:.1f} ms  {rep.summary()}")
+
+    # 1000x1000: peine de dientes verticales unidos por un pasillo en la última fila
+    # (la raíz del pasillo recibe una arista por diente en la misma ronda; con
+    # tramos horizontales serían ~500 000 nodos, por eso _labels usa columnas)
+    a = np.ones((side, side), dtype=np.uint8)
+    a[1:-1, 1:-1:2] = DOT
+    a[-2, 1:-1] = DOT
+    comb = Grid(side, side, bytearray(a.tobytes()))
+    ms, rep = timed(comb, (1, 1), 5, [(1, 1)] * 4, (1, 1))
+    print(f"peine {side}x{side}: {ms:.1f} ms  {rep.summary()}")
+
+    # laberinto de logic.map_generator (el tamaño válido más cercano a 1000x1000)
+    from logic.map_generator import generate, spawns
+    maze = generate(1, width=side, height=side - 1)
+    sp = spawns(maze.width, maze.height)
+    ms, rep = timed(maze, sp.player, 5, sp.ghosts, sp.house)
+    print(f"laberinto {maze.width}x{maze.height}: {ms:.1f} ms  {rep.summary()}")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Audita los mapas de storage/maps")
+    parser.add_argument("names", nargs="*", help="mapas a revisar (por defecto, todos)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--bench", action="store_true", help="mide el análisis en 28x31 y en 1000x1000 (serpentina, peine y laberinto)")
+    args = parser.parse_args()
+    if args.bench:
+        _bench()
+    else:
+        for name, summary, problems in audit(args.names or None, args.workers):
+            status = "OK" if summary.get("winnable") else "✗"
+            print(f"{status} {name}: {summary}")
+            for p in problems:
+                print(f"    - {p}")
@@ -0,0 +1,356 @@
+"""
+logic/map_compiler.py — RandomPac v1.2
+======================================
+Compilador y caché binaria de mapas.
+Cada storage/maps/<nombre>.json se valida una sola vez y se compila a
+storage/maps_cache/<nombre>.rpmap, un archivo empaquetado con:
+- cabecera: hash SHA-1 del JSON, mtime y tamaño del JSON, dimensiones,
+  conteo de puntos (total, power, por cuadrante), spawn del jugador,
+  centro de la casa y spawns de los fantasmas
+- celdas de la grilla, tabla de navegación del jugador y de los fantasmas
+Cargar es un mmap + copia de las celdas. El artefacto se reutiliza mientras
+mtime y tamaño coincidan; si cambian pero el contenido (hash) es el mismo,
+solo se actualiza la cabecera.
+
+storage/maps_cache/index.json guarda los nombres y metadatos de los mapas;
+list_custom_maps() lo lee sin recorrer el directorio salvo que el directorio
+de mapas haya cambiado (se compara su mtime).
+Varios procesos pueden compilar a la vez (trabajadores de experiments.py):
+cada escritura va a un temporal único (mkstemp) que se renombra, y el índice
+se lee, se combina y se escribe bajo un bloqueo de archivo (index.json.lock).
+
+Formato del JSON (hasta 1000x1000 celdas):
+- lista de filas (formato original): spawns del mapa clásico, validados igual
+  que los del dict (spawn_errors: dentro del mapa y fuera de muros, el jugador
+  tampoco sobre la puerta; la casa también, aunque salga de find_house)
+- {"tiles": [filas], "player_spawn": [c, r], "ghost_spawns": [[c, r] x4],
+   "house": [c, r]}: las claves de posiciones son opcionales
+"""
+
+import os, json, hashlib, mmap, struct, tempfile
+from contextlib import contextmanager
+from logic.grid import Grid
+from logic.navigation import NavTable
+
+try:
+    import fcntl
+except ImportError:          # Windows
+    fcntl = None
+    import msvcrt
+
+MAPS_DIR = os.path.join("storage", "maps")
+CACHE_DIR = os.path.join("storage", "maps_cache")
+INDEX_PATH = os.path.join(CACHE_DIR, "index.json")
+
+MAGIC = b"RPMP"
+VERSION = 1
+
+# Posiciones por defecto (las del mapa clásico)
+DEFAULT_PLAYER_SPAWN = (13, 23)
+DEFAULT_GHOST_SPAWNS = ((13, 13), (14, 13), (12, 13), (15, 13))
+DEFAULT_HOUSE = (13, 13)
+
+# Reglas de validación
+MIN_ROWS = 11
+MAX_SIDE = 1000
+TILE_VALUES = (0, 1, 2, 3, 4)
+GHOST_SLOTS = 4
+
+# magic, versión, sha1, mtime_ns, tamaño, ancho, alto, puntos, power, 4 cuadrantes,
+# spawn jugador, casa, cantidad de fantasmas
+_HEADER = struct.Struct("<4sB20sqqHHII4IhhhhB")
+_TILE = struct.Struct("<hh")
+
+
+class MapError(ValueError):
+    """Mapa con formato inválido."""
+
+
+class Spawns:
+    """Posiciones de un mapa: jugador, fantasmas (una por slot) y celda de la casa."""
+    __slots__ = ("player", "ghosts", "house")
+
+    def __init__(self, player=DEFAULT_PLAYER_SPAWN, ghosts=DEFAULT_GHOST_SPAWNS, house=DEFAULT_HOUSE):
+        self.player = tuple(player)
+        self.ghosts = tuple(tuple(t) for t in ghosts)
+        self.house = tuple(house)
+
+    def to_json(self):
+        return {"player_spawn": list(self.player), "ghost_spawns": [list(t) for t in self.ghosts],
+                "house": list(self.house)}
+
+    def __eq__(self, other):
+        return isinstance(other, Spawns) and (self.player, self.ghosts, self.house) == (
+            other.player, other.ghosts, other.house)
+
+    def __repr__(self):
+        return f"Spawns(player={self.player}, ghosts={self.ghosts}, house={self.house})"
+
+
+DEFAULT_SPAWNS = Spawns()
+
+
+def validate_rows(data, name="?"):
+    """Valida el JSON de un mapa (lista de filas de enteros 0..4) y devuelve la Grid."""
+    if not isinstance(data, list) or not all(isinstance(row, list) for row in data):
+        raise MapError(f"Formato inválido del mapa '{name}': se esperaba una lista de filas")
+    if len(data) < MIN_ROWS or len(data) > MAX_SIDE:
+        raise MapError(f"Mapa '{name}': {len(data)} filas (se admiten {MIN_ROWS}..{MAX_SIDE})")
+    width = len(data[0])
+    if not 1 <= width <= MAX_SIDE or any(len(row) != width for row in data):
+        raise MapError(f"Mapa '{name}': filas de distinto largo o ancho fuera de rango")
+    try:
+        grid = Grid.from_rows(data)
+    except (TypeError, ValueError) as e:
+        raise MapError(f"Mapa '{name}': celdas no numéricas ({e})")
+    if grid.count(*TILE_VALUES) != len(grid.cells):
+        raise MapError(f"Mapa '{name}': hay celdas con valores fuera de {TILE_VALUES}")
+    return grid
+
+
+def _tile(value, name, what):
+    try:
+        c, r = (int(v) for v in value)
+    except (TypeError, ValueError):
+        raise MapError(f"Mapa '{name}': {what} debe ser [columna, fila]")
+    return c, r
+
+
+def spawn_errors(grid, spawns):
+    """
+    Posiciones inválidas de spawns sobre grid, en texto (lista vacía si todas
+    sirven). Todas dentro del mapa y fuera de muros; el jugador tampoco sobre
+    la puerta. parse_map y logic/map_analysis usan estas mismas reglas.
+    """
+    out = []
+    places = [("player_spawn", spawns.player)] + [("ghost_spawns", t) for t in spawns.ghosts]
+    for what, (c, r) in places + [("house", spawns.house)]:
+        if not grid.in_bounds(c, r):
+            out.append(f"{what} {(c, r)} está fuera del mapa")
+        elif grid.get(c, r) == 1:
+            out.append(f"{what} {(c, r)} cae sobre un muro")
+        elif what == "player_spawn" and grid.get(c, r) == 4:
+            out.append(f"{what} {(c, r)} cae sobre la puerta")
+    return out
+
+
+def parse_map(data, name="?"):
+    """JSON de un mapa (lista de filas o dict con "tiles") → (Grid, Spawns)."""
+    if not isinstance(data, dict):
+        data = {"tiles": data}          # formato original: las posiciones por defecto también se validan
+    grid = validate_rows(data.get("tiles"), name)
+    player = _tile(data.get("player_spawn", DEFAULT_PLAYER_SPAWN), name, "player_spawn")
+    ghosts = data.get("ghost_spawns", DEFAULT_GHOST_SPAWNS)
+    if not isinstance(ghosts, list) and not isinstance(ghosts, tuple) or len(ghosts) != GHOST_SLOTS:
+        raise MapError(f"Mapa '{name}': ghost_spawns debe tener {GHOST_SLOTS} posiciones")
+    ghosts = [_tile(t, name, "ghost_spawns") for t in ghosts]
+    house = _tile(data["house"], name, "house") if "house" in data else find_house(grid)
+    spawns = Spawns(player, ghosts, house)
+    errors = spawn_errors(grid, spawns)
+    if errors:
+        raise MapError(f"Mapa '{name}': {errors[0]}")
+    return grid, spawns
+
+
+def find_house(grid):
+    """Centro de la casa: la celda bajo la primera puerta (4); si no hay puerta, el de siempre."""
+    i = grid.cells.find(4)
+    if i < 0:
+        return DEFAULT_HOUSE
+    r, c = divmod(i, grid.width)
+    return (c, r + 1) if r + 1 < grid.height else (c, r)
+
+
+class CompiledMap:
+    """Mapa listo para jugar: grilla plantilla, navegación y posiciones (Spawns)."""
+    def __init__(self, name, sha1, grid, nav, spawns):
+        self.name = name
+        self.sha1 = sha1
+        self.grid = grid
+        self.nav = nav
+        self.spawns = spawns
+
+    def new_grid(self):
+        """Copia fresca de la grilla (cada partida se come sus propios puntos)."""
+        return self.grid.copy()
+
+
+def compile_grid(name, grid, sha1="", spawns=None):
+    return CompiledMap(name, sha1, grid, NavTable(grid), spawns or Spawns(house=find_house(grid)))
+
+
+# ---------- escritura atómica ----------
+def _atomic_write(path, data):
+    """Escribe data en un temporal único del mismo directorio y lo renombra sobre path."""
+    folder, base = os.path.split(path)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=base + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def _index_lock():
+    """Bloqueo exclusivo entre procesos para leer-combinar-escribir index.json."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(INDEX_PATH + ".lock", "a+b") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# ---------- artefacto binario ----------
+def _cache_path(name):
+    return os.path.join(CACHE_DIR, f"{name}.rpmap")
+
+
+def _write_artifact(cm, mtime_ns, size):
+    g, sp = cm.grid, cm.spawns
+    digest = bytes.fromhex(cm.sha1) if cm.sha1 else bytes(20)
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, digest, mtime_ns, size, g.width, g.height, g.dots, g.power_dots,
+                     *g.region_dots, *sp.player, *sp.house, len(sp.ghosts)),
+        b"".join(_TILE.pack(*t) for t in sp.ghosts),
+        bytes(g.cells), bytes(cm.nav.player), bytes(cm.nav.ghost),
+    ]
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    _atomic_write(_cache_path(cm.name), b"".join(parts))
+
+
+def _read_header(path):
+    """Cabecera del artefacto o None si no existe o no es de esta versión."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_HEADER.size)
+    except OSError:
+        return None
+    if len(head) < _HEADER.size:
+        return None
+    h = _HEADER.unpack(head)
+    if h[0] != MAGIC or h[1] != VERSION:
+        return None
+    return h
+
+
+def _read_artifact(name, path):
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        (_, _, digest, _, _, w, h, dots, power, q0, q1, q2, q3,
+         pc, pr, hc, hr, n) = _HEADER.unpack_from(mm, 0)
+        off = _HEADER.size
+        spawns = tuple(_TILE.unpack_from(mm, off + i * _TILE.size) for i in range(n))
+        off += n * _TILE.size
+        cells = w * h
+        grid = Grid.with_counts(w, h, bytearray(mm[off:off + cells]), dots, power, [q0, q1, q2, q3])
+        off += cells
+        nav = NavTable.from_tables(grid, bytearray(mm[off:off + cells]), bytearray(mm[off + cells:off + 2 * cells]))
+    return CompiledMap(name, digest.hex(), grid, nav, Spawns((pc, pr), spawns, (hc, hr)))
+
+
+def compile_map(name, force=False):
+    """Devuelve el CompiledMap de storage/maps/<name>.json, recompilando solo si cambió."""
+    src = os.path.join(MAPS_DIR, f"{name}.json")
+    st = os.stat(src)                                  # FileNotFoundError si no existe
+    path = _cache_path(name)
+    head = None if force else _read_header(path)
+    if head and head[3] == st.st_mtime_ns and head[4] == st.st_size:
+        return _read_artifact(name, path)
+
+    with open(src, "rb") as f:
+        raw = f.read()
+    sha1 = hashlib.sha1(raw).hexdigest()
+    if head and head[2].hex() == sha1:
+        # mismo contenido con otra fecha: se reescribe solo la cabecera
+        cm = _read_artifact(name, path)
+    else:
+        try:
+            data = json.loads(raw.decode("utf-8"))
+        except ValueError as e:
+            raise MapError(f"Mapa '{name}': JSON inválido ({e})")
+        grid, spawns = parse_map(data, name)
+        cm = compile_grid(name, grid, sha1, spawns)
+    _write_artifact(cm, st.st_mtime_ns, st.st_size)
+    _index_put(name, cm, st)
+    return cm
+
+
+# ---------- índice de mapas ----------
+def _dir_mtime():
+    try:
+        return os.stat(MAPS_DIR).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_index():
+    try:
+        with open(INDEX_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"dir_mtime_ns": None, "maps": {}}
+
+
+def _save_index(index):
+    """Solo bajo _index_lock(): el índice se reescribe entero."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    _atomic_write(INDEX_PATH, json.dumps(index, ensure_ascii=False).encode("utf-8"))
+
+
+def _index_put(name, cm, st):
+    """Combina la entrada de name con el índice actual (no pisa lo que escribió otro proceso)."""
+    with _index_lock():
+        index = _load_index()
+        index["maps"][name] = {
+            "sha1": cm.sha1, "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+            "width": cm.grid.width, "height": cm.grid.height, "dots": cm.grid.dots_left,
+        }
+        _save_index(index)
+
+
+def map_index():
+    """Índice {nombre: metadatos}; se reconstruye solo si el directorio de mapas cambió."""
+    index = _load_index()
+    mtime = _dir_mtime()
+    if mtime is None:
+        return {}
+    if index.get("dir_mtime_ns") == mtime:
+        return index["maps"]
+
+    with _index_lock():
+        index = _load_index()           # releído: incluye lo que otros escribieron mientras tanto
+        names = {f[:-5] for f in os.listdir(MAPS_DIR) if f.endswith(".json")}
+        maps = {n: meta for n, meta in index["maps"].items() if n in names}
+        for n in names - maps.keys():
+            st = os.stat(os.path.join(MAPS_DIR, f"{n}.json"))
+            maps[n] = {"sha1": None, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        _save_index({"dir_mtime_ns": mtime, "maps": maps})
+    return maps
+
+
+if __name__ == "__main__":
+    import sys, time
+    names = sys.argv[1:] or sorted(map_index())
+    for n in names:
+        t0 = time.perf_counter()
+        cm = compile_map(n, force=True)
+        t1 = time.perf_counter()
+        compile_map(n)
+        t2 = time.perf_counter()
+        print(f"{n}: {cm.grid.width}x{cm.grid.height}, {cm.grid.dots_left} puntos, "
+              f"compilar {(t1 - t0) * 1000:.1f} ms, cargar {(t2 - t1) * 1000:.2f} ms")
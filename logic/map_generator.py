@@ -0,0 +1,264 @@
+"""
+logic/map_generator.py — RandomPac v1.0
+=======================================
+Generador procedural de laberintos estilo Pac-Man.
+Cada mapa sale de una semilla y de uno de los generadores del proyecto
+(logic/random_generators), así que el mismo (generador, semilla) da siempre
+el mismo mapa. Características garantizadas:
+- simétrico de izquierda a derecha (se genera la mitad y se espeja)
+- casa de los fantasmas en el centro con puerta (4) y anillo libre alrededor
+- 4 power dots y puntos en todos los pasillos
+- conexo y sin callejones sin salida (todas las celdas libres tienen 2+ salidas)
+
+Se trabaja sobre una red de nodos en coordenadas impares de la mitad
+izquierda; cada arista abre las celdas entre dos nodos (la arista central
+cruza el eje hasta el nodo espejo). Un árbol de expansión aleatorio
+(Kruskal) asegura la conexión, luego se agregan aristas a cada nodo con una
+sola salida y algunas más para formar bucles. La red, la casa y las celdas de
+cada arista se precalculan una vez por tamaño.
+
+- generate(seed) → Grid;  spawns(width, height) → sus posiciones
+- stream(start, count) → (nombre, Grid) uno a uno, sin tocar el disco
+  (experiments.py --generated lo usa para correr corpus enteros)
+- python -m logic.map_generator --bench | --save N
+"""
+
+from logic.grid import Grid, DOT, POWER_DOT
+from logic.random_generators import LCG
+from logic.map_compiler import Spawns
+
+WIDTH, HEIGHT = 28, 31
+
+# probabilidad de agregar cada arista sobrante (más bucles = más rutas de escape)
+LOOP_CHANCE = 0.15
+# idem para los pasillos que cruzan el eje (sin ellos queda una columna de muro en el centro)
+CENTER_CHANCE = 0.4
+
+# prefijo de los nombres de mapas generados ("gen:<semilla>")
+PREFIX = "gen:"
+
+
+class _Layout:
+    """Red de nodos, aristas y plantilla de celdas para un tamaño de mapa."""
+    def __init__(self, width, height):
+        if width % 4 or height % 4 != 3 or width < 20 or height < 23:
+            raise ValueError(f"Tamaño no soportado {width}x{height}: ancho múltiplo de 4 (≥20), "
+                             f"alto ≡ 3 mod 4 (≥23)")
+        self.width, self.height = width, height
+        w = width
+        half = w // 2
+        mirror = lambda c: w - 1 - c
+
+        # casa: 8x5 centrada en el eje (como en el mapa clásico), anillo en las filas top-1 y top+5
+        top = height // 2 - 3
+        left = half - 4
+        house = {(c, r) for c in range(left + 1, half) for r in range(top + 1, top + 4)}
+        self.player_spawn = (half - 1, top + 11)
+        self.spawns = Spawns(self.player_spawn,
+                             ((half - 1, top + 1), (half, top + 1), (half - 2, top + 1), (half + 1, top + 1)),
+                             (half - 1, top + 1))
+
+        # nodos en (impar, impar) de la mitad izquierda; la última columna de nodos es half - 3
+        cols = list(range(1, half - 2, 2))
+        rows = list(range(1, height - 1, 2))
+        nodes = [(c, r) for r in rows for c in cols if (c, r) not in house]
+        self.node_id = {n: i for i, n in enumerate(nodes)}
+        self.nodes = nodes
+        edge_col = cols[-1]
+
+        # aristas: (a, b, celdas abiertas en ambas mitades); b = -1 es la arista central
+        edges = []
+        def cells_between(c0, r0, c1, r1):
+            out = []
+            for c in range(min(c0, c1), max(c0, c1) + 1):
+                for r in range(min(r0, r1), max(r0, r1) + 1):
+                    out.append(r * w + c)
+                    out.append(r * w + mirror(c))
+            return out
+
+        for (c, r), a in self.node_id.items():
+            b = self.node_id.get((c + 2, r))
+            if b is not None:
+                edges.append((a, b, cells_between(c, r, c + 2, r)))
+            b = self.node_id.get((c, r + 2))
+            if b is not None:
+                edges.append((a, b, cells_between(c, r, c, r + 2)))
+            if c == edge_col:
+                edges.append((a, -1, cells_between(c, r, half - 1, r)))
+        self.edges = edges
+        self.edges_of = [[] for _ in nodes]
+        for e, (a, b, _) in enumerate(edges):
+            self.edges_of[a].append(e)
+            if b >= 0:
+                self.edges_of[b].append(e)
+
+        # aristas fijas: el anillo de la casa y el pasillo central del spawn del jugador
+        ring_row_top, ring_row_bottom = top - 1, top + 5
+        ring_col = left - 1
+        ring = set()
+        for r in (ring_row_top, ring_row_bottom):
+            ring |= {(c, r) for c in range(ring_col, half)}
+        ring |= {(ring_col, r) for r in range(ring_row_top, ring_row_bottom + 1)}
+        pc, pr = self.player_spawn
+        forced = []
+        for e, (a, b, cells) in enumerate(edges):
+            tiles = {(i % w, i // w) for i in cells if i % w < half}
+            if tiles <= ring or (b == -1 and self.nodes[a][1] == pr):
+                forced.append(e)
+        self.forced = forced
+
+        # plantilla: muros, nodos con puntos, casa (muros, puerta, interior vacío)
+        cells = bytearray([1]) * (w * height)
+        for c, r in nodes:
+            cells[r * w + c] = cells[r * w + mirror(c)] = DOT
+        for c in range(left, half):
+            for r in range(top, top + 5):
+                if (c, r) not in house:
+                    cells[r * w + c] = cells[r * w + mirror(c)] = 1
+        for c, r in house:
+            cells[r * w + c] = cells[r * w + mirror(c)] = 0
+        cells[top * w + half - 1] = cells[top * w + half] = 4
+        self.template = cells
+
+        # power dots cerca de las esquinas (en nodos, espejados)
+        self.power = [r * w + c for c, r in ((1, 3), (1, rows[-3]))]
+        self.power += [r * w + mirror(c) for c, r in ((1, 3), (1, rows[-3]))]
+
+
+_LAYOUTS = {}
+
+
+def _layout(width, height):
+    lay = _LAYOUTS.get((width, height))
+    if lay is None:
+        lay = _LAYOUTS[(width, height)] = _Layout(width, height)
+    return lay
+
+
+def generate(seed, generator_class=LCG, width=WIDTH, height=HEIGHT, loops=LOOP_CHANCE):
+    """Mapa (Grid) de la semilla dada con el generador del proyecto pedido."""
+    lay = _layout(width, height)
+    rnd = generator_class(seed).random
+    edges = lay.edges
+    n = len(lay.nodes)
+    parent = list(range(n))
+    degree = [0] * n
+    chosen = bytearray(len(edges))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def take(e):
+        a, b, _ = edges[e]
+        chosen[e] = 1
+        degree[a] += 1
+        if b >= 0:
+            degree[b] += 1
+            parent[find(a)] = find(b)
+
+    for e in lay.forced:
+        take(e)
+
+    # árbol de expansión aleatorio de la mitad izquierda (Kruskal con pesos del generador) + bucles;
+    # las aristas centrales no conectan la mitad consigo misma, solo con su espejo
+    order = sorted(range(len(edges)), key=lambda e: rnd())
+    spare = []
+    for e in order:
+        if chosen[e]:
+            continue
+        a, b, _ = edges[e]
+        if b >= 0 and find(a) != find(b):
+            take(e)
+        else:
+            spare.append(e)
+    for e in spare:
+        if rnd() < (CENTER_CHANCE if edges[e][1] < 0 else loops):
+            take(e)
+
+    # sin callejones: cada nodo con una sola salida gana otra (mejor si une dos callejones)
+    edges_of = lay.edges_of
+    for a in range(n):
+        if degree[a] >= 2:
+            continue
+        options = [e for e in edges_of[a] if not chosen[e]]
+        pair = [e for e in options if edges[e][1] >= 0 and degree[edges[e][0] + edges[e][1] - a] < 2]
+        pick = pair or options
+        take(pick[int(rnd() * len(pick)) % len(pick)])
+
+    cells = bytearray(lay.template)
+    for e in range(len(edges)):
+        if chosen[e]:
+            for i in edges[e][2]:
+                cells[i] = DOT
+    for i in lay.power:
+        cells[i] = POWER_DOT
+    return Grid(width, height, cells)
+
+
+def spawns(width=WIDTH, height=HEIGHT):
+    """Spawns (jugador, fantasmas, casa) de los mapas generados de ese tamaño."""
+    return _layout(width, height).spawns
+
+
+def map_name(seed):
+    return f"{PREFIX}{seed}"
+
+
+def seed_of(name):
+    """Semilla de un nombre "gen:<semilla>", o None si no es un mapa generado."""
+    if isinstance(name, str) and name.startswith(PREFIX):
+        return int(name[len(PREFIX):])
+    return None
+
+
+def stream(start=1, count=None, generator_class=LCG, width=WIDTH, height=HEIGHT):
+    """Genera los mapas de las semillas start, start+1, … de a uno (count=None: sin fin)."""
+    seed = start
+    while count is None or seed < start + count:
+        yield map_name(seed), generate(seed, generator_class, width, height)
+        seed += 1
+
+
+def _bench(n, generator_class):
+    import time
+    from logic.map_analysis import analyze
+    generate(1, generator_class)                # precalcula la red
+    t0 = time.perf_counter()
+    for _ in stream(1, n, generator_class):
+        pass
+    secs = time.perf_counter() - t0
+    print(f"{generator_class.__name__}: {n} mapas en {secs:.2f}s → {n / secs:.0f} mapas/s")
+
+    # validación de una muestra con el analizador
+    bad = 0
+    for name, grid in stream(1, min(n, 500), generator_class):
+        rep = analyze(grid)
+        rows = grid.to_rows()
+        symmetric = all(row == row[::-1] for row in rows)
+        if not (rep.winnable and symmetric and not len(rep.dead_ends) and all(rep.ghosts_reach)):
+            bad += 1
+            print(f"  ✗ {name}: {rep.summary()} simétrico={symmetric}")
+    print(f"  muestra de {min(n, 500)} mapas: {bad} inválidos")
+
+
+if __name__ == "__main__":
+    import argparse
+    from logic.random_generators import RNG_MAP
+    parser = argparse.ArgumentParser(description="Generador procedural de mapas")
+    parser.add_argument("--rng", default="LCG", choices=list(RNG_MAP))
+    parser.add_argument("--bench", type=int, nargs="?", const=5000, help="mide mapas/s (por defecto 5000)")
+    parser.add_argument("--save", type=int, default=0, help="guarda N mapas en storage/maps")
+    parser.add_argument("--start", type=int, default=1, help="primera semilla")
+    parser.add_argument("--size", default=f"{WIDTH}x{HEIGHT}", help="ancho x alto (por defecto 28x31)")
+    args = parser.parse_args()
+    cls = RNG_MAP[args.rng]
+    if args.bench:
+        _bench(args.bench, cls)
+    if args.save:
+        from logic.map import save_custom_map
+        width, height = (int(v) for v in args.size.lower().split("x"))
+        for name, grid in stream(args.start, args.save, cls, width, height):
+            print(save_custom_map(name.replace(":", "-"), grid, spawns(grid.width, grid.height)))
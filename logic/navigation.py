@@ -0,0 +1,117 @@
+"""
+logic/navigation.py — RandomPac v1.0
+====================================
+Tabla de navegación precompilada por mapa.
+Para cada celda (índice plano r * width + c) guarda un byte por tipo de
+entidad:
+- bits 0..3 → salidas libres en el orden DIRS4: derecha, izquierda, abajo, arriba
+- bit 4     → cruce (3 o más salidas)
+El jugador trata la puerta (4) como muro; los fantasmas la cruzan.
+Solo cambia cuando cambian muros o puertas: rebuild() la arma entera con
+NumPy y el editor la actualiza celda a celda con update(c, r).
+nav.distances guarda los campos de distancia BFS del mapa (logic/pathfinding).
+"""
+
+# Desplazamientos en el orden de DIRS4
+DIRS4 = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIR_BITS = {d: i for i, d in enumerate(DIRS4)}
+OPEN_MASK = 0x0F
+JUNCTION = 0x10
+
+# valores de celda que bloquean a cada tipo de entidad
+PLAYER_BLOCKS = (1, 4)
+GHOST_BLOCKS = (1,)
+
+# salidas por máscara (0..15)
+EXITS = tuple(bin(m).count("1") for m in range(16))
+
+
+class NavTable:
+    def __init__(self, grid):
+        self.grid = grid
+        self.width, self.height = grid.width, grid.height
+        n = grid.width * grid.height
+        self.player = bytearray(n)
+        self.ghost = bytearray(n)
+        self._distances = None
+        self.rebuild()
+
+    @classmethod
+    def from_tables(cls, grid, player, ghost):
+        """Tabla ya compilada (logic/map_compiler): no recorre la grilla."""
+        nav = cls.__new__(cls)
+        nav.grid = grid
+        nav.width, nav.height = grid.width, grid.height
+        nav.player, nav.ghost = player, ghost
+        nav._distances = None
+        return nav
+
+    @property
+    def distances(self):
+        """Caché de campos de distancia de este mapa (se crea al primer uso)."""
+        if self._distances is None:
+            from logic.pathfinding import DistanceFields
+            self._distances = DistanceFields(self)
+        return self._distances
+
+    def table(self, blocks_door):
+        """Tabla del jugador (la puerta bloquea) o de los fantasmas."""
+        return self.player if blocks_door else self.ghost
+
+    def rebuild(self):
+        """Recalcula toda la tabla con NumPy (una pasada por dirección, no celda a celda)."""
+        import numpy as np
+        if self._distances is not None:
+            self._distances.clear()
+        w, h = self.width, self.height
+        cells = np.frombuffer(self.grid.cells, dtype=np.uint8).reshape(h, w)
+        exits = np.array(EXITS, dtype=np.uint8)
+        for table, blocks in ((self.player, PLAYER_BLOCKS), (self.ghost, GHOST_BLOCKS)):
+            passable = np.ones(256, dtype=np.uint8)
+            passable[list(blocks)] = 0
+            free = passable[cells]                       # 1 si la celda es transitable
+            m = np.zeros((h, w), dtype=np.uint8)
+            m[:, :-1] |= free[:, 1:]                     # derecha  (bit 0)
+            m[:, 1:] |= free[:, :-1] << 1                # izquierda (bit 1)
+            m[:-1] |= free[1:] << 2                      # abajo    (bit 2)
+            m[1:] |= free[:-1] << 3                      # arriba   (bit 3)
+            m[exits[m] >= 3] |= JUNCTION
+            table[:] = m.tobytes()
+
+    def update(self, c, r):
+        """Recalcula la celda (c, r) y sus 4 vecinas tras editar la grilla."""
+        if self._distances is not None:
+            self._distances.clear()
+        self._compute(c, r)
+        for dx, dy in DIRS4:
+            nc, nr = c + dx, r + dy
+            if 0 <= nc < self.width and 0 <= nr < self.height:
+                self._compute(nc, nr)
+
+    def _compute(self, c, r):
+        cells, w, h = self.grid.cells, self.width, self.height
+        mp = mg = 0
+        for bit, (dx, dy) in enumerate(DIRS4):
+            nc, nr = c + dx, r + dy
+            if 0 <= nc < w and 0 <= nr < h:
+                v = cells[nr * w + nc]
+                if v not in PLAYER_BLOCKS:
+                    mp |= 1 << bit
+                if v not in GHOST_BLOCKS:
+                    mg |= 1 << bit
+        i = r * w + c
+        self.player[i] = mp | (JUNCTION if EXITS[mp] >= 3 else 0)
+        self.ghost[i] = mg | (JUNCTION if EXITS[mg] >= 3 else 0)
+
+    # ---------- consultas ----------
+    def can_move(self, blocks_door, c, r, d):
+        """¿Está libre la celda vecina de (c, r) en la dirección d=(dx, dy)?"""
+        return (self.table(blocks_door)[r * self.width + c] >> DIR_BITS[d]) & 1 == 1
+
+    def exits(self, blocks_door, c, r):
+        """Direcciones libres desde (c, r), en el orden de DIRS4."""
+        m = self.table(blocks_door)[r * self.width + c]
+        return [d for i, d in enumerate(DIRS4) if m >> i & 1]
+
+    def is_junction(self, blocks_door, c, r):
+        return bool(self.table(blocks_door)[r * self.width + c] & JUNCTION)
@@ -0,0 +1,135 @@
+"""
+logic/pathfinding.py — RandomPac v1.0
+=====================================
+Campos de distancia (BFS) para la IA de los fantasmas.
+Un campo guarda, para cada celda del mapa, cuántos pasos de fantasma la
+separan de una celda objetivo (la casa o la celda del jugador). Decidir un
+giro es entonces leer el campo en las vecinas libres y quedarse con la menor.
+
+- Los campos se calculan una vez por objetivo y se guardan en un LRU acotado
+  por memoria (mapas grandes no acumulan un campo por celda visitada).
+- Los objetivos fijos (la casa) se pueden fijar con pin() y no salen del LRU.
+- Celdas sin camino al objetivo valen `unreachable`; el desempate usa la
+  distancia Manhattan, así un objetivo inalcanzable se comporta como antes.
+- La BFS es perezosa: around() la expande solo hasta la distancia del que
+  pregunta (+1) y la retoma en la consulta siguiente; field() la completa.
+"""
+
+from array import array
+from collections import OrderedDict, deque
+from logic.navigation import DIRS4
+
+# memoria máxima para campos dinámicos (por mapa)
+FIELD_BUDGET_BYTES = 32 * 1024 * 1024
+
+
+class _Field:
+    """BFS hacia un objetivo que se expande por niveles solo hasta donde se consulta."""
+    __slots__ = ("dist", "frontier", "known")
+
+    def __init__(self, dist, target):
+        self.dist = dist
+        self.frontier = [target]      # celdas a distancia `known` aún sin expandir
+        self.known = 0                # toda celda a distancia <= known ya tiene su valor final
+
+
+class DistanceFields:
+    def __init__(self, nav, budget_bytes=FIELD_BUDGET_BYTES):
+        self.nav = nav
+        self.width, self.height = nav.width, nav.height
+        cells = self.width * self.height
+        self.unreachable = cells                   # ninguna distancia real llega a esto
+        self.capacity = max(8, budget_bytes // (cells * 4))
+        self._lru = OrderedDict()                  # índice objetivo → _Field
+        self._pinned = {}
+        self._last = (-1, None)                    # atajo: el mismo objetivo que la consulta anterior
+        self._offsets = [dx + dy * self.width for dx, dy in DIRS4]
+        self.hits = self.misses = 0
+
+    def clear(self):
+        """Descarta todo (el mapa cambió)."""
+        self._lru.clear()
+        self._pinned.clear()
+        self._last = (-1, None)
+
+    def _new(self, target):
+        dist = array("I", [self.unreachable]) * (self.width * self.height)
+        dist[target] = 0
+        return _Field(dist, target)
+
+    def _grow(self, f, until=None):
+        """Expande f nivel por nivel hasta conocer las distancias <= until (None: todo el mapa)."""
+        dist, ghost, offsets = f.dist, self.nav.ghost, self._offsets
+        frontier, d = f.frontier, f.known
+        while frontier and (until is None or d < until):
+            d += 1
+            nxt = []
+            for i in frontier:
+                m = ghost[i]
+                for bit in range(4):
+                    if m >> bit & 1:
+                        j = i + offsets[bit]
+                        if dist[j] > d:
+                            dist[j] = d
+                            nxt.append(j)
+            frontier = nxt
+        f.frontier, f.known = frontier, d
+
+    def _entry(self, c, r):
+        i = r * self.width + c
+        last_i, last = self._last
+        if i == last_i:
+            self.hits += 1
+            return last
+        f = self._pinned.get(i)
+        if f is None:
+            f = self._lru.get(i)
+            if f is None:
+                self.misses += 1
+                f = self._lru[i] = self._new(i)
+                if len(self._lru) > self.capacity:
+                    self._lru.popitem(last=False)
+            else:
+                self.hits += 1
+                self._lru.move_to_end(i)
+        self._last = (i, f)
+        return f
+
+    def pin(self, c, r):
+        """Campo completo hacia (c, r) que nunca se descarta (objetivos fijos como la casa)."""
+        i = r * self.width + c
+        f = self._pinned.get(i)
+        if f is None:
+            f = self._pinned[i] = self._lru.pop(i, None) or self._new(i)
+            if self._last[0] == i:
+                self._last = (i, f)
+        self._grow(f)
+        return f.dist
+
+    def field(self, c, r):
+        """Campo completo hacia (c, r) (array('I') por índice plano)."""
+        f = self._entry(c, r)
+        self._grow(f)
+        return f.dist
+
+    def around(self, tc, tr, c, r):
+        """
+        Campo hacia (tc, tr) válido al menos en (c, r) y sus vecinas: la BFS solo
+        avanza hasta la distancia de (c, r) + 1. En mapas grandes un fantasma
+        cercano al jugador no recorre todo el mapa.
+        """
+        f = self._entry(tc, tr)
+        i = r * self.width + c
+        dist = f.dist
+        while f.frontier and dist[i] + 1 > f.known:
+            self._grow(f, min(dist[i] + 1, f.known + 64))
+        return dist
+
+    def rank(self, field, c, r, tc, tr):
+        """Clave de orden de la celda (c, r): distancia BFS y, en empate, Manhattan."""
+        return field[r * self.width + c] * (self.width + self.height) + abs(c - tc) + abs(r - tr)
+
+    def best(self, c, r, dirs, tc, tr):
+        """De las direcciones (dx, dy) libres desde (c, r), la que más acerca a (tc, tr)."""
+        field = self.around(tc, tr, c, r)
+        return min(dirs, key=lambda d: self.rank(field, c + d[0], r + d[1], tc, tr))
@@ -19,6 +19,7 @@ Cada clase tiene:
 - .rand() → número entero pseudoaleatorio
 - .random() → número normalizado [0,1)
 - .info → (nombre, descripción breve)
+- .getstate() / .setstate() → estado interno (repeticiones y snapshots)
 """
 
 import time
@@ -44,6 +45,12 @@ class MiddleSquare:
     def random(self):
         return self.rand() / 9999 if self.state else 0.0
 
+    def getstate(self):
+        return self.state
+
+    def setstate(self, state):
+        self.state = state
+
 
 # ------------------------------
 # MÉTODO 2: CONGRUENCIAL LINEAL
@@ -64,6 +71,12 @@ class LCG:
     def random(self):
         return self.rand() / self.m
 
+    def getstate(self):
+        return self.state
+
+    def setstate(self, state):
+        self.state = state
+
 
 # ------------------------------
 # MÉTODO 3: PROMEDIO ARITMÉTICO MÚLTIPLE (Original)
@@ -88,3 +101,17 @@ class PAM:
 
     def random(self):
         return self.rand() / self.m
+
+    def getstate(self):
+        return list(self.history)
+
+    def setstate(self, state):
+        self.history = list(state)
+
+
+# Registro de generadores por nombre (el mismo que muestra el asistente de partida)
+RNG_MAP = {
+    "LCG": LCG,
+    "Middle-Square": MiddleSquare,
+    "PAM": PAM
+}
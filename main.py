@@ -3,26 +3,21 @@ import pygame, sys
 from os.path import join
 from settings import WIDTH, HEIGHT, BG_COLOR
 from core.state import AppState
+from core.frame_pacer import FramePacer, open_display
 from ui.menu import StartScreen, MainMenu, PlayWizard, OverlayControls, PauseMenu, DeathOverlay, StatsScreen
 from audio.music import MusicManager
 from storage.profile import set_music_enabled, is_music_enabled, update_stats
-from logic.random_generators import LCG, MiddleSquare, PAM
+from logic.random_generators import RNG_MAP
 from ui.map_editor import MapEditor
 
 # importa tu GameLoop real
 from core.game_loop import GameLoop
-# importa tu RNG registry si lo tienes (aquí finge)
-RNG_MAP = {
-    "LCG": LCG,
-    "Middle-Square": MiddleSquare,
-    "PAM": PAM
-}
 
 def main():
     pygame.init()
     pygame.mixer.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    clock = pygame.time.Clock()
+    screen, mode = open_display((WIDTH, HEIGHT))
+    pacer = FramePacer(mode)         # un solo tick de reloj por vuelta (settings.PRESENT_MODE)
 
     # música
     music = MusicManager(music_path=join("assets", "sounds", "start_theme.mp3"), volume=0.4)    
@@ -40,9 +35,11 @@ def main():
     stats_screen = None
     map_editor = None
 
+    prev_state = None
     while True:
-        screen.fill(BG_COLOR)
-        for e in pygame.event.get():
+        dt = pacer.tick(game_frame=(state == AppState.GAME))
+        events = pygame.event.get()
+        for e in events:
             if e.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
             # toggle música con M (en menús también)
@@ -116,7 +113,15 @@ def main():
                 if ns:
                     state = ns
                     map_editor = None
-                    
+
+        # los menús no se animan: solo se repintan si hubo eventos o cambió el estado
+        if state != AppState.GAME and not events and state == prev_state:
+            continue
+        # en partida GameLoop repinta y presenta solo lo que cambió (settings.DIRTY_RECTS)
+        if state != AppState.GAME:
+            screen.fill(BG_COLOR)
+        shown = state
+
         # draw/update por estado
         if state == AppState.START:
             start.draw()
@@ -133,12 +138,13 @@ def main():
                 overlay = OverlayControls(screen, WIDTH, HEIGHT, config=ctx.get("config", {}))
             overlay.draw()
         elif state == AppState.GAME and game:
-            # corre el game loop de un paso (tu GameLoop ya tiene run(); aquí mostramos tick integrado)
-            dt = clock.tick(60)
+            # un paso del game loop con el dt de este cuadro (ya recortado a MAX_FRAME_MS)
+            if prev_state != AppState.GAME:
+                game.redraw_all()        # venimos de un menú: la pantalla no es la del juego
             game.update(dt)
             game.draw()
             # ejemplo: detectar muerte o fin para pasar a DEATH
-            if not game.running:
+            if not game.running and not game.busy:
                 # guarda stats demo
                 update_stats(ctx.get("player","Anon"), score=getattr(game.player, "score", 0),
                     time_s=60, config=ctx.get("config", {}))
@@ -149,21 +155,29 @@ def main():
                     "result": getattr(game, "result", "lose")
                 }
                 death = DeathOverlay(screen, WIDTH, HEIGHT, stats)
+                # repetición de la partida (storage/replays); si no se puede escribir, se avisa y se sigue
+                try:
+                    death.say(True, f"Repetición guardada en {game.save_replay()}")
+                except OSError as e:
+                    death.say(False, "No se guardó la repetición:", [str(e)])
 
         elif state == AppState.PAUSE and pause_menu:
             pause_menu.draw()
         elif state == AppState.DEATH and death:
             death.draw()
         elif state == AppState.STATS:
-            if stats_screen:
-                stats_screen.draw()
+            if stats_screen is None:
+                stats_screen = StatsScreen(screen, WIDTH, HEIGHT)
+            stats_screen.draw()
         elif state == AppState.MAP_EDITOR:
             if not map_editor:
                 map_editor = MapEditor(screen, WIDTH, HEIGHT)
             map_editor.draw()
-            
-        pygame.display.flip()
-        clock.tick(60)
+
+        # GameLoop.draw ya presentó el cuadro (flip o display.update)
+        if not (shown == AppState.GAME and game):
+            pygame.display.flip()
+        prev_state = shown
         
 if __name__ == "__main__":
     main()
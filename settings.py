@@ -11,7 +11,8 @@ import pygame
 # ----------------------------------------------------------------------
 # 🖥️ DIMENSIONES Y ESCALA
 # ----------------------------------------------------------------------
-# Tamaño de la cuadrícula (Pac-Man original)
+# Celdas visibles en la ventana (Pac-Man original); los mapas pueden ser más
+# grandes (hasta 1000x1000) y la cámara de core/camera sigue al jugador
 GRID_COLS = 28
 GRID_ROWS = 31
 
@@ -29,6 +30,16 @@ HEIGHT = GRID_ROWS * TILE_SIZE + HUD_HEIGHT
 # ⚙️ AJUSTES GENERALES
 # ----------------------------------------------------------------------
 FPS = 60
+# Dibujo por rectángulos sucios: cada cuadro solo se repintan y envían a la
+# pantalla las zonas que cambiaron (False = pantalla completa + flip siempre)
+DIRTY_RECTS = True
+# Presentación de cuadros en partida: "capped" (a FPS), "uncapped" o "vsync"
+# (core/frame_pacer). La simulación siempre avanza en ticks fijos de TICK_MS.
+PRESENT_MODE = "capped"
+# dt máximo que aporta un cuadro (evita la espiral de la muerte tras un tirón)
+MAX_FRAME_MS = 250
+# dibujar los sprites interpolados entre el tick anterior y el actual
+INTERPOLATE = True
 TITLE = "RANDOMPAC — Simulación Discreta y Aleatoriedad"
 
 # ----------------------------------------------------------------------
@@ -1,8 +1,16 @@
 # ui/map_editor.py
-import pygame, os, json
+import pygame, os
 from core.state import AppState
+from logic.grid import Grid
+from logic.map import save_custom_map
+from logic.map_compiler import Spawns, MapError, compile_map, MIN_ROWS, MAX_SIDE
+from logic.navigation import NavTable, JUNCTION
+from logic.map_analysis import analyze
+from core import text
 
 CELL_SIZE = 24
+# tamaño de la vista y del mapa nuevo por defecto; [N] crea uno de otro tamaño
+# (hasta 1000x1000) y la vista sigue al cursor
 GRID_W, GRID_H = 28, 31
 MAPS_PATH = os.path.join("storage", "maps")
 
@@ -19,34 +27,58 @@ class MapEditor:
     def __init__(self, screen, width, height):
         self.screen = screen
         self.W, self.H = width, height
-        self.grid = [[0]*GRID_W for _ in range(GRID_H)]
+        self.new_map(GRID_W, GRID_H)
         self.selected_tile = 1
-        self.font = pygame.font.SysFont("arial", 20)
+        self.font = text.font("arial", 20)
         os.makedirs(MAPS_PATH, exist_ok=True)
 
-        # posición del cursor
-        self.cursor_x = 0
-        self.cursor_y = 0
+        # texto pedido en pantalla: "save" (nombre del mapa) o "size" (ancho x alto del mapa nuevo)
+        self.prompt = None
+        self.prompt_text = ""
+        # resultado del último guardado (se muestra arriba a la izquierda)
+        self.status = []
+        self.status_ok = True
+        # velo bajo el cuadro de texto (uno por pantalla, como los overlays de ui/menu)
+        self.overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 180))
 
-        # modo de guardado
-        self.saving = False
-        self.save_name = ""
+    def new_map(self, width, height):
+        """Mapa vacío de width x height con los spawns en el centro (los del clásico en 28x31)."""
+        self.grid = Grid(width, height)
+        # una pasada NumPy al crearla (~25 ms en 1000x1000); luego se actualiza celda a celda al pintar
+        self.nav = NavTable(self.grid)
+        if (width, height) == (GRID_W, GRID_H):
+            self.spawns = Spawns()       # [P] jugador, [G] casa y fantasmas en el cursor
+        else:
+            house = (width // 2, height // 2)
+            self.spawns = Spawns((width // 2, min(height - 1, height * 3 // 4)), [house] * 4, house)
+        # cursor y primera celda visible (la vista muestra GRID_W x GRID_H celdas y sigue al cursor)
+        self.cursor_x = self.cursor_y = 0
+        self.view_c = self.view_r = 0
+        self.reanalyze()
 
     def handle_event(self, event):
-        if self.saving:
-            # estamos en modo de escritura del nombre
+        if self.prompt:
+            # estamos en modo de escritura (nombre o tamaño)
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_RETURN:
-                    self.finish_save()
+                    if self.prompt == "save":
+                        self.finish_save()
+                    else:
+                        self.finish_size()
                 elif event.key == pygame.K_BACKSPACE:
-                    self.save_name = self.save_name[:-1]
+                    self.prompt_text = self.prompt_text[:-1]
                 elif event.key == pygame.K_ESCAPE:
-                    self.saving = False
-                    self.save_name = ""
+                    self.prompt = None
+                    self.prompt_text = ""
                 else:
                     ch = event.unicode
-                    if ch.isalnum() or ch in "-_":
-                        self.save_name += ch
+                    if self.prompt == "save":
+                        allowed = ch.isalnum() or ch in "-_"
+                    else:
+                        allowed = ch.isdigit() or ch in "xX"
+                    if ch and allowed:
+                        self.prompt_text += ch
             return None, None
 
         # === Modo normal ===
@@ -55,96 +87,203 @@ class MapEditor:
                 return AppState.MENU, {}
 
             elif event.key == pygame.K_UP:
-                self.cursor_y = (self.cursor_y - 1) % GRID_H
+                self.cursor_y = (self.cursor_y - 1) % self.grid.height
             elif event.key == pygame.K_DOWN:
-                self.cursor_y = (self.cursor_y + 1) % GRID_H
+                self.cursor_y = (self.cursor_y + 1) % self.grid.height
             elif event.key == pygame.K_LEFT:
-                self.cursor_x = (self.cursor_x - 1) % GRID_W
+                self.cursor_x = (self.cursor_x - 1) % self.grid.width
             elif event.key == pygame.K_RIGHT:
-                self.cursor_x = (self.cursor_x + 1) % GRID_W
+                self.cursor_x = (self.cursor_x + 1) % self.grid.width
             elif event.key in (pygame.K_SPACE, pygame.K_RETURN):
-                self.grid[self.cursor_y][self.cursor_x] = self.selected_tile
+                self.paint(self.cursor_x, self.cursor_y, self.selected_tile)
             elif event.key in (pygame.K_BACKSPACE, pygame.K_0):
-                self.grid[self.cursor_y][self.cursor_x] = 0
+                self.paint(self.cursor_x, self.cursor_y, 0)
             elif event.unicode in ("1", "2", "3", "4"):
                 self.selected_tile = int(event.unicode)
             elif event.key == pygame.K_s:
                 # activar modo de guardado visual
-                self.saving = True
-                self.save_name = ""
+                self.prompt = "save"
+                self.prompt_text = ""
+            elif event.key == pygame.K_n:
+                self.prompt = "size"
+                self.prompt_text = ""
             elif event.key == pygame.K_l:
                 self.load_map()
+            elif event.key == pygame.K_p:
+                self.spawns = Spawns(self.cursor, self.spawns.ghosts, self.spawns.house)
+                self.reanalyze()
+            elif event.key == pygame.K_g:
+                self.spawns = Spawns(self.spawns.player, [self.cursor] * 4, self.cursor)
+                self.reanalyze()
+            self._scroll_to_cursor()
 
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             x, y = event.pos
-            c, r = x // CELL_SIZE, y // CELL_SIZE
-            if 0 <= c < GRID_W and 0 <= r < GRID_H:
-                self.grid[r][c] = self.selected_tile
+            c, r = self.view_c + x // CELL_SIZE, self.view_r + y // CELL_SIZE
+            if x < GRID_W * CELL_SIZE and y < GRID_H * CELL_SIZE and self.grid.in_bounds(c, r):
+                self.paint(c, r, self.selected_tile)
                 self.cursor_x, self.cursor_y = c, r
 
         return None, None
 
+    @property
+    def cursor(self):
+        return self.cursor_x, self.cursor_y
+
+    def _scroll_to_cursor(self):
+        """Mueve la vista lo justo para que el cursor quede dentro."""
+        self.view_c = min(max(self.view_c, self.cursor_x - GRID_W + 1), self.cursor_x)
+        self.view_r = min(max(self.view_r, self.cursor_y - GRID_H + 1), self.cursor_y)
+
+    def paint(self, c, r, value):
+        """Cambia una celda y actualiza la tabla de navegación solo alrededor de ella."""
+        self.grid.set(c, r, value)
+        self.nav.update(c, r)
+        self.reanalyze()
+
+    def reanalyze(self):
+        """Análisis en vivo (logic/map_analysis): alcance, callejones y fantasmas."""
+        self.report = analyze(self.grid, self.spawns.player, self.spawns.ghosts, self.spawns.house)
+        self.unreachable = set(self.report.unreachable_dots.tolist())
+        self.dead_ends = set(self.report.dead_ends.tolist())
+
     def draw(self):
         self.screen.fill((10, 15, 40))
 
-        # --- Dibujar celdas ---
-        for r in range(GRID_H):
-            for c in range(GRID_W):
-                color = TILES[self.grid[r][c]][1]
-                pygame.draw.rect(self.screen, color, (c*CELL_SIZE, r*CELL_SIZE, CELL_SIZE-1, CELL_SIZE-1))
+        # --- Dibujar celdas (solo las de la vista) ---
+        g = self.grid
+        vc, vr = self.view_c, self.view_r
+        cols, rows = min(GRID_W, g.width - vc), min(GRID_H, g.height - vr)
+        for r in range(vr, vr + rows):
+            for c in range(vc, vc + cols):
+                i = r * g.width + c
+                val = g.cells[i]
+                x, y = (c - vc) * CELL_SIZE, (r - vr) * CELL_SIZE
+                pygame.draw.rect(self.screen, TILES[val][1], (x, y, CELL_SIZE-1, CELL_SIZE-1))
+                # cruces (3+ salidas para los fantasmas) marcados con un punto tenue
+                if val != 1 and self.nav.ghost[i] & JUNCTION:
+                    pygame.draw.circle(self.screen, (90, 90, 140), (x + CELL_SIZE//2, y + CELL_SIZE//2), 2)
+                # puntos que el jugador no puede alcanzar (rojo) y callejones sin salida (gris)
+                if i in self.unreachable:
+                    pygame.draw.rect(self.screen, (255, 40, 40), (x, y, CELL_SIZE-1, CELL_SIZE-1), 2)
+                elif i in self.dead_ends:
+                    pygame.draw.rect(self.screen, (120, 120, 120), (x + 3, y + 3, CELL_SIZE-7, CELL_SIZE-7), 1)
+
+        # --- Spawns: jugador (amarillo) y casa de los fantasmas (rosa) ---
+        for (c, r), color in ((self.spawns.player, (255, 255, 0)), (self.spawns.house, (255, 105, 180))):
+            if vc <= c < vc + cols and vr <= r < vr + rows:
+                center = ((c - vc) * CELL_SIZE + CELL_SIZE//2, (r - vr) * CELL_SIZE + CELL_SIZE//2)
+                pygame.draw.circle(self.screen, color, center, CELL_SIZE//3, 2)
 
         # --- Rejilla ---
-        for r in range(GRID_H+1):
-            pygame.draw.line(self.screen, (30,30,60), (0, r*CELL_SIZE), (GRID_W*CELL_SIZE, r*CELL_SIZE))
-        for c in range(GRID_W+1):
-            pygame.draw.line(self.screen, (30,30,60), (c*CELL_SIZE, 0), (c*CELL_SIZE, GRID_H*CELL_SIZE))
+        for r in range(rows+1):
+            pygame.draw.line(self.screen, (30,30,60), (0, r*CELL_SIZE), (cols*CELL_SIZE, r*CELL_SIZE))
+        for c in range(cols+1):
+            pygame.draw.line(self.screen, (30,30,60), (c*CELL_SIZE, 0), (c*CELL_SIZE, rows*CELL_SIZE))
 
         # --- Cursor ---
-        rect = pygame.Rect(self.cursor_x*CELL_SIZE, self.cursor_y*CELL_SIZE, CELL_SIZE, CELL_SIZE)
+        rect = pygame.Rect((self.cursor_x - vc)*CELL_SIZE, (self.cursor_y - vr)*CELL_SIZE, CELL_SIZE, CELL_SIZE)
         pygame.draw.rect(self.screen, (255, 255, 0), rect, 2)
 
         # --- HUD ---
         y_hud = self.H - 60
-        msg = "[Flechas] Mover | [1–4] Cambiar | [ESP/ENTER] Colocar | [S] Guardar | [L] Cargar | [ESC] Volver"
-        txt = self.font.render(msg, True, (255,255,255))
+        msg = "[Flechas] Mover | [1–4] Cambiar | [ESP] Colocar | [P/G] Spawns | [N] Nuevo | [S] Guardar | [L] Cargar | [ESC] Volver"
+        txt = text.render(self.font, msg, (255,255,255))
         self.screen.blit(txt, (20, y_hud))
         cur_tile = TILES[self.selected_tile][0]
-        sel = self.font.render(f"Bloque actual: {cur_tile}", True, (255,220,0))
+        sel = text.render(self.font, f"Bloque actual: {cur_tile}", (255,220,0))
         self.screen.blit(sel, (20, y_hud-28))
+        rep = self.report
+        info = (f"Alcanzables: {rep.reachable} | Inalcanzables: {len(rep.unreachable_dots)} | "
+                f"Callejones: {len(rep.dead_ends)} | Cruces: {rep.junctions} | Túneles: {len(rep.tunnels)} | "
+                f"Fantasmas OK: {sum(rep.ghosts_reach)}/{len(rep.ghosts_reach)}")
+        color = (120, 230, 120) if rep.winnable else (255, 110, 110)
+        self.screen.blit(text.render(self.font, info, color), (20, y_hud-56))
+
+        # --- Resultado del último guardado (o por qué no se guardó) ---
+        if self.status:
+            color = (120, 230, 120) if self.status_ok else (255, 110, 110)
+            lines = [text.render(self.font, line, color) for line in self.status]
+            box = pygame.Rect(8, 8, max(l.get_width() for l in lines) + 16, 24 * len(lines) + 8)
+            pygame.draw.rect(self.screen, (0, 0, 0), box)
+            for i, line in enumerate(lines):
+                self.screen.blit(line, (16, 12 + 24 * i))
 
-        # --- Si estamos guardando, mostrar input visual ---
-        if self.saving:
-            overlay = pygame.Surface((self.W, self.H), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            self.screen.blit(overlay, (0, 0))
+        # --- Si estamos escribiendo un nombre o un tamaño, mostrar input visual ---
+        if self.prompt:
+            self.screen.blit(self.overlay, (0, 0))
 
             box = pygame.Rect(self.W//2 - 180, self.H//2 - 40, 360, 80)
             pygame.draw.rect(self.screen, (50, 50, 90), box, border_radius=10)
             pygame.draw.rect(self.screen, (200, 200, 255), box, 2, border_radius=10)
 
-            prompt = self.font.render("Nombre del mapa:", True, (255, 255, 255))
+            label = "Nombre del mapa:" if self.prompt == "save" else f"Tamaño (ancho x alto, hasta {MAX_SIDE}):"
+            prompt = text.render(self.font, label, (255, 255, 255))
             self.screen.blit(prompt, (box.x + 20, box.y + 10))
 
-            name = self.font.render(self.save_name or "Escribe aquí...", True, (255, 255, 0))
+            hint = "Escribe aquí..." if self.prompt == "save" else f"{self.grid.width}x{self.grid.height}"
+            name = text.render(self.font, self.prompt_text or hint, (255, 255, 0))
             self.screen.blit(name, (box.x + 20, box.y + 40))
 
+    def _say(self, ok, title, lines=()):
+        """Muestra (y escribe en consola) el resultado de guardar o crear un mapa."""
+        self.status = [title] + [f"- {p}" for p in lines]
+        self.status_ok = ok
+        print(("✅ " if ok else "⚠️ ") + title)
+        for p in lines:
+            print(f"   - {p}")
+
     def finish_save(self):
-        if not self.save_name.strip():
-            self.saving = False
+        name = self.prompt_text.strip()
+        self.prompt = None
+        self.prompt_text = ""
+        if not name:
             return
-        path = os.path.join(MAPS_PATH, f"{self.save_name.strip()}.json")
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.grid, f)
-        print(f"✅ Mapa guardado como {path}")
-        self.saving = False
-        self.save_name = ""
+        if not self.report.winnable:
+            # sin puntos, con puntos inalcanzables o con spawns inválidos nunca termina en victoria
+            self._say(False, "El mapa no se puede ganar; no se guardó:", self.report.problems())
+            return
+        try:
+            path = save_custom_map(name, self.grid, self.spawns)
+        except (MapError, OSError) as e:
+            # save_custom_map valida antes de escribir: el archivo anterior (si había) queda igual
+            self._say(False, f"No se guardó: {e}", self.report.problems())
+            return
+        self._say(True, f"Mapa guardado como {path}")
+
+    def finish_size(self):
+        """Crea un mapa vacío del tamaño escrito ("64x63")."""
+        raw = self.prompt_text.lower()
+        self.prompt = None
+        self.prompt_text = ""
+        try:
+            width, height = (int(v) for v in raw.split("x"))
+        except ValueError:
+            self._say(False, f"Tamaño inválido '{raw}': se espera ancho x alto (p. ej. 64x63)")
+            return
+        if not (1 <= width <= MAX_SIDE and MIN_ROWS <= height <= MAX_SIDE):
+            self._say(False, f"Tamaño {width}x{height} fuera de rango (ancho 1..{MAX_SIDE}, alto {MIN_ROWS}..{MAX_SIDE})")
+            return
+        self.new_map(width, height)
+        self._say(True, f"Mapa nuevo de {width}x{height}")
 
     def load_map(self):
         files = [f for f in os.listdir(MAPS_PATH) if f.endswith(".json")]
         if not files:
-            print("⚠️ No hay mapas guardados.")
+            self._say(False, "No hay mapas guardados.")
+            return
+        name = files[-1][:-5]
+        try:
+            cm = compile_map(name)
+        except (MapError, ValueError) as e:
+            self._say(False, f"{files[-1]} no se cargó: {e}")
             return
-        path = os.path.join(MAPS_PATH, files[-1])
-        with open(path, "r", encoding="utf-8") as f:
-            self.grid = json.load(f)
-        print(f"📂 Mapa cargado: {files[-1]}")
+        self.grid = cm.new_grid()
+        # las tablas ya vienen compiladas: se copian (el editor las modifica) sin recorrer la grilla
+        self.nav = NavTable.from_tables(self.grid, bytearray(cm.nav.player), bytearray(cm.nav.ghost))
+        self.spawns = cm.spawns
+        self.cursor_x = min(self.cursor_x, self.grid.width - 1)
+        self.cursor_y = min(self.cursor_y, self.grid.height - 1)
+        self._scroll_to_cursor()
+        self.reanalyze()
+        self._say(True, f"Mapa cargado: {files[-1]} ({self.grid.width}x{self.grid.height})")
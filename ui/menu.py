@@ -6,6 +6,7 @@ from storage.profile import ensure_player, load_db, is_music_enabled, set_music_
 from audio.music import MusicManager
 from logic.random_generators import LCG, MiddleSquare, PAM
 from logic.map import list_custom_maps
+from core import text
 
 BTN_BG = (20, 20, 60)
 BTN_BG_H = (40, 40, 100)
@@ -13,8 +14,8 @@ TXT = (255,255,255)
 HINT = (200, 220, 255)
 YELLOW = (255, 220, 0)
 
-def draw_label(screen, font, text, center, color=TXT):
-    surf = font.render(text, True, color)
+def draw_label(screen, font, label, center, color=TXT):
+    surf = text.render(font, label, color)
     rect = surf.get_rect(center=center)
     screen.blit(surf, rect)
     return rect
@@ -27,7 +28,7 @@ class FloatingButtons:
         self.help_hover = False
         self.rect_music = pygame.Rect(width-58, height-58, 48, 48)
         self.rect_help  = pygame.Rect(width-116, height-58, 48, 48)
-        self.font = pygame.font.SysFont("arial", 20)
+        self.font = text.font("arial", 20)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
@@ -45,7 +46,7 @@ class FloatingButtons:
         # tooltip
         if self.help_hover:
             tip = "Cómo jugar: Flechas para moverse, ESC pausa, Enter aceptar."
-            tip_surf = self.font.render(tip, True, TXT)
+            tip_surf = text.render(self.font, tip, TXT)
             screen.blit(tip_surf, (self.rect_help.left - tip_surf.get_width() + 48, self.rect_help.top - 28))
 
         # music
@@ -59,8 +60,10 @@ class StartScreen:
         self.W, self.H = width, height
         self.music_mgr = music_mgr
         self.bg = bg_img
-        self.font_t = pygame.font.SysFont("arialblack", 56)
-        self.font_i = pygame.font.SysFont("arial", 28)
+        self.font_t = text.font("arialblack", 56)
+        self.font_i = text.font("arial", 28)
+        self.font_in = text.font("consolas", 26)
+        self.font_small = text.font("arial", 20)
         self.name = ""
         self.floats = FloatingButtons(music_mgr, width, height)
 
@@ -88,21 +91,19 @@ class StartScreen:
         box = pygame.Rect(self.W//2-220, self.H//2-24, 440, 48)
         pygame.draw.rect(self.screen, BTN_BG, box, border_radius=12)
         pygame.draw.rect(self.screen, (90,90,140), box, 2, border_radius=12)
-        font_in = pygame.font.SysFont("consolas", 26)
-        t_s = font_in.render(txt, True, TXT)
+        t_s = text.render(self.font_in, txt, TXT)
         self.screen.blit(t_s, (box.x+16, box.y+10))
         self.floats.draw(self.screen)
 
         # Texto pequeño debajo del input
-        font_small = pygame.font.SysFont("arial", 20)
-        draw_label(self.screen, font_small, "(Máximo 6 caracteres)", (self.W//2, box.bottom + 20), (180, 180, 220))
+        draw_label(self.screen, self.font_small, "(Máximo 6 caracteres)", (self.W//2, box.bottom + 20), (180, 180, 220))
 
 
 class MainMenu:
     OPTIONS = ["Jugar", "Estadísticas", "Generador de mapa"]
     def __init__(self, screen, width, height, music_mgr: MusicManager, context: dict):
         self.screen = screen; self.W=width; self.H=height
-        self.font = pygame.font.SysFont("arial", 34)
+        self.font = text.font("arial", 34)
         self.sel = 0
         self.player = context.get("player")
         self.floats = FloatingButtons(music_mgr, width, height)
@@ -134,8 +135,9 @@ class PlayWizard:
     def __init__(self, screen, width, height, context: dict):
         self.screen = screen
         self.W, self.H = width, height
-        self.font = pygame.font.SysFont("arial", 28)
-        self.font_desc = pygame.font.SysFont("arial", 20)
+        self.font = text.font("arial", 28)
+        self.font_desc = text.font("arial", 20)
+        self.font_hint = text.font("arial", 22)
         self.sel = 0
 
         # === Datos dinámicos ===
@@ -150,6 +152,8 @@ class PlayWizard:
             "PAM": PAM
         }
         self.rng_names = list(self.rng_classes.keys())
+        # descripción de cada RNG (.info de una instancia), una vez por pantalla
+        self.rng_info = {n: getattr(cls(), "info", None) for n, cls in self.rng_classes.items()}
 
         # === Estados ===
         self.map_i = 0
@@ -250,39 +254,29 @@ class PlayWizard:
             draw_label(self.screen, self.font, f"{field}: {self._value_for(i)}", rect.center, TXT)
 
         # descripción del RNG
-        rng_cls = self.rng_classes[self.rng_names[self.rng_i]]
-        info = getattr(rng_cls(), "info", None)
+        info = self.rng_info[self.rng_names[self.rng_i]]
         if info:
             name, desc = info
-            full_text = f"{name}: {desc}"
-            wrapped = []
-            # dividir texto si es muy largo
-            words = full_text.split(" ")
-            line = ""
-            for w in words:
-                if self.font_desc.size(line + w)[0] > self.W - 120:
-                    wrapped.append(line)
-                    line = w + " "
-                else:
-                    line += w + " "
-            wrapped.append(line)
+            # dividir texto si es muy largo (las líneas quedan en caché)
+            wrapped = text.wrap(self.font_desc, f"{name}: {desc}", self.W - 120)
 
             y = 160 + len(self.FIELDS)*70 + 20
             for line in wrapped:
-                text = self.font_desc.render(line.strip(), True, (200, 220, 255))
-                self.screen.blit(text, (self.W//2 - text.get_width()//2, y))
+                surf = text.render(self.font_desc, line, (200, 220, 255))
+                self.screen.blit(surf, (self.W//2 - surf.get_width()//2, y))
                 y += 24
 
         # hint
-        font_hint = pygame.font.SysFont("arial", 22)
-        hint = font_hint.render("Usa ESC para volver, Enter para comenzar", True, (180, 190, 210))
+        hint = text.render(self.font_hint, "Usa ESC para volver, Enter para comenzar", (180, 190, 210))
         self.screen.blit(hint, (30, self.H - 40))
 
 class OverlayControls:
     """Overlay previo al juego con los controles."""
     def __init__(self, screen, width, height, config: dict):
         self.screen=screen; self.W=width; self.H=height
-        self.font = pygame.font.SysFont("arial", 28)
+        self.font = text.font("arial", 28)
+        self.overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.overlay.fill((0,0,0,160))
         self.config = config
         self.timer = 0
 
@@ -294,9 +288,7 @@ class OverlayControls:
         return None, None
 
     def draw(self):
-        overlay = pygame.Surface((self.W, self.H), pygame.SRCALPHA)
-        overlay.fill((0,0,0,160))
-        self.screen.blit(overlay, (0,0))
+        self.screen.blit(self.overlay, (0,0))
         y = 140
         draw_label(self.screen, self.font, "CONTROLES", (self.W//2, y), YELLOW); y+=50
         for line in [
@@ -311,7 +303,9 @@ class PauseMenu:
     OPTIONS = ["Continuar", "Opciones de juego", "Volver al inicio", "Salir"]
     def __init__(self, screen, width, height, music_mgr: MusicManager):
         self.screen=screen; self.W=width; self.H=height
-        self.font = pygame.font.SysFont("arial", 34)
+        self.font = text.font("arial", 34)
+        self.overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.overlay.fill((0,0,0,160))
         self.sel = 0
         self.floats = FloatingButtons(music_mgr, width, height)
 
@@ -329,8 +323,7 @@ class PauseMenu:
         return None, None
 
     def draw(self):
-        overlay = pygame.Surface((self.W, self.H), pygame.SRCALPHA)
-        overlay.fill((0,0,0,160)); self.screen.blit(overlay, (0,0))
+        self.screen.blit(self.overlay, (0,0))
         draw_label(self.screen, self.font, "PAUSA", (self.W//2, 200), YELLOW)
         for i,opt in enumerate(self.OPTIONS):
             rect = pygame.Rect(self.W//2-200, 260+i*64, 400, 52)
@@ -342,9 +335,22 @@ class DeathOverlay:
     OPTIONS = ["Volver al inicio", "Reintentar", "Reintentar con otra configuración"]
     def __init__(self, screen, width, height, stats: dict):
         self.screen=screen; self.W=width; self.H=height
-        self.font = pygame.font.SysFont("arial", 30)
+        self.font = text.font("arial", 30)
+        self.font_hint = text.font("arial", 22)
+        self.overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.overlay.fill((0,0,0,180))
         self.sel = 0
         self.stats = stats or {}
+        self.status = []
+        self.status_ok = True
+
+    def say(self, ok, title, lines=()):
+        """Muestra (y escribe en consola) el resultado de guardar la repetición (como MapEditor._say)."""
+        self.status = [title] + [f"- {p}" for p in lines]
+        self.status_ok = ok
+        print(("✅ " if ok else "⚠️ ") + title)
+        for p in lines:
+            print(f"   - {p}")
 
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -355,8 +361,7 @@ class DeathOverlay:
         return None, None
 
     def draw(self):
-        overlay = pygame.Surface((self.W, self.H), pygame.SRCALPHA)
-        overlay.fill((0,0,0,180)); self.screen.blit(overlay, (0,0))
+        self.screen.blit(self.overlay, (0,0))
         msg = "¡Has Ganado!" if self.stats.get("result") == "win" else "¡Has Muerto!"
         draw_label(self.screen, self.font, msg, (self.W//2, 180), YELLOW)
         y=230
@@ -366,8 +371,11 @@ class DeathOverlay:
             rect = pygame.Rect(self.W//2-260, y+20+i*64, 520, 52)
             pygame.draw.rect(self.screen, BTN_BG_H if i==self.sel else BTN_BG, rect, border_radius=12)
             draw_label(self.screen, self.font, opt, rect.center, TXT)
-        font_hint = pygame.font.SysFont("arial", 22)
-        hint = font_hint.render("Presiona ESC para volver", True, (180, 190, 210))
+        # resultado de guardar la repetición, sobre la ayuda
+        color = (120, 230, 120) if self.status_ok else (255, 110, 110)
+        for i, line in enumerate(reversed(self.status)):
+            self.screen.blit(text.render(self.font_hint, line, color), (30, self.H - 72 - 26 * i))
+        hint = text.render(self.font_hint, "Presiona ESC para volver", (180, 190, 210))
         self.screen.blit(hint, (30, self.H - 40))
             
 class StatsScreen:
@@ -375,9 +383,10 @@ class StatsScreen:
     def __init__(self, screen, width, height):
         self.screen = screen
         self.W, self.H = width, height
-        self.font_t = pygame.font.SysFont("arialblack", 46)
-        self.font_h = pygame.font.SysFont("arial", 22, bold=True)
-        self.font_b = pygame.font.SysFont("consolas", 21)
+        self.font_t = text.font("arialblack", 46)
+        self.font_h = text.font("arial", 22, bold=True)
+        self.font_b = text.font("consolas", 21)
+        self.font_hint = text.font("arial", 22)
         self.players = []
         self._load_data()
 
@@ -406,8 +415,7 @@ class StatsScreen:
     def draw(self):
         self.screen.fill((10, 15, 40))
         draw_label(self.screen, self.font_t, "ESTADÍSTICAS", (self.W // 2, 70), (255, 220, 0))
-        font_hint = pygame.font.SysFont("arial", 22)
-        hint = font_hint.render("Presiona ESC para volver", True, (180, 190, 210))
+        hint = text.render(self.font_hint, "Presiona ESC para volver", (180, 190, 210))
         self.screen.blit(hint, (30, self.H - 40))
 
         # === CONFIGURACIÓN DE TABLA ===